@@ -5,6 +5,10 @@ UI/UX Pro Max Core - BM25 search engine for UI/UX style guides
 """
 
 import csv
+import hashlib
+import heapq
+import os
+import pickle
 import re
 from pathlib import Path
 from math import log
@@ -12,6 +16,8 @@ from collections import defaultdict
 
 # ============ CONFIGURATION ============
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_DIR = DATA_DIR / ".index"
+INDEX_VERSION = 2
 MAX_RESULTS = 3
 
 CSV_CONFIG = {
@@ -98,16 +104,17 @@ AVAILABLE_STACKS = list(STACK_CONFIG.keys())
 
 # ============ BM25 IMPLEMENTATION ============
 class BM25:
-    """BM25 ranking algorithm for text search"""
+    """BM25 ranking algorithm for text search (inverted index)"""
 
     def __init__(self, k1=1.5, b=0.75):
         self.k1 = k1
         self.b = b
-        self.corpus = []
         self.doc_lengths = []
         self.avgdl = 0
         self.idf = {}
         self.doc_freqs = defaultdict(int)
+        self.postings = {}  # term -> [(doc_idx, term_freq), ...]
+        self.norms = []     # per-doc k1 * (1 - b + b * doc_len / avgdl)
         self.N = 0
 
     def tokenize(self, text):
@@ -116,47 +123,176 @@ class BM25:
         return [w for w in text.split() if len(w) > 2]
 
     def fit(self, documents):
-        """Build BM25 index from documents"""
-        self.corpus = [self.tokenize(doc) for doc in documents]
-        self.N = len(self.corpus)
+        """Build BM25 inverted index from documents"""
+        corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(corpus)
         if self.N == 0:
             return
-        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.doc_lengths = [len(doc) for doc in corpus]
         self.avgdl = sum(self.doc_lengths) / self.N
 
-        for doc in self.corpus:
-            seen = set()
+        postings = defaultdict(list)
+        for idx, doc in enumerate(corpus):
+            term_freqs = defaultdict(int)
             for word in doc:
-                if word not in seen:
-                    self.doc_freqs[word] += 1
-                    seen.add(word)
-
-        for word, freq in self.doc_freqs.items():
-            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+                term_freqs[word] += 1
+            for word, tf in term_freqs.items():
+                postings[word].append((idx, tf))
+        self.postings = dict(postings)
+
+        for word, plist in self.postings.items():
+            self.doc_freqs[word] = len(plist)
+            self.idf[word] = log((self.N - len(plist) + 0.5) / (len(plist) + 0.5) + 1)
+
+        if self.avgdl > 0:
+            self.norms = [self.k1 * (1 - self.b + self.b * doc_len / self.avgdl) for doc_len in self.doc_lengths]
+        else:
+            self.norms = [self.k1 * (1 - self.b)] * self.N
+
+    def _accumulate(self, query):
+        """Scores of documents containing at least one query term (postings only)"""
+        scores = {}
+        k1_plus_1 = self.k1 + 1
+        norms = self.norms
+        for token in self.tokenize(query):
+            plist = self.postings.get(token)
+            if not plist:
+                continue
+            idf = self.idf[token]
+            for idx, tf in plist:
+                numerator = tf * k1_plus_1
+                denominator = tf + norms[idx]
+                scores[idx] = scores.get(idx, 0) + idf * numerator / denominator
+        return scores
 
     def score(self, query):
-        """Score all documents against query"""
-        query_tokens = self.tokenize(query)
-        scores = []
+        """Score all documents against query, best first"""
+        matched = self._accumulate(query)
+        scores = [(idx, matched.get(idx, 0)) for idx in range(self.N)]
+        return sorted(scores, key=lambda x: x[1], reverse=True)
 
-        for idx, doc in enumerate(self.corpus):
-            score = 0
-            doc_len = self.doc_lengths[idx]
-            term_freqs = defaultdict(int)
-            for word in doc:
-                term_freqs[word] += 1
+    def top_k(self, query, k):
+        """Top-k (idx, score) with score > 0, best first (ties: lower idx first)"""
+        matched = self._accumulate(query)
+        return heapq.nsmallest(k, matched.items(), key=lambda x: (-x[1], x[0]))
 
-            for token in query_tokens:
-                if token in self.idf:
-                    tf = term_freqs[token]
-                    idf = self.idf[token]
-                    numerator = tf * (self.k1 + 1)
-                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
-                    score += idf * numerator / denominator
 
-            scores.append((idx, score))
+# ============ PERSISTENT INDEX ============
+class CSVIndex:
+    """Rows of a CSV plus a BM25 model fitted on its search columns"""
 
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+    def __init__(self, rows, bm25):
+        self.rows = rows
+        self.bm25 = bm25
+
+
+# In-process cache: (csv path, search cols) -> (source stamp, CSVIndex)
+_INDEX_CACHE = {}
+
+
+def _source_stamp(filepath):
+    """Cheap change detector for a source CSV (mtime + size)"""
+    st = filepath.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _file_hash(filepath):
+    """sha256 of a source CSV, used when only the mtime changed"""
+    with open(filepath, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _index_path(filepath, search_cols):
+    """On-disk index location for a CSV + search column set"""
+    cols_key = hashlib.sha1("\x1f".join(search_cols).encode("utf-8")).hexdigest()[:8]
+    name = filepath.relative_to(DATA_DIR).as_posix().replace("/", "__")
+    return INDEX_DIR / f"{name}.{cols_key}.bm25.pickle"
+
+
+def _build_index(filepath, search_cols):
+    """Load CSV, tokenize search columns and fit BM25"""
+    data = _load_csv(filepath)
+    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
+    bm25 = BM25()
+    bm25.fit(documents)
+    return CSVIndex(data, bm25)
+
+
+def _read_index_file(path, filepath, stamp, search_cols):
+    """Return a stored index if it still matches the source CSV, else None"""
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError, ValueError):
+        return None
+
+    if payload.get("version") != INDEX_VERSION or payload.get("search_cols") != list(search_cols):
+        return None
+    if payload.get("stamp") != stamp and payload.get("sha256") != _file_hash(filepath):
+        return None
+
+    bm25 = BM25.__new__(BM25)
+    bm25.__dict__.update(payload["bm25"])
+    index = CSVIndex(payload["rows"], bm25)
+    if payload.get("stamp") != stamp:
+        # Content unchanged (e.g. touched file): refresh the stamp only
+        _write_index_file(path, filepath, stamp, search_cols, index)
+    return index
+
+
+def _write_index_file(path, filepath, stamp, search_cols, index):
+    """Atomically persist an index; failures (read-only checkout) are ignored"""
+    payload = {
+        "version": INDEX_VERSION,
+        "stamp": stamp,
+        "sha256": _file_hash(filepath),
+        "search_cols": list(search_cols),
+        "rows": index.rows,
+        "bm25": index.bm25.__dict__,
+    }
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, 'wb') as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def load_index(filepath, search_cols):
+    """
+    Return the BM25 index for a CSV, rebuilding it only when the CSV changed.
+    Lookup order: in-process cache -> on-disk index -> build from CSV.
+    """
+    filepath = Path(filepath)
+    key = (str(filepath), tuple(search_cols))
+    stamp = _source_stamp(filepath)
+
+    cached = _INDEX_CACHE.get(key)
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    path = _index_path(filepath, search_cols)
+    index = _read_index_file(path, filepath, stamp, search_cols)
+    if index is None:
+        index = _build_index(filepath, search_cols)
+        _write_index_file(path, filepath, stamp, search_cols, index)
+
+    _INDEX_CACHE[key] = (stamp, index)
+    return index
+
+
+def build_all_indexes():
+    """Prebuild on-disk indexes for every CSV in CSV_CONFIG and STACK_CONFIG"""
+    targets = [(DATA_DIR / c["file"], c["search_cols"]) for c in CSV_CONFIG.values()]
+    targets += [(DATA_DIR / c["file"], _STACK_COLS["search_cols"]) for c in STACK_CONFIG.values()]
+    built = []
+    for filepath, search_cols in targets:
+        if filepath.exists():
+            load_index(filepath, search_cols)
+            built.append(filepath.relative_to(DATA_DIR).as_posix())
+    return built
 
 
 # ============ SEARCH FUNCTIONS ============
@@ -166,29 +302,24 @@ def _load_csv(filepath):
         return list(csv.DictReader(f))
 
 
+def _rank(index, output_cols, query, max_results):
+    """Top results with score > 0 (postings of query terms only)"""
+    data = index.rows
+    results = []
+    for idx, score in index.bm25.top_k(query, max_results):
+        row = data[idx]
+        results.append({col: row.get(col, "") for col in output_cols if col in row})
+    return results
+
+
 def _search_csv(filepath, search_cols, output_cols, query, max_results):
     """Core search function using BM25"""
     if not filepath.exists():
         return []
 
-    data = _load_csv(filepath)
-
-    # Build documents from search columns
-    documents = [" ".join(str(row.get(col, "")) for col in search_cols) for row in data]
-
-    # BM25 search
-    bm25 = BM25()
-    bm25.fit(documents)
-    ranked = bm25.score(query)
-
-    # Get top results with score > 0
-    results = []
-    for idx, score in ranked[:max_results]:
-        if score > 0:
-            row = data[idx]
-            results.append({col: row.get(col, "") for col in output_cols if col in row})
-
-    return results
+    # Prebuilt index (tokenization + IDF already done)
+    index = load_index(filepath, search_cols)
+    return _rank(index, output_cols, query, max_results)
 
 
 def detect_domain(query):
@@ -216,24 +347,44 @@ def detect_domain(query):
 
 def search(query, domain=None, max_results=MAX_RESULTS):
     """Main search function with auto-domain detection"""
-    if domain is None:
-        domain = detect_domain(query)
-
-    config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
-    filepath = DATA_DIR / config["file"]
-
-    if not filepath.exists():
-        return {"error": f"File not found: {filepath}", "domain": domain}
-
-    results = _search_csv(filepath, config["search_cols"], config["output_cols"], query, max_results)
-
-    return {
-        "domain": domain,
-        "query": query,
-        "file": config["file"],
-        "count": len(results),
-        "results": results
-    }
+    return search_many([(query, domain, max_results)])[0]
+
+
+def search_many(queries):
+    """Batched search over (query, domain, max_results) tuples, loading each domain index once"""
+    resolved = []
+    for query, domain, max_results in queries:
+        if domain is None:
+            domain = detect_domain(query)
+        resolved.append((query, domain, max_results))
+
+    # Group by domain so each CSV index is resolved once for all its queries
+    by_domain = {}
+    for pos, (query, domain, max_results) in enumerate(resolved):
+        by_domain.setdefault(domain, []).append((pos, query, max_results))
+
+    responses = [None] * len(resolved)
+    for domain, batch in by_domain.items():
+        config = CSV_CONFIG.get(domain, CSV_CONFIG["style"])
+        filepath = DATA_DIR / config["file"]
+
+        if not filepath.exists():
+            for pos, _, _ in batch:
+                responses[pos] = {"error": f"File not found: {filepath}", "domain": domain}
+            continue
+
+        index = load_index(filepath, config["search_cols"])
+        for pos, query, max_results in batch:
+            results = _rank(index, config["output_cols"], query, max_results)
+            responses[pos] = {
+                "domain": domain,
+                "query": query,
+                "file": config["file"],
+                "count": len(results),
+                "results": results
+            }
+
+    return responses
 
 
 def search_stack(query, stack, max_results=MAX_RESULTS):
@@ -18,7 +18,7 @@ import json
 import os
 from datetime import datetime
 from pathlib import Path
-from core import search, DATA_DIR
+from core import search, search_many, DATA_DIR
 
 
 # ============ CONFIGURATION ============
@@ -32,6 +32,9 @@ SEARCH_CONFIG = {
     "typography": {"max_results": 2}
 }
 
+# Per-page override searches: (domain, max_results)
+PAGE_OVERRIDE_SEARCHES = [("style", 1), ("ux", 3), ("landing", 1)]
+
 
 # ============ DESIGN SYSTEM GENERATOR ============
 class DesignSystemGenerator:
@@ -48,18 +51,21 @@ class DesignSystemGenerator:
         with open(filepath, 'r', encoding='utf-8') as f:
             return list(csv.DictReader(f))
 
-    def _multi_domain_search(self, query: str, style_priority: list = None) -> dict:
-        """Execute searches across multiple domains."""
-        results = {}
+    def _multi_domain_search(self, query: str, style_priority: list = None, exclude: tuple = ()) -> dict:
+        """Execute searches across multiple domains in one batch."""
+        requests = []
         for domain, config in SEARCH_CONFIG.items():
+            if domain in exclude:
+                continue
             if domain == "style" and style_priority:
                 # For style, also search with priority keywords
                 priority_query = " ".join(style_priority[:2]) if style_priority else query
                 combined_query = f"{query} {priority_query}"
-                results[domain] = search(combined_query, domain, config["max_results"])
+                requests.append((combined_query, domain, config["max_results"]))
             else:
-                results[domain] = search(query, domain, config["max_results"])
-        return results
+                requests.append((query, domain, config["max_results"]))
+        responses = search_many(requests)
+        return {domain: response for (_, domain, _), response in zip(requests, responses)}
 
     def _find_reasoning_rule(self, category: str) -> dict:
         """Find matching reasoning rule for a category."""
@@ -174,7 +180,7 @@ class DesignSystemGenerator:
         style_priority = reasoning.get("style_priority", [])
 
         # Step 3: Multi-domain search with style priority hints
-        search_results = self._multi_domain_search(query, style_priority)
+        search_results = self._multi_domain_search(query, style_priority, exclude=("product",))
         search_results["product"] = product_result  # Reuse product search
 
         # Step 4: Select best matches from each domain using priority
@@ -460,7 +466,8 @@ def format_markdown(design_system: dict) -> str:
 
 # ============ MAIN ENTRY POINT ============
 def generate_design_system(query: str, project_name: str = None, output_format: str = "ascii", 
-                           persist: bool = False, page: str = None, output_dir: str = None) -> str:
+                           persist: bool = False, page: str = None, output_dir: str = None,
+                           pages: list = None) -> str:
     """
     Main entry point for design system generation.
 
@@ -471,6 +478,7 @@ def generate_design_system(query: str, project_name: str = None, output_format:
         persist: If True, save design system to design-system/ folder
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
+        pages: Optional list of page names to create override files for in one pass
 
     Returns:
         Formatted design system string
@@ -480,7 +488,7 @@ def generate_design_system(query: str, project_name: str = None, output_format:
     
     # Persist to files if requested
     if persist:
-        persist_design_system(design_system, page, output_dir, query)
+        persist_design_system(design_system, page, output_dir, query, pages=pages)
 
     if output_format == "markdown":
         return format_markdown(design_system)
@@ -488,7 +496,8 @@ def generate_design_system(query: str, project_name: str = None, output_format:
 
 
 # ============ PERSISTENCE FUNCTIONS ============
-def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None) -> dict:
+def persist_design_system(design_system: dict, page: str = None, output_dir: str = None, page_query: str = None,
+                          pages: list = None) -> dict:
     """
     Persist design system to design-system/<project>/ folder using Master + Overrides pattern.
     
@@ -497,6 +506,8 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         page: Optional page name for page-specific override file
         output_dir: Optional output directory (defaults to current working directory)
         page_query: Optional query string for intelligent page override generation
+        pages: Optional list of page names, or (page, page_query) tuples, whose
+               override files are generated together with a single batched search
     
     Returns:
         dict with created file paths and status
@@ -524,10 +535,17 @@ def persist_design_system(design_system: dict, page: str = None, output_dir: str
         f.write(master_content)
     created_files.append(str(master_file))
     
-    # If page is specified, create page override file with intelligent content
+    # Page override files with intelligent content (all pages searched in one batch)
+    page_specs = []
     if page:
-        page_file = pages_dir / f"{page.lower().replace(' ', '-')}.md"
-        page_content = format_page_override_md(design_system, page, page_query)
+        page_specs.append((page, page_query))
+    for spec in pages or []:
+        page_specs.append(tuple(spec) if isinstance(spec, (list, tuple)) else (spec, page_query))
+
+    all_overrides = generate_page_overrides(page_specs, design_system)
+    for (page_name, query), page_overrides in zip(page_specs, all_overrides):
+        page_file = pages_dir / f"{page_name.lower().replace(' ', '-')}.md"
+        page_content = format_page_override_md(design_system, page_name, query, page_overrides)
         with open(page_file, 'w', encoding='utf-8') as f:
             f.write(page_content)
         created_files.append(str(page_file))
@@ -802,14 +820,16 @@ def format_master_md(design_system: dict) -> str:
     return "\n".join(lines)
 
 
-def format_page_override_md(design_system: dict, page_name: str, page_query: str = None) -> str:
+def format_page_override_md(design_system: dict, page_name: str, page_query: str = None,
+                            page_overrides: dict = None) -> str:
     """Format a page-specific override file with intelligent AI-generated content."""
     project = design_system.get("project_name", "PROJECT")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     page_title = page_name.replace("-", " ").replace("_", " ").title()
     
     # Detect page type and generate intelligent overrides
-    page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
+    if page_overrides is None:
+        page_overrides = _generate_intelligent_overrides(page_name, page_query, design_system)
     
     lines = []
     
@@ -918,22 +938,39 @@ def _generate_intelligent_overrides(page_name: str, page_query: str, design_syst
     Uses the existing search infrastructure to find relevant style, UX, and layout
     data instead of hardcoded page types.
     """
-    from core import search
-    
-    page_lower = page_name.lower()
-    query_lower = (page_query or "").lower()
-    combined_context = f"{page_lower} {query_lower}"
-    
-    # Search across multiple domains for page-specific guidance
-    style_search = search(combined_context, "style", max_results=1)
-    ux_search = search(combined_context, "ux", max_results=3)
-    landing_search = search(combined_context, "landing", max_results=1)
-    
-    # Extract results from search response
-    style_results = style_search.get("results", [])
-    ux_results = ux_search.get("results", [])
-    landing_results = landing_search.get("results", [])
+    return generate_page_overrides([(page_name, page_query)], design_system)[0]
+
+
+def generate_page_overrides(page_specs: list, design_system: dict) -> list:
+    """
+    Generate intelligent overrides for many (page_name, page_query) pairs.
     
+    All page searches run as one search_many batch, so each domain index is
+    loaded once for the whole site. Returns overrides in the order of page_specs.
+    """
+    contexts = [f"{page_name.lower()} {(page_query or '').lower()}" for page_name, page_query in page_specs]
+    requests = [
+        (context, domain, max_results)
+        for context in contexts
+        for domain, max_results in PAGE_OVERRIDE_SEARCHES
+    ]
+    responses = search_many(requests)
+
+    overrides = []
+    step = len(PAGE_OVERRIDE_SEARCHES)
+    for i, context in enumerate(contexts):
+        style_search, ux_search, landing_search = responses[i * step:(i + 1) * step]
+        overrides.append(_build_page_overrides(
+            context,
+            style_search.get("results", []),
+            ux_search.get("results", []),
+            landing_search.get("results", [])
+        ))
+    return overrides
+
+
+def _build_page_overrides(combined_context: str, style_results: list, ux_results: list, landing_results: list) -> dict:
+    """Build page overrides from the style, UX and landing search results."""
     # Detect page type from search results or context
     page_type = _detect_page_type(combined_context, style_results)
     
@@ -3,19 +3,43 @@ CFO Agent - Financial health analyzer (CrewAI Encapsulated).
 
 Orchestrates DeepSeek-R1 via OpenRouter to analyze budget alignment.
 """
-import os
-import json
+import asyncio
+import logging
+import time
 from textwrap import dedent
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
-from crewai import Agent, Task, Crew, Process, LLM
+from crewai import Agent, Task, Crew, Process
 from crewai.tools import tool
 
+from agents.llm import CFO_MODEL, create_llm
+
 from core.supabase import get_supabase_client
-from core.job_tracker import update_job, JobStatus
+from core.job_tracker import Job, update_job, create_jobs, save_job_trace, JobStatus
 from core.config import get_settings
+from core.cfo_data import (
+    CFODataset,
+    fetch_cfo_dataset,
+    fetch_workspace_ids,
+    fetch_bulk_cfo_data,
+)
+from core.cfo_engine import BudgetBreakdown, analyze_workspace, analyze_workspaces
+from core.audit_log import get_audit_log
+from core.report_store import put_report
+from core.result_cache import get_result_cache, input_fingerprint
+from core.job_events import publish_step
+from core.logs import log_context
+from core.metrics import CFO_LLM_SKIPPED, record_token_usage, time_phase
+from core.tracing import Trace, span, trace_job
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Bump when the task prompt or result shape changes, to invalidate cached results
+CFO_RESULT_VERSION = "3"
+
+CREW_MODE_PIPELINE = "pipeline"
+CREW_MODE_TOOLS = "tools"
 
 # --- Tools ---
 
@@ -26,12 +50,14 @@ class CFOTools:
         Fetches active contracts for a workspace to get revenue and hourly cost data.
         Returns a list of contracts with 'client_name', 'monthly_value', and 'hourly_cost'.
         """
-        supabase = get_supabase_client()
-        result = supabase.table("contracts") \
-            .select("id, client_name, monthly_value, hourly_cost") \
-            .eq("workspace_id", workspace_id) \
-            .eq("is_active", True) \
-            .execute()
+        with span("tool", "Fetch Contract Data", workspace_id=workspace_id) as attrs:
+            supabase = get_supabase_client()
+            result = supabase.table("contracts") \
+                .select("id, client_name, monthly_value, hourly_cost") \
+                .eq("workspace_id", workspace_id) \
+                .eq("is_active", True) \
+                .execute()
+            attrs["rows"] = len(result.data or [])
         return result.data if result.data else []
 
     @tool("Fetch Worklog Summary")
@@ -40,22 +66,56 @@ class CFOTools:
         Fetches the summary of hours worked per client/project for the current period.
         Returns a list containing 'client_name' and 'total_hours'.
         """
-        supabase = get_supabase_client()
-        result = supabase.rpc("get_worklog_summary", {
-            "workspace_id_param": workspace_id
-        }).execute()
+        with span("tool", "Fetch Worklog Summary", workspace_id=workspace_id) as attrs:
+            supabase = get_supabase_client()
+            result = supabase.rpc("get_worklog_summary", {
+                "workspace_id_param": workspace_id
+            }).execute()
+            attrs["rows"] = len(result.data or [])
         return result.data if result.data else []
 
 # --- Agent Definition ---
 
-def create_cfo_crew(workspace_id: str) -> Crew:
-    # --- LLM Configuration (Groq) ---
-    # Using Groq for high-speed inference with Llama 3.3 70B
-    llm = LLM(
-        model="groq/llama-3.3-70b-versatile",
-        api_key=os.getenv("GROQ_API_KEY"),
-        temperature=0.1
-    )
+def _step_publisher(job_id: Optional[str], trace: Optional[Trace] = None):
+    """
+    CrewAI step_callback forwarding agent thoughts and tool calls to job
+    subscribers, and recording each step as a `thought` span (timed from the
+    previous step) in the job trace.
+    """
+    def on_step(step):
+        output = getattr(step, "result", None) or getattr(step, "output", None) or getattr(step, "text", None)
+        details = dict(
+            kind=type(step).__name__,
+            thought=getattr(step, "thought", None),
+            tool=getattr(step, "tool", None),
+            tool_input=str(getattr(step, "tool_input", "") or "")[:500] or None,
+            output=str(output)[:1000] if output is not None else None
+        )
+        publish_step(job_id, "agent_step", **details)
+        if trace is not None:
+            ended = time.perf_counter()
+            trace.add("thought", details["kind"], trace.mark(), ended, details)
+    return on_step
+
+
+def create_cfo_crew(
+    workspace_id: str,
+    breakdown: BudgetBreakdown,
+    job_id: Optional[str] = None,
+    trace: Optional[Trace] = None,
+    source_table: Optional[str] = None
+) -> Crew:
+    """
+    Builds the CFO crew.
+    
+    With source_table (pipeline mode) the fetched rows are inlined into the task
+    and the agent has no tools, so the report takes a single LLM turn. Without
+    it, the agent may call the fetch tools to inspect the raw rows.
+    """
+    pipeline = source_table is not None
+
+    # --- LLM Configuration (Groq, instrumented) ---
+    llm = create_llm(CFO_MODEL, temperature=0.1)
 
     # 2. Define the Agent
     cfo = Agent(
@@ -68,37 +128,55 @@ def create_cfo_crew(workspace_id: str) -> Crew:
             You don't just calculate; you provide STRATEGIC INSIGHTS and WARNINGS.
             You care deeply about "Effective Hourly Rate" and "Budget Variance".
         """),
-        tools=[CFOTools.fetch_contract_data, CFOTools.fetch_worklog_summary],
+        tools=[] if pipeline else [CFOTools.fetch_contract_data, CFOTools.fetch_worklog_summary],
         llm=llm,
-        verbose=True,
-        allow_delegation=False
+        verbose=settings.crew_verbose,  # Steps go to the job trace via step_callback
+        allow_delegation=False,
+        step_callback=_step_publisher(job_id, trace)
     )
 
     # 3. Define the Task
+    if pipeline:
+        data_instructions = dedent("""
+            Source rows (active contracts and hours logged per client), already fetched:
+            
+            {source_table}
+            
+            You have no tools: everything you need is above. Answer directly, and never
+            replace the computed figures with your own arithmetic.
+        """).replace("{source_table}", source_table)
+    else:
+        data_instructions = dedent("""
+            You may use the tools to inspect the raw contract and worklog rows, but never
+            replace the computed figures with your own arithmetic.
+        """)
+
     analysis_task = Task(
         description=dedent(f"""
-            Analyze the financial health of workspace '{workspace_id}'.
+            Write the financial health narrative for workspace '{workspace_id}'.
             
-            Steps:
-            1. Fetch active contracts using `Fetch Contract Data`.
-            2. Fetch worklog summaries using `Fetch Worklog Summary`.
-            3. Compare the 'monthly_value' (Revenue) against 'total_hours' * 'hourly_cost' (Actual Cost).
-            4. Calculate Budget Variance for each client.
-            5. Identify any client where the Projected Cost > Monthly Revenue (Negative Variance).
-            6. Identify any client consuming > 110% of their allocated budget.
+            The budget figures below were computed deterministically by the engine
+            (variance threshold: {breakdown.variance_threshold:.1f}%). They are final:
+            do not recompute or alter any number.
             
-            Output Requirements:
-            - A strategic summary of the overall financial state.
-            - A specific list of ALERTS for any client over budget.
-            - Reasoning for *why* these discrepancies might be happening based on the data.
+            Total Revenue: R${breakdown.total_monthly_revenue:.2f}
+            Total Hours: {breakdown.total_hours_logged:.1f}h
             
-            Important: Ensure you actually call the tools to get the data. Do not hallucinate data.
-        """),
+            {{budget_table}}
+            
+            Steps:
+            1. Read the per-client figures (expected_cost = hours * hourly_rate, variance = expected_cost - revenue).
+            2. Explain the overall financial state of the workspace.
+            3. For every client flagged over_budget, explain *why* the discrepancy might be happening.
+            4. Give strategic advice to restore profitability.
+            
+            {{data_instructions}}
+        """).replace("{budget_table}", breakdown.to_table()).replace("{data_instructions}", data_instructions.strip()),
         expected_output=dedent("""
-            A JSON-like structure (markdown code block is fine) or structured report containing:
+            A structured report containing:
             - overall_health: "Healthy" | "At Risk" | "Critical"
             - financial_summary: text
-            - alerts: List of dicts with { client, variance, warning_message }
+            - warnings: one short paragraph per over-budget client
             - strategic_advice: text
         """),
         agent=cfo
@@ -109,110 +187,329 @@ def create_cfo_crew(workspace_id: str) -> Crew:
         agents=[cfo],
         tasks=[analysis_task],
         process=Process.sequential,
-        verbose=True
+        verbose=settings.crew_verbose
     )
     
     return crew
 
+# --- Healthy Short-Circuit ---
+
+def llm_skip_reason(breakdown: BudgetBreakdown) -> Optional[str]:
+    """Why the narrative needs no LLM: 'no_contracts', 'no_alerts', or None (run the crew)."""
+    if not breakdown.client_names:
+        return "no_contracts"
+    if not breakdown.over_budget.any():
+        return "no_alerts"
+    return None
+
+
+def render_healthy_report(breakdown: BudgetBreakdown, skip_reason: str) -> str:
+    """Templated report (same sections as the crew's) for workspaces without alerts."""
+    if skip_reason == "no_contracts":
+        summary = "No active contracts: there is no revenue or budget to analyze for this workspace."
+    else:
+        top = int(breakdown.variance_percentage.argmax())
+        summary = (
+            f"All {len(breakdown.client_names)} client(s) are within budget "
+            f"(variance threshold {breakdown.variance_threshold:.1f}%). "
+            f"Total revenue R${breakdown.total_monthly_revenue:.2f} for "
+            f"{breakdown.total_hours_logged:.1f}h logged. Highest variance: "
+            f"{breakdown.client_names[top]} at {float(breakdown.variance_percentage[top]):+.1f}%."
+        )
+    return dedent(f"""
+        overall_health: Healthy
+        financial_summary: {summary}
+        warnings: None
+        strategic_advice: No action needed. Keep monitoring hours against contract value; this report was generated without an LLM because no client crossed the variance threshold.
+    """).strip()
+
+
 # --- Entry Point ---
 
+def cfo_input_fingerprint(dataset: CFODataset) -> str:
+    """
+    Fingerprint of everything that determines a CFO analysis result. The
+    workspace is part of it: results carry its id, and workspaces with the
+    same rows (e.g. no active contracts) must not share an entry.
+    """
+    return input_fingerprint(
+        "cfo_analysis",
+        CFO_RESULT_VERSION,
+        dataset.workspace_id,
+        settings.cfo_crew_mode,
+        settings.cfo_skip_llm_when_healthy,
+        settings.cfo_variance_threshold,
+        sorted(dataset.contracts, key=lambda c: str(c.get("id"))),
+        sorted(dataset.worklogs, key=lambda w: str(w.get("client_name")))
+    )
+
+
 async def run_cfo_analysis(job_id: str, workspace_id: str):
     """
-    Execute CFO budget analysis using CrewAI.
+    Execute CFO budget analysis.
+    
+    Budget figures and alerts are computed deterministically by core.cfo_engine;
+    the CrewAI crew only writes the narrative report over those numbers.
+    The run is traced (phases, agent steps, tool calls, LLM completions) and
+    the trace is stored with the job.
     """
+    with log_context(job_id, workspace_id), trace_job(job_id) as trace:
+        try:
+            await _run_cfo_analysis(job_id, workspace_id, trace)
+        finally:
+            await save_job_trace(job_id, trace.to_compact())
+
+
+async def _run_cfo_analysis(job_id: str, workspace_id: str, trace: Trace):
     try:
-        update_job(job_id, JobStatus.RUNNING)
-        supabase = get_supabase_client()
+        await update_job(job_id, JobStatus.RUNNING)
 
-        # Instantiate and Run Crew
-        print(f"[CFO] Starting Crew for Workspace: {workspace_id}")
-        try:
-            crew = create_cfo_crew(workspace_id)
-            print("[CFO] Crew created. Kicking off...")
-            result = crew.kickoff()
-            print("[CFO] Crew kickoff finished.")
-        except Exception as crew_error:
-            print(f"[CFO] CRITICAL CREW ERROR: {crew_error}")
-            import traceback
-            traceback.print_exc()
-            raise crew_error
+        # Compute budget figures (deterministic); contracts and worklogs are fetched concurrently
+        publish_step(job_id, "fetch_data")
+        dataset = await fetch_cfo_dataset(workspace_id)
+
+        # Unchanged input data -> reuse the stored result (no LLM call)
+        cache = get_result_cache()
+        fingerprint = cfo_input_fingerprint(dataset)
+        with time_phase("cfo_analysis", "cache_lookup"):
+            cached = await cache.get("cfo_analysis", fingerprint)
+        if cached is not None:
+            logger.info("Cache hit (source job %s)", cached.source_job_id)
+            result = dict(cached.result)
+            result["cache"] = {
+                "hit": True,
+                "fingerprint": fingerprint,
+                "source_job_id": cached.source_job_id
+            }
+            with time_phase("cfo_analysis", "update_job"):
+                await update_job(job_id, JobStatus.COMPLETED, result=result)
+            return
+
+        with time_phase("cfo_analysis", "analysis"):
+            breakdown = analyze_workspace(
+                workspace_id, dataset.contracts, dataset.worklogs,
+                variance_threshold=settings.cfo_variance_threshold
+            )
+            analysis = breakdown.to_response()
+        logger.info("Computed %d contract(s), %d alert(s)", len(dataset.contracts), len(analysis.alerts))
+        publish_step(job_id, "analysis_computed", contracts=len(dataset.contracts), alerts=len(analysis.alerts))
+
+        # Healthy workspaces get a templated report: the crew only runs when there is something to explain
+        skip_reason = llm_skip_reason(breakdown) if settings.cfo_skip_llm_when_healthy else None
+        if skip_reason is not None:
+            logger.info("Skipping LLM: %s", skip_reason)
+            publish_step(job_id, "llm_skipped", reason=skip_reason)
+            CFO_LLM_SKIPPED.labels(reason=skip_reason).inc()
+            final_output = render_healthy_report(breakdown, skip_reason)
+            llm_info = {
+                "invoked": False,
+                "skip_reason": skip_reason,
+                "variance_threshold": breakdown.variance_threshold,
+                "max_variance_percentage": (
+                    round(float(breakdown.variance_percentage.max()), 1) if breakdown.client_names else None
+                )
+            }
+            action, tool_usage = "budget_analysis_templated", "cfo_engine_template"
+        else:
+            # Instantiate and Run Crew (narrative only)
+            logger.info("Starting crew (%s mode)", settings.cfo_crew_mode)
+            try:
+                pipeline = settings.cfo_crew_mode == CREW_MODE_PIPELINE
+                crew = create_cfo_crew(
+                    workspace_id, breakdown, job_id=job_id, trace=trace,
+                    source_table=dataset.to_table() if pipeline else None
+                )
+                publish_step(job_id, "crew_kickoff")
+                # kickoff() blocks for the whole LLM round trip; keep it off the event loop
+                with time_phase("cfo_analysis", "crew_kickoff") as kickoff_attrs:
+                    trace.mark()  # First agent step is timed from here
+                    result = await asyncio.to_thread(crew.kickoff)
+                    token_usage = getattr(result, "token_usage", None)
+                    for key in ("prompt_tokens", "completion_tokens", "successful_requests"):
+                        kickoff_attrs[key] = getattr(token_usage, key, None)
+                record_token_usage(CFO_MODEL, token_usage)
+            except Exception:
+                logger.error("Crew kickoff failed")  # Traceback logged by the handler below
+                raise
             
-        final_output = str(result)
-        print(f"[CFO] Final Output Length: {len(final_output)}")
-        
-        # --- FALLBACK LOGGING (AUDIT) ---
-        # Save reasoning to local file to bypass DB connection issues
-        try:
-            log_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "last_ai_reasoning.txt")
-            with open(log_path, "w", encoding="utf-8") as f:
-                f.write(final_output)
-            print(f"[CFO] Reasoning saved locally to: {log_path}")
-        except Exception as log_err:
-            print(f"[CFO] Failed to save local log: {log_err}")
-        # -------------------------------
+            final_output = str(result)
+            logger.info("Crew finished (%d chars)", len(final_output))
         
-        # Log to ai_actions
-        # We'll store the entire output as the 'reasoning' for now, 
-        # or verify if we want to parse it. 
-        # Since the user asked to "Audit Log: Salve o reasoning", storing the full text is good.
+            llm_info = {"invoked": True, "model": CFO_MODEL, "crew_mode": settings.cfo_crew_mode}
+            action = "budget_analysis_crew_run"
+            tool_usage = "crewai_pipeline" if pipeline else "crewai_orchestration"
+
+        # Store the report once (compressed, content-addressed); jobs and ai_actions reference its hash
+        with time_phase("cfo_analysis", "report_store") as report_attrs:
+            report_hash = await put_report(final_output)
+            report_attrs["report_chars"] = len(final_output)
         
-        # Attempt to parse the result to extract structured data
-        parsed_output = {}
-        try:
-            # Assuming the output is a markdown code block with JSON inside
-            json_str = final_output.split("```json")[1].split("```")[0]
-            parsed_output = json.loads(json_str)
-        except (json.JSONDecodeError, IndexError):
-            print("[CFO] Could not parse CrewAI output as JSON. Storing raw output.")
-            # Fallback to a simpler structure if parsing fails
-            parsed_output = {"full_report": final_output}
-
-        alerts = parsed_output.get("alerts", [])
-        total_revenue = parsed_output.get("total_monthly_revenue", 0.0) # Assuming these might be in the output
-        total_hours = parsed_output.get("total_hours_logged", 0.0) # Assuming these might be in the output
-
-        insert_res = supabase.table("ai_actions").insert({
+        # Log to ai_actions (buffered; written in the background by the audit log writer)
+        # The deterministic summary is the 'reasoning'; the analysis and report hash go to metadata.
+        get_audit_log().log({
             "task_id": None, # Set to None to avoid FK constraint with issues table if job_id is not a real issue UUID
             "agent_name": "CFOAgent",
-            "action": "budget_analysis_crew_run",
-            "reasoning": final_output, # Store full output for audit
+            "action": action,
+            "reasoning": analysis.summary,
             "metadata": {
                 "workspace_id": workspace_id,
-                "tool_usage": "crewai_orchestration",
-                "parsed_output": parsed_output, # Store parsed output if available
-                "parsed_output": parsed_output, # Store parsed output if available
+                "tool_usage": tool_usage,
+                "analysis": analysis.model_dump(),
+                "report_hash": report_hash,  # Full report: ai_reports / GET /jobs/{job_id}/report
                 "original_job_id": str(job_id) # Strictly cast to string to avoid serialization issues
             },
             "status": "completed"
-        }).execute()
-        print(f"[CFO] AI Action Inserted: {insert_res.data}")
-
-        if alerts:
-            summary = (
-                f"[ALERT] {len(alerts)} budget alert(s) found. "
-                f"Total Revenue: R${total_revenue:.2f}, "
-                f"Total Hours: {total_hours:.1f}h. "
-                f"Check ai_actions for details."
-            )
-        else:
-            summary = (
-                f"[OK] Budget healthy. Total Revenue: R${total_revenue:.2f}, "
-                f"Total Hours: {total_hours:.1f}h. "
-                f"All clients within margin."
-            )
-        
-        # Step 5: Complete job
-        update_job(job_id, JobStatus.COMPLETED, result={
-            "workspace_id": workspace_id,
-            "total_monthly_revenue": total_revenue,
-            "total_hours_logged": total_hours,
-            "alerts": alerts,
-            "summary": summary,
-            "full_report": final_output # Keep full report in job result as well
         })
         
+        # Complete job
+        result = analysis.model_dump()
+        result["report_hash"] = report_hash
+        result["llm"] = llm_info
+        result["cache"] = {"hit": False, "fingerprint": fingerprint}
+        with time_phase("cfo_analysis", "update_job"):
+            await update_job(job_id, JobStatus.COMPLETED, result=result)
+        await cache.put("cfo_analysis", fingerprint, result, job_id)
+        
     except Exception as e:
-        print(f"[CFO] Check failed: {e}")
-        import traceback
-        traceback.print_exc()
-        update_job(job_id, JobStatus.FAILED, error=str(e))
+        logger.exception("Check failed: %s", e)
+        await update_job(job_id, JobStatus.FAILED, error=str(e))
+
+
+async def run_cfo_batch_analysis(
+    job_id: str,
+    workspace_ids: Optional[List[str]] = None,
+    previous_result: Optional[dict] = None
+):
+    """
+    Execute CFO budget analysis for many workspaces inside one parent job.
+    
+    Each chunk of workspaces costs two bulk reads (contracts + get_worklog_summaries),
+    one vectorized engine pass, one bulk insert into `jobs` (one completed child job
+    per workspace); the `ai_actions` rows are queued on the batched audit log
+    writer (core.audit_log). No LLM narrative is
+    generated in batch mode; the deterministic summary is stored instead.
+    Per-workspace progress is reported in the parent job result.
+    
+    workspace_ids=None sweeps every workspace. previous_result is the progress
+    stored by an earlier attempt (a reclaimed job): workspaces it lists are
+    skipped, so their child jobs and audit rows are not written twice.
+    """
+    with log_context(job_id), trace_job(job_id) as trace:
+        try:
+            await _run_cfo_batch_analysis(job_id, workspace_ids, previous_result)
+        finally:
+            await save_job_trace(job_id, trace.to_compact())
+
+
+async def _run_cfo_batch_analysis(
+    job_id: str,
+    workspace_ids: Optional[List[str]],
+    previous_result: Optional[dict]
+):
+    try:
+        await update_job(job_id, JobStatus.RUNNING)
+
+        if workspace_ids is None:
+            workspace_ids = await fetch_workspace_ids()
+        workspace_ids = list(dict.fromkeys(workspace_ids))  # dedupe, keep order
+
+        done = (previous_result or {}).get("workspaces") or {}
+        progress = {
+            "total_workspaces": len(workspace_ids),
+            "processed_workspaces": 0,
+            "total_alerts": 0,
+            "workspaces": {}
+        }
+        for workspace_id in workspace_ids:
+            if workspace_id in done:
+                progress["workspaces"][workspace_id] = done[workspace_id]
+                progress["total_alerts"] += done[workspace_id].get("alerts", 0)
+        progress["processed_workspaces"] = len(progress["workspaces"])
+        pending = [ws for ws in workspace_ids if ws not in done]
+        if done:
+            logger.info("Resuming sweep: %d workspace(s) already processed", progress["processed_workspaces"])
+        logger.info("Starting sweep over %d workspace(s)", len(pending))
+
+        chunk_size = max(1, settings.cfo_batch_chunk_size)
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+
+            contracts, worklogs = await fetch_bulk_cfo_data(chunk)
+            with time_phase("cfo_batch_analysis", "analysis"):
+                breakdowns = analyze_workspaces(
+                    chunk, contracts, worklogs,
+                    variance_threshold=settings.cfo_variance_threshold
+                )
+                analyses = [breakdowns[ws].to_response() for ws in chunk]
+
+            # Bulk insert one completed child job per workspace
+            with time_phase("cfo_batch_analysis", "create_child_jobs"):
+                child_jobs = await create_jobs("cfo_analysis", [
+                    {
+                        "workspace_id": analysis.workspace_id,
+                        "status": JobStatus.COMPLETED,
+                        "result": {**analysis.model_dump(), "parent_job_id": str(job_id)}
+                    }
+                    for analysis in analyses
+                ])
+
+            # Queue the audit rows (bulk-inserted by the audit log writer)
+            get_audit_log().log_many(
+                {
+                    "task_id": None,
+                    "agent_name": "CFOAgent",
+                    "action": "budget_analysis_batch",
+                    "reasoning": analysis.summary,
+                    "metadata": {
+                        "workspace_id": analysis.workspace_id,
+                        "tool_usage": "cfo_engine_batch",
+                        "analysis": analysis.model_dump(),
+                        "original_job_id": str(child.id),
+                        "parent_job_id": str(job_id)
+                    },
+                    "status": "completed"
+                }
+                for analysis, child in zip(analyses, child_jobs)
+            )
+
+            for analysis, child in zip(analyses, child_jobs):
+                progress["workspaces"][analysis.workspace_id] = {
+                    "status": JobStatus.COMPLETED.value,
+                    "job_id": child.id,
+                    "alerts": len(analysis.alerts)
+                }
+                progress["total_alerts"] += len(analysis.alerts)
+            progress["processed_workspaces"] += len(chunk)
+
+            with time_phase("cfo_batch_analysis", "update_job"):
+                await update_job(job_id, JobStatus.RUNNING, result=progress)
+            publish_step(
+                job_id, "batch_progress",
+                processed=progress["processed_workspaces"],
+                total=progress["total_workspaces"]
+            )
+            logger.info(
+                "%d/%d workspace(s) processed",
+                progress["processed_workspaces"], progress["total_workspaces"]
+            )
+
+        progress["summary"] = (
+            f"{progress['total_workspaces']} workspace(s) analyzed, "
+            f"{progress['total_alerts']} budget alert(s) found."
+        )
+        with time_phase("cfo_batch_analysis", "update_job"):
+            await update_job(job_id, JobStatus.COMPLETED, result=progress)
+
+    except Exception as e:
+        logger.exception("Sweep failed: %s", e)
+        await update_job(job_id, JobStatus.FAILED, error=str(e))
+
+
+# --- Job Handlers (registered in agents.registry) ---
+
+async def handle_cfo_analysis_job(job: Job):
+    await run_cfo_analysis(job.id, job.workspace_id)
+
+
+async def handle_cfo_batch_analysis_job(job: Job):
+    await run_cfo_batch_analysis(job.id, (job.payload or {}).get("workspace_ids"), job.result)
@@ -0,0 +1,85 @@
+"""
+LLM factory for the agents.
+
+InstrumentedLLM is a CrewAI LLM that records completion latency and errors
+in core.metrics and an `llm` span per completion in the active job trace.
+Token counts for metrics are taken from CrewOutput.token_usage after a
+kickoff (see core.metrics.record_token_usage).
+
+Plain-text completions (no native function calling) go through the
+content-addressed completion cache in core.llm_cache; a hit never reaches
+the provider and is traced with `cached=True`.
+"""
+import os
+import time
+
+from crewai import LLM
+
+from core.llm_cache import completion_key, get_llm_cache
+from core.metrics import LLM_ERRORS, LLM_REQUEST_DURATION
+from core.tracing import span
+
+
+# Groq for high-speed inference with Llama 3.3 70B
+CFO_MODEL = "groq/llama-3.3-70b-versatile"
+
+
+class InstrumentedLLM(LLM):
+    """CrewAI LLM with Prometheus latency/error metrics per model and trace spans."""
+
+    def call(self, *args, **kwargs):
+        cache, key = self._cache_lookup_key(args, kwargs)
+        if cache is not None:
+            cached = cache.get(key, self.model)
+            if cached is not None:
+                with span("llm", "completion", model=self.model, cached=True, response_chars=len(cached)):
+                    return cached
+
+        started = time.perf_counter()
+        usage_before = self._usage_snapshot()
+        with span("llm", "completion", model=self.model) as attrs:
+            try:
+                response = super().call(*args, **kwargs)
+                attrs["response_chars"] = len(response) if isinstance(response, str) else None
+                if cache is not None and isinstance(response, str) and response.strip():
+                    cache.put(key, self.model, response)
+                return response
+            except Exception:
+                LLM_ERRORS.labels(model=self.model).inc()
+                raise
+            finally:
+                LLM_REQUEST_DURATION.labels(model=self.model).observe(time.perf_counter() - started)
+                usage_after = self._usage_snapshot()
+                for kind in ("prompt_tokens", "completion_tokens"):
+                    if kind in usage_after:
+                        attrs[kind] = usage_after[kind] - usage_before.get(kind, 0)
+
+    def _cache_lookup_key(self, args: tuple, kwargs: dict):
+        """
+        Returns (cache, key) for a cacheable call, else (None, None).
+        Calls carrying native tools/functions may execute them, so they always
+        reach the provider.
+        """
+        cache = get_llm_cache()
+        if cache is None or kwargs.get("tools") or kwargs.get("available_functions") or len(args) > 1:
+            return None, None
+        messages = args[0] if args else kwargs.get("messages")
+        if not messages:
+            return None, None
+        return cache, completion_key(self.model, self.temperature, messages, getattr(self, "stop", None))
+
+    def _usage_snapshot(self) -> dict:
+        """Cumulative token counters CrewAI keeps on the LLM (empty if unavailable)."""
+        usage = getattr(self, "_token_usage", None)
+        if not isinstance(usage, dict):
+            return {}
+        return {k: v for k, v in usage.items() if isinstance(v, int)}
+
+
+def create_llm(model: str = CFO_MODEL, temperature: float = 0.1) -> InstrumentedLLM:
+    """Returns the instrumented Groq LLM used by the agents."""
+    return InstrumentedLLM(
+        model=model,
+        api_key=os.getenv("GROQ_API_KEY"),
+        temperature=temperature
+    )
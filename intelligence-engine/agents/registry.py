@@ -0,0 +1,90 @@
+"""
+Agent registry: job type -> agent job handler, imported on first use.
+
+Importing an agent module pulls in CrewAI (and LiteLLM), builds its tools and
+prompts, which takes seconds. The registry only holds "module:function"
+references, so the API and the worker start, and serve /health, without
+importing any agent; warm_up() imports them in the background afterwards.
+
+To add an agent type, define `async def handler(job: Job)` in its module and
+register it in AGENT_HANDLERS (or call register_agent); workers claim every
+registered job type.
+"""
+import asyncio
+import importlib
+import logging
+import threading
+import time
+from typing import Dict, List
+
+from core.job_tracker import Job
+from core.worker import JobHandler
+
+logger = logging.getLogger(__name__)
+
+
+AGENT_HANDLERS: Dict[str, str] = {
+    "cfo_analysis": "agents.cfo_agent:handle_cfo_analysis_job",
+    "cfo_batch_analysis": "agents.cfo_agent:handle_cfo_batch_analysis_job",
+}
+
+_loaded: Dict[str, JobHandler] = {}
+_import_lock = threading.Lock()
+
+
+def register_agent(job_type: str, target: str):
+    """Registers (or replaces) the "module:function" handler for a job type."""
+    if ":" not in target:
+        raise ValueError(f"Agent handler must be 'module:function', got {target!r}")
+    AGENT_HANDLERS[job_type] = target
+    _loaded.pop(job_type, None)
+
+
+def job_types() -> List[str]:
+    return list(AGENT_HANDLERS)
+
+
+def load_handler(job_type: str) -> JobHandler:
+    """Imports the agent module for a job type (once) and returns its handler."""
+    handler = _loaded.get(job_type)
+    if handler is not None:
+        return handler
+    module_name, _, attr = AGENT_HANDLERS[job_type].partition(":")
+    with _import_lock:
+        handler = _loaded.get(job_type)
+        if handler is None:
+            started = time.perf_counter()
+            handler = getattr(importlib.import_module(module_name), attr)
+            _loaded[job_type] = handler
+            logger.info("Loaded %s from %s in %.2fs", job_type, module_name, time.perf_counter() - started)
+    return handler
+
+
+async def resolve_handler(job_type: str) -> JobHandler:
+    """load_handler without blocking the event loop on the import."""
+    handler = _loaded.get(job_type)
+    if handler is None:
+        handler = await asyncio.to_thread(load_handler, job_type)
+    return handler
+
+
+def _lazy_handler(job_type: str) -> JobHandler:
+    async def handle(job: Job):
+        handler = await resolve_handler(job_type)
+        await handler(job)
+    return handle
+
+
+def job_handlers() -> Dict[str, JobHandler]:
+    """Handlers for JobWorker that import their agent on the first job."""
+    return {job_type: _lazy_handler(job_type) for job_type in AGENT_HANDLERS}
+
+
+async def warm_up():
+    """Imports every registered agent off the event loop (run after startup)."""
+    for job_type in job_types():
+        try:
+            await resolve_handler(job_type)
+        except Exception as e:
+            # The first job of this type retries the import and fails visibly
+            logger.warning("Warm-up failed for %s: %s", job_type, e)
@@ -0,0 +1,195 @@
+"""
+Batched, asynchronous writer for `ai_actions` audit rows.
+
+Agents call log()/log_many(), which only append to an in-memory buffer; a
+background task bulk-inserts the buffer when it reaches AUDIT_LOG_BATCH_SIZE
+rows or every AUDIT_LOG_FLUSH_SECONDS. Failed inserts are retried with
+backoff (AUDIT_LOG_MAX_RETRIES) before the batch is dropped and counted in
+kos_audit_rows_total{outcome="dropped"}. Errors a retry cannot fix (a row
+violating a constraint, a malformed value) split the batch instead, so only
+the offending rows are dropped. close() flushes what is left; the API
+lifespan, worker.py and scripts call it on shutdown.
+
+Audit rows are written after the job result: a process killed without
+shutdown loses at most the unflushed buffer.
+"""
+import asyncio
+import logging
+import threading
+from functools import lru_cache
+from typing import Iterable, List, Optional
+
+from supabase import PostgrestAPIError
+
+from core.config import get_settings
+from core.metrics import AUDIT_ROWS
+from core.supabase import get_supabase_client, execute
+
+logger = logging.getLogger(__name__)
+
+# SQLSTATE classes worth retrying: connection, transaction rollback (deadlock,
+# serialization), insufficient resources, operator intervention (shutdown)
+RETRYABLE_SQLSTATE_CLASSES = ("08", "40", "53", "57")
+# PostgREST codes for a database it could not reach
+RETRYABLE_POSTGREST_CODES = ("PGRST000", "PGRST001", "PGRST002", "PGRST003")
+
+
+def is_retryable(error: Exception) -> bool:
+    """Network errors and transient database errors are; rejected rows are not."""
+    if not isinstance(error, PostgrestAPIError):
+        return True
+    code = str(error.code or "")
+    if code.startswith("PGRST"):
+        return code in RETRYABLE_POSTGREST_CODES
+    return not code or code[:2] in RETRYABLE_SQLSTATE_CLASSES
+
+
+class AuditLogWriter:
+    """Buffers rows for one table and flushes them as bulk inserts."""
+
+    def __init__(
+        self,
+        table: str = "ai_actions",
+        batch_size: int = 100,
+        flush_interval: float = 1.0,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        max_buffer: int = 10000
+    ):
+        self.table = table
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.max_buffer = max_buffer
+        self._buffer: List[dict] = []
+        self._lock = threading.Lock()  # log() may be called from worker threads (CrewAI tools)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._closed = False
+
+    def log(self, row: dict):
+        """Queues one row. Never blocks on the database."""
+        self.log_many([row])
+
+    def log_many(self, rows: Iterable[dict]):
+        """Queues rows, starting the background flusher on first use."""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            overflow = len(self._buffer) + len(rows) - self.max_buffer
+            if overflow > 0:
+                # Database unreachable for a long time: keep the newest rows
+                del self._buffer[:overflow]
+                AUDIT_ROWS.labels(table=self.table, outcome="dropped").inc(overflow)
+                logger.warning("Buffer full, dropped %d %s row(s)", overflow, self.table)
+            self._buffer.extend(rows)
+            full = len(self._buffer) >= self.batch_size
+        self._ensure_started()
+        if full:
+            self._signal()
+
+    def _ensure_started(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Called from a thread; the flusher is started by the next call on the loop
+            return
+        self._loop = loop
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._closed = False
+        self._task = loop.create_task(self._run())
+
+    def _signal(self):
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        while not self._closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self):
+        """Writes everything buffered so far, in batches of batch_size."""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = self._buffer[:self.batch_size]
+                    del self._buffer[:self.batch_size]
+                if not batch:
+                    return
+                await self._write(batch)
+
+    async def _write(self, batch: List[dict]):
+        client = get_supabase_client()
+        for attempt in range(self.max_retries + 1):
+            try:
+                await execute(client.table(self.table).insert(batch))
+                AUDIT_ROWS.labels(table=self.table, outcome="written").inc(len(batch))
+                return
+            except Exception as e:
+                if not is_retryable(e):
+                    await self._split(batch, e)
+                    return
+                if attempt == self.max_retries:
+                    AUDIT_ROWS.labels(table=self.table, outcome="dropped").inc(len(batch))
+                    logger.error("Dropped %d %s row(s) after %d attempt(s): %s", len(batch), self.table, attempt + 1, e)
+                    return
+                delay = self.retry_backoff * (2 ** attempt)
+                logger.warning("Insert of %d row(s) failed (%s); retrying in %.1fs", len(batch), e, delay)
+                await asyncio.sleep(delay)
+
+    async def _split(self, batch: List[dict], error: Exception):
+        """Writes the halves separately until the rejected rows are isolated."""
+        if len(batch) == 1:
+            AUDIT_ROWS.labels(table=self.table, outcome="dropped").inc()
+            logger.error("Dropped %s row rejected by the database: %s", self.table, error)
+            return
+        middle = len(batch) // 2
+        await self._write(batch[:middle])
+        await self._write(batch[middle:])
+
+    async def close(self):
+        """Stops the flusher and writes the remaining rows."""
+        self._closed = True
+        if self._task is not None:
+            self._signal()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+@lru_cache
+def get_audit_log() -> AuditLogWriter:
+    """Returns the process-wide `ai_actions` writer shared by all agents."""
+    settings = get_settings()
+    return AuditLogWriter(
+        table="ai_actions",
+        batch_size=settings.audit_log_batch_size,
+        flush_interval=settings.audit_log_flush_seconds,
+        max_retries=settings.audit_log_max_retries,
+        max_buffer=settings.audit_log_max_buffer
+    )
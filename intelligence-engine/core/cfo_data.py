@@ -0,0 +1,161 @@
+"""
+Data acquisition for CFO analysis.
+
+Non-blocking reads of the contracts and worklog data the CFO engine consumes.
+fetch_cfo_dataset issues both reads of a workspace concurrently; they go
+through the shared Supabase client, whose PostgREST session keeps a pool of
+keep-alive connections, so concurrent reads reuse open connections.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List
+
+from core.config import get_settings
+from core.metrics import time_phase
+from core.supabase import get_supabase_client, execute
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CFODataset:
+    """Input data of one workspace's CFO analysis."""
+    workspace_id: str
+    contracts: List[dict]  # 'id', 'client_name', 'monthly_value', 'hourly_cost'
+    worklogs: List[dict]  # 'client_name', 'total_hours'
+
+    @property
+    def hours_by_client(self) -> Dict[str, float]:
+        return {w["client_name"]: float(w.get("total_hours") or 0) for w in self.worklogs}
+
+    def to_table(self) -> str:
+        """Compact pipe-separated table of the fetched rows, for LLM prompts."""
+        hours = self.hours_by_client
+        lines = ["client | monthly_value | hourly_cost | hours_logged"]
+        for c in self.contracts:
+            lines.append(
+                f"{c.get('client_name')} | {float(c.get('monthly_value') or 0):.2f} | "
+                f"{float(c.get('hourly_cost') or 0):.2f} | {hours.get(c.get('client_name'), 0.0):.1f}"
+            )
+        return "\n".join(lines)
+
+
+async def _timed(job_type: str, phase: str, coro):
+    """Awaits coro as a timed job phase (usable inside asyncio.gather)."""
+    with time_phase(job_type, phase):
+        return await coro
+
+
+async def fetch_cfo_dataset(workspace_id: str, job_type: str = "cfo_analysis") -> CFODataset:
+    """
+    Fetches contracts and the worklog summary of a workspace concurrently.
+    Each read is recorded as a phase of job_type (metrics and trace).
+    """
+    contracts, worklogs = await asyncio.gather(
+        _timed(job_type, "fetch_contracts", fetch_contracts(workspace_id)),
+        _timed(job_type, "fetch_worklogs", fetch_worklog_summary(workspace_id))
+    )
+    return CFODataset(workspace_id=workspace_id, contracts=contracts, worklogs=worklogs)
+
+
+async def fetch_contracts(workspace_id: str) -> List[dict]:
+    """
+    Fetches active contracts for a workspace.
+    Returns rows with 'id', 'client_name', 'monthly_value' and 'hourly_cost'.
+    """
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.table("contracts")
+        .select("id, client_name, monthly_value, hourly_cost")
+        .eq("workspace_id", workspace_id)
+        .eq("is_active", True)
+    )
+    return result.data if result.data else []
+
+
+async def fetch_worklog_summary(workspace_id: str) -> List[dict]:
+    """
+    Fetches hours worked per client.
+    Returns rows with 'client_name' and 'total_hours'.
+    
+    With WORKLOG_INCREMENTAL_ENABLED, hours come from the per-workspace totals
+    that triggers on `worklogs` keep up to date (`get_worklog_summary_totals`
+    RPC: no scan of the worklog history, and edits/deletes are reflected at
+    once); otherwise, or if that RPC fails, from the full `get_worklog_summary` RPC.
+    """
+    settings = get_settings()
+    if settings.worklog_incremental_enabled:
+        try:
+            supabase = get_supabase_client()
+            result = await execute(
+                supabase.rpc("get_worklog_summary_totals", {"workspace_id_param": workspace_id})
+            )
+            return result.data if result.data else []
+        except Exception as e:
+            logger.warning("Worklog totals unavailable, using full RPC: %s", e)
+    return await fetch_worklog_summary_full(workspace_id)
+
+
+async def fetch_worklog_summary_full(workspace_id: str) -> List[dict]:
+    """
+    Fetches hours worked per client via the `get_worklog_summary` RPC,
+    re-aggregating the workspace's whole worklog history.
+    """
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.rpc("get_worklog_summary", {"workspace_id_param": workspace_id})
+    )
+    return result.data if result.data else []
+
+
+# --- Bulk reads (multi-workspace sweep) ---
+
+async def fetch_workspace_ids() -> List[str]:
+    """Returns the ids of every workspace."""
+    supabase = get_supabase_client()
+    result = await execute(supabase.table("workspaces").select("id"))
+    return [row["id"] for row in result.data] if result.data else []
+
+
+async def fetch_contracts_bulk(workspace_ids: List[str]) -> List[dict]:
+    """
+    Fetches active contracts for many workspaces in one query.
+    Rows additionally carry 'workspace_id'.
+    """
+    if not workspace_ids:
+        return []
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.table("contracts")
+        .select("id, workspace_id, client_name, monthly_value, hourly_cost")
+        .in_("workspace_id", workspace_ids)
+        .eq("is_active", True)
+    )
+    return result.data if result.data else []
+
+
+async def fetch_bulk_cfo_data(workspace_ids: List[str], job_type: str = "cfo_batch_analysis") -> tuple[List[dict], List[dict]]:
+    """
+    Fetches contracts and worklog summaries of many workspaces concurrently.
+    Returns (contracts, worklogs), both tagged with 'workspace_id'.
+    """
+    contracts, worklogs = await asyncio.gather(
+        _timed(job_type, "fetch_contracts", fetch_contracts_bulk(workspace_ids)),
+        _timed(job_type, "fetch_worklogs", fetch_worklog_summaries(workspace_ids))
+    )
+    return contracts, worklogs
+
+
+async def fetch_worklog_summaries(workspace_ids: List[str]) -> List[dict]:
+    """
+    Fetches hours per client for many workspaces via the `get_worklog_summaries` RPC.
+    Rows carry 'workspace_id', 'client_name' and 'total_hours'.
+    """
+    if not workspace_ids:
+        return []
+    supabase = get_supabase_client()
+    result = await execute(
+        supabase.rpc("get_worklog_summaries", {"workspace_ids_param": workspace_ids})
+    )
+    return result.data if result.data else []
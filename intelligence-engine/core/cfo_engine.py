@@ -0,0 +1,237 @@
+"""
+Deterministic CFO budget engine.
+
+Computes every BudgetAlert field for all contracts of one or many workspaces
+in a single vectorized NumPy pass. The numbers are reproducible; the LLM only
+writes the narrative around them.
+"""
+from dataclasses import dataclass
+from typing import Dict, List
+
+import numpy as np
+
+from schemas.cfo import BudgetAlert, CFOAnalysisResponse
+
+
+@dataclass
+class BudgetBreakdown:
+    """Per-client budget figures for one workspace (arrays aligned by contract)."""
+    workspace_id: str
+    client_names: List[str]
+    monthly_revenue: np.ndarray
+    hourly_rate: np.ndarray
+    total_hours: np.ndarray
+    revenue_percentage: np.ndarray
+    hours_percentage: np.ndarray
+    expected_cost: np.ndarray
+    budget_variance: np.ndarray
+    variance_percentage: np.ndarray
+    over_budget: np.ndarray
+    total_monthly_revenue: float
+    total_hours_logged: float
+    variance_threshold: float
+
+    def alerts(self) -> List[BudgetAlert]:
+        """BudgetAlerts for every client whose variance crosses the threshold."""
+        alerts = []
+        for i in np.flatnonzero(self.over_budget):
+            revenue = float(self.monthly_revenue[i])
+            cost = float(self.expected_cost[i])
+            alerts.append(BudgetAlert(
+                client_name=self.client_names[i],
+                monthly_revenue=revenue,
+                revenue_percentage=float(self.revenue_percentage[i]),
+                total_hours=float(self.total_hours[i]),
+                hours_percentage=float(self.hours_percentage[i]),
+                expected_cost=cost,
+                hourly_rate=float(self.hourly_rate[i]),
+                budget_variance=float(self.budget_variance[i]),
+                alert_message=(
+                    f"OVER BUDGET: Expected R${revenue:,.0f}, team cost is R${cost:,.0f} "
+                    f"({100 + float(self.variance_percentage[i]):.0f}%)"
+                )
+            ))
+        return alerts
+
+    def summary(self) -> str:
+        """One-line deterministic summary used as the job result summary."""
+        alert_count = int(self.over_budget.sum())
+        if alert_count:
+            return (
+                f"[ALERT] {alert_count} budget alert(s) found. "
+                f"Total Revenue: R${self.total_monthly_revenue:.2f}, "
+                f"Total Hours: {self.total_hours_logged:.1f}h. "
+                f"Check ai_actions for details."
+            )
+        return (
+            f"[OK] Budget healthy. Total Revenue: R${self.total_monthly_revenue:.2f}, "
+            f"Total Hours: {self.total_hours_logged:.1f}h. "
+            f"All clients within margin."
+        )
+
+    def to_response(self) -> CFOAnalysisResponse:
+        return CFOAnalysisResponse(
+            workspace_id=self.workspace_id,
+            total_monthly_revenue=self.total_monthly_revenue,
+            total_hours_logged=self.total_hours_logged,
+            alerts=self.alerts(),
+            summary=self.summary()
+        )
+
+    def to_table(self) -> str:
+        """Compact pipe-separated table of the computed figures, for LLM prompts."""
+        lines = ["client | revenue | revenue_% | hours | hours_% | hourly_rate | expected_cost | variance | variance_% | over_budget"]
+        for i, name in enumerate(self.client_names):
+            lines.append(
+                f"{name} | {self.monthly_revenue[i]:.2f} | {self.revenue_percentage[i]:.1f} | "
+                f"{self.total_hours[i]:.1f} | {self.hours_percentage[i]:.1f} | {self.hourly_rate[i]:.2f} | "
+                f"{self.expected_cost[i]:.2f} | {self.budget_variance[i]:.2f} | "
+                f"{self.variance_percentage[i]:+.1f} | {'yes' if self.over_budget[i] else 'no'}"
+            )
+        return "\n".join(lines)
+
+
+def _safe_percentage(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """(numerator / denominator) * 100, or 0 where the denominator is not positive."""
+    out = np.zeros_like(numerator, dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * 100.0
+
+
+def _budget_kernel(
+    revenue: np.ndarray,
+    rate: np.ndarray,
+    hours: np.ndarray,
+    group: np.ndarray,
+    revenue_totals: np.ndarray,
+    hours_totals: np.ndarray,
+    threshold: float
+) -> dict:
+    """
+    Vectorized budget math over contracts from one or more workspaces.
+    `group` maps each contract to its workspace index in the totals arrays.
+    """
+    expected_cost = hours * rate
+    budget_variance = expected_cost - revenue
+    variance_percentage = _safe_percentage(budget_variance, revenue)
+    return {
+        "revenue_percentage": _safe_percentage(revenue, revenue_totals[group]),
+        "hours_percentage": _safe_percentage(hours, hours_totals[group]),
+        "expected_cost": expected_cost,
+        "budget_variance": budget_variance,
+        "variance_percentage": variance_percentage,
+        "over_budget": variance_percentage > threshold
+    }
+
+
+def analyze_workspace(
+    workspace_id: str,
+    contracts: List[dict],
+    worklog_summary: List[dict],
+    variance_threshold: float
+) -> BudgetBreakdown:
+    """
+    Computes the budget breakdown for one workspace.
+
+    Args:
+        contracts: rows with 'client_name', 'monthly_value', 'hourly_cost'
+        worklog_summary: `get_worklog_summary` rows with 'client_name', 'total_hours'
+        variance_threshold: variance % above which a client is over budget
+    """
+    hours_by_client = {w["client_name"]: float(w["total_hours"] or 0) for w in worklog_summary}
+
+    client_names = [c["client_name"] for c in contracts]
+    revenue = np.array([float(c["monthly_value"] or 0) for c in contracts], dtype=np.float64)
+    rate = np.array([float(c["hourly_cost"] or 0) for c in contracts], dtype=np.float64)
+    hours = np.array([hours_by_client.get(name, 0.0) for name in client_names], dtype=np.float64)
+
+    total_revenue = float(revenue.sum())
+    total_hours = float(sum(hours_by_client.values()))
+
+    figures = _budget_kernel(
+        revenue, rate, hours,
+        group=np.zeros(len(contracts), dtype=np.intp),
+        revenue_totals=np.array([total_revenue]),
+        hours_totals=np.array([total_hours]),
+        threshold=variance_threshold
+    )
+
+    return BudgetBreakdown(
+        workspace_id=workspace_id,
+        client_names=client_names,
+        monthly_revenue=revenue,
+        hourly_rate=rate,
+        total_hours=hours,
+        total_monthly_revenue=total_revenue,
+        total_hours_logged=total_hours,
+        variance_threshold=variance_threshold,
+        **figures
+    )
+
+
+def analyze_workspaces(
+    workspace_ids: List[str],
+    contracts: List[dict],
+    worklog_summaries: List[dict],
+    variance_threshold: float
+) -> Dict[str, BudgetBreakdown]:
+    """
+    Computes budget breakdowns for many workspaces in one vectorized pass.
+
+    Args:
+        workspace_ids: workspaces to analyze (all get a breakdown, possibly empty)
+        contracts: rows with 'workspace_id', 'client_name', 'monthly_value', 'hourly_cost'
+        worklog_summaries: `get_worklog_summaries` rows with 'workspace_id', 'client_name', 'total_hours'
+        variance_threshold: variance % above which a client is over budget
+    """
+    index = {workspace_id: i for i, workspace_id in enumerate(workspace_ids)}
+    n_workspaces = len(workspace_ids)
+
+    contracts = [c for c in contracts if c["workspace_id"] in index]
+    worklog_summaries = [w for w in worklog_summaries if w["workspace_id"] in index]
+    hours_by_client = {
+        (w["workspace_id"], w["client_name"]): float(w["total_hours"] or 0)
+        for w in worklog_summaries
+    }
+
+    client_names = [c["client_name"] for c in contracts]
+    group = np.array([index[c["workspace_id"]] for c in contracts], dtype=np.intp)
+    revenue = np.array([float(c["monthly_value"] or 0) for c in contracts], dtype=np.float64)
+    rate = np.array([float(c["hourly_cost"] or 0) for c in contracts], dtype=np.float64)
+    hours = np.array(
+        [hours_by_client.get((c["workspace_id"], c["client_name"]), 0.0) for c in contracts],
+        dtype=np.float64
+    )
+
+    # Per-workspace totals (worklog totals include rows without a matching contract)
+    worklog_group = np.array([index[w["workspace_id"]] for w in worklog_summaries], dtype=np.intp)
+    worklog_hours = np.array([float(w["total_hours"] or 0) for w in worklog_summaries], dtype=np.float64)
+    revenue_totals = np.bincount(group, weights=revenue, minlength=n_workspaces)
+    hours_totals = np.bincount(worklog_group, weights=worklog_hours, minlength=n_workspaces)
+
+    figures = _budget_kernel(
+        revenue, rate, hours,
+        group=group,
+        revenue_totals=revenue_totals,
+        hours_totals=hours_totals,
+        threshold=variance_threshold
+    )
+
+    # Split the flat arrays back into per-workspace breakdowns
+    order = np.argsort(group, kind="stable")
+    bounds = np.searchsorted(group[order], np.arange(n_workspaces + 1))
+    breakdowns = {}
+    for i, workspace_id in enumerate(workspace_ids):
+        rows = order[bounds[i]:bounds[i + 1]]
+        breakdowns[workspace_id] = BudgetBreakdown(
+            workspace_id=workspace_id,
+            client_names=[client_names[j] for j in rows],
+            monthly_revenue=revenue[rows],
+            hourly_rate=rate[rows],
+            total_hours=hours[rows],
+            total_monthly_revenue=float(revenue_totals[i]),
+            total_hours_logged=float(hours_totals[i]),
+            variance_threshold=variance_threshold,
+            **{name: values[rows] for name, values in figures.items()}
+        )
+    return breakdowns
@@ -4,6 +4,7 @@ Reads environment variables for Supabase, LLM APIs, and CORS configuration.
 """
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Dict
 
 
 class Settings(BaseSettings):
@@ -18,6 +19,87 @@ class Settings(BaseSettings):
     openrouter_model: str = "deepseek/deepseek-r1"
     gemini_api_key: str
     
+    # CFO Analysis Configuration
+    # Variance % (expected cost vs monthly revenue) above which a client is flagged.
+    cfo_variance_threshold: float = 10.0
+    # Workspaces fetched, computed and written per bulk round-trip in batch sweeps.
+    cfo_batch_chunk_size: int = 100
+    # "pipeline": data is prefetched and inlined into the task, the agent runs
+    # without tools (one LLM turn). "tools": the agent fetches data via tool calls.
+    cfo_crew_mode: str = "pipeline"
+    # Workspaces without alerts get a templated "healthy" report instead of an LLM run.
+    cfo_skip_llm_when_healthy: bool = True
+    # CrewAI's verbose console output; agent steps are recorded in the job trace either way.
+    crew_verbose: bool = False
+    
+    # LLM Completion Cache (core/llm_cache.py)
+    # Identical prompts (model, temperature, normalized messages) are answered from disk.
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".cache/llm_completions.sqlite3"  # Relative to intelligence-engine/
+    llm_cache_max_mb: float = 64.0  # Least recently used completions are evicted above this
+    
+    # Worklog hours from the trigger-maintained per-workspace totals
+    # (get_worklog_summary_totals RPC) instead of re-aggregating every worklog
+    worklog_incremental_enabled: bool = True
+    
+    # Job Worker Configuration
+    # Jobs are queued in the `jobs` table and executed by a bounded worker pool
+    # (python worker.py, the production setup). worker_embedded=true makes the API
+    # process run a pool itself: an opt-in for local development only, and the
+    # only setup in which /jobs/{job_id}/stream sends `step` events (in-process pub/sub).
+    worker_pool_size: int = 4
+    worker_type_limits: Dict[str, int] = {"cfo_analysis": 4, "cfo_batch_analysis": 1}
+    worker_poll_interval_seconds: float = 2.0
+    worker_shutdown_timeout_seconds: float = 30.0
+    worker_embedded: bool = False
+    job_lease_seconds: int = 300
+    job_max_attempts: int = 3
+    
+    # Result Cache Configuration
+    # "memory" (process-local LRU), "jobs" (completed rows of the jobs table) or "none"
+    result_cache_backend: str = "memory"
+    result_cache_ttl_seconds: int = 3600
+    result_cache_max_entries: int = 256
+    
+    # Audit Log (ai_actions rows, see core/audit_log.py)
+    # Rows are buffered and bulk-inserted in the background.
+    audit_log_batch_size: int = 100  # Flush as soon as this many rows are buffered
+    audit_log_flush_seconds: float = 1.0  # ...or at least this often
+    audit_log_max_retries: int = 3
+    audit_log_max_buffer: int = 10000  # Oldest rows are dropped beyond this
+    
+    # Job Read Cache (get_job / GET /jobs/{job_id}, see core/job_cache.py)
+    # Local writes invalidate immediately; other processes' writes show up after the TTL.
+    job_read_cache_ttl_seconds: float = 2.0  # Pending/running jobs
+    job_read_cache_terminal_ttl_seconds: float = 300.0  # Completed/failed jobs
+    job_read_cache_max_entries: int = 1024
+    
+    # Job Streaming (/jobs/{job_id}/stream)
+    # Without an in-process event for this long, the stream re-reads the job
+    # (covers jobs running in a separate worker process).
+    job_stream_poll_seconds: float = 5.0
+    job_stream_max_seconds: int = 900
+    
+    # Health Monitoring (/health, /livez, /readyz)
+    # Dependencies are probed in the background; endpoints serve the cached snapshot.
+    health_refresh_seconds: float = 15.0
+    health_probe_timeout_seconds: float = 3.0
+    health_stale_seconds: float = 60.0  # Older snapshots make /readyz fail
+    health_llm_probe_enabled: bool = True  # LLM is reported but not required for readiness
+    health_llm_probe_url: str = "https://api.groq.com/openai/v1/models"
+    
+    # Metrics (/metrics)
+    metrics_queue_depth_ttl_seconds: float = 10.0  # Queue depth is re-read at most this often
+    # worker.py exports job/LLM metrics here (the scrape target for job timings); 0 = off
+    worker_metrics_port: int = 9100
+    
+    # Logging (core/logs.py)
+    # Records are queued and written as JSON lines by a background thread.
+    log_level: str = "INFO"
+    log_levels: Dict[str, str] = {"httpx": "WARNING", "LiteLLM": "WARNING"}  # Per-logger overrides
+    log_format: str = "json"  # "json" or "text"
+    log_queue_size: int = 10000  # Records beyond this are dropped
+    
     # CORS Configuration
     nextjs_url: str = "http://localhost:3000"
     
@@ -26,6 +108,11 @@ class Settings(BaseSettings):
     port: int = 8000
     internal_api_secret: str  # Mandatory for security
     
+    # Supabase I/O Configuration
+    # supabase-py is synchronous; queries issued from async routes run on a
+    # bounded thread pool so a slow PostgREST round-trip never blocks the loop.
+    supabase_max_workers: int = 8
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         case_sensitive=False,
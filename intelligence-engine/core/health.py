@@ -0,0 +1,167 @@
+"""
+Dependency health monitoring.
+
+A background loop probes each dependency (Supabase, LLM provider) every
+HEALTH_REFRESH_SECONDS and keeps the latest result in memory. The health
+endpoints (/health, /livez, /readyz) only read that snapshot, so probes from
+load balancers and Kubernetes never cost a database round-trip and never
+block the event loop.
+"""
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
+
+import httpx
+
+from core.config import get_settings
+from core.supabase import get_supabase_client, execute
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DependencyStatus:
+    name: str
+    ok: bool
+    critical: bool
+    latency_ms: Optional[float] = None
+    error: Optional[str] = None
+    checked_at: Optional[float] = None  # Unix timestamp of the last probe
+
+
+Probe = Callable[[], Awaitable[None]]
+
+
+async def probe_supabase():
+    """Minimal PostgREST round-trip (same query as test_connection)."""
+    client = get_supabase_client()
+    await execute(client.table("workspaces").select("id").limit(1))
+
+
+async def probe_llm():
+    """Lists models on the LLM provider (Groq); checks reachability and the API key."""
+    settings = get_settings()
+    api_key = os.getenv("GROQ_API_KEY")
+    if not api_key:
+        raise RuntimeError("GROQ_API_KEY not configured")
+    async with httpx.AsyncClient(timeout=settings.health_probe_timeout_seconds) as client:
+        response = await client.get(
+            settings.health_llm_probe_url,
+            headers={"Authorization": f"Bearer {api_key}"}
+        )
+        response.raise_for_status()
+
+
+class HealthMonitor:
+    """Refreshes dependency probes in the background and serves cached results."""
+
+    def __init__(
+        self,
+        probes: Dict[str, Probe],
+        critical: Optional[set] = None,
+        refresh_seconds: float = 15.0,
+        timeout_seconds: float = 3.0,
+        stale_seconds: float = 60.0
+    ):
+        self.probes = probes
+        self.critical = critical if critical is not None else set(probes)
+        self.refresh_seconds = refresh_seconds
+        self.timeout_seconds = timeout_seconds
+        self.stale_seconds = stale_seconds
+        self.started_at = time.time()
+
+        self._statuses: Dict[str, DependencyStatus] = {}
+        self._refreshed_at: Optional[float] = None
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        """Refresh loop. Returns after stop()."""
+        while not self._stopping.is_set():
+            await self.refresh()
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.refresh_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self._stopping.set()
+
+    async def refresh(self):
+        """Probes every dependency concurrently and stores the results."""
+        statuses = await asyncio.gather(*(self._check(name, probe) for name, probe in self.probes.items()))
+        self._statuses = {status.name: status for status in statuses}
+        self._refreshed_at = time.monotonic()
+
+    async def _check(self, name: str, probe: Probe) -> DependencyStatus:
+        started = time.perf_counter()
+        ok, error = True, None
+        try:
+            await asyncio.wait_for(probe(), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            ok, error = False, f"timed out after {self.timeout_seconds}s"
+        except Exception as e:
+            ok, error = False, str(e)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        previous = self._statuses.get(name)
+        if not ok and (previous is None or previous.ok):
+            logger.warning("%s probe failed: %s", name, error)
+        elif ok and previous is not None and not previous.ok:
+            logger.info("%s recovered (%s ms)", name, latency_ms)
+        return DependencyStatus(
+            name=name,
+            ok=ok,
+            critical=name in self.critical,
+            latency_ms=latency_ms,
+            error=error,
+            checked_at=time.time()
+        )
+
+    @property
+    def stale(self) -> bool:
+        """True before the first refresh or when the refresh loop stopped updating."""
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.stale_seconds
+
+    @property
+    def ready(self) -> bool:
+        """Fresh snapshot with every critical dependency reachable."""
+        if self.stale:
+            return False
+        return all(s.ok for s in self._statuses.values() if s.critical)
+
+    def snapshot(self) -> dict:
+        """Cached health report (never probes)."""
+        statuses = list(self._statuses.values())
+        if not self.ready:
+            status = "unhealthy"
+        elif all(s.ok for s in statuses):
+            status = "healthy"
+        else:
+            status = "degraded"  # A non-critical dependency is down
+        age = None if self._refreshed_at is None else round(time.monotonic() - self._refreshed_at, 1)
+        return {
+            "status": status,
+            "ready": self.ready,
+            "snapshot_age_seconds": age,
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "dependencies": {s.name: asdict(s) for s in statuses}
+        }
+
+
+@lru_cache
+def get_health_monitor() -> HealthMonitor:
+    """Returns the process-wide health monitor."""
+    settings = get_settings()
+    probes: Dict[str, Probe] = {"supabase": probe_supabase}
+    if settings.health_llm_probe_enabled:
+        probes["llm"] = probe_llm
+    return HealthMonitor(
+        probes,
+        critical={"supabase"},
+        refresh_seconds=settings.health_refresh_seconds,
+        timeout_seconds=settings.health_probe_timeout_seconds,
+        stale_seconds=settings.health_stale_seconds
+    )
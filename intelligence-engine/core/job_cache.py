@@ -0,0 +1,133 @@
+"""
+Read-through cache for single-job lookups (core.job_tracker.get_job).
+
+Dashboards poll /jobs/{job_id}; most polls see an unchanged job. Entries
+live for JOB_READ_CACHE_TTL_SECONDS while a job is pending/running and
+JOB_READ_CACHE_TERMINAL_TTL_SECONDS once it completed or failed (terminal
+rows no longer change). Writes in this process (update_job, claims)
+invalidate the entry immediately; writes by other processes are picked up
+when the TTL expires.
+
+Several representations of a job can be cached side by side (`variant`:
+the Job object for get_job, one JSON snapshot per field projection for
+GET /jobs/{job_id}); invalidating a job drops all of them. Concurrent misses
+for the same job and variant share one store read, and a read that races
+with an invalidation is not cached (per-job generation counter).
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Awaitable, Callable, Dict, Optional
+
+from core.config import get_settings
+from core.metrics import JOB_READ_CACHE_REQUESTS
+
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+class JobReadCache:
+    """
+    Process-local LRU of job representations with status-dependent TTL.
+    Cached values expose `status` (JobStatus or str); max_entries counts jobs.
+    """
+
+    def __init__(self, ttl_seconds: float, terminal_ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.terminal_ttl_seconds = terminal_ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, Dict[str, tuple[float, object]]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 or self.terminal_ttl_seconds > 0
+
+    def _ttl_for(self, job) -> float:
+        status = getattr(job.status, "value", job.status)
+        return self.terminal_ttl_seconds if status in TERMINAL_STATUSES else self.ttl_seconds
+
+    def _get_fresh(self, job_id: str, variant: str):
+        variants = self._entries.get(job_id)
+        entry = variants.get(variant) if variants else None
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del variants[variant]
+            return None
+        self._entries.move_to_end(job_id)
+        return value
+
+    def _put(self, job_id: str, variant: str, value):
+        ttl = self._ttl_for(value)
+        if ttl <= 0:
+            return
+        self._entries.setdefault(job_id, {})[variant] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(job_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get(
+        self,
+        job_id: str,
+        load: Callable[[str], Awaitable[Optional[object]]],
+        variant: str = "job"
+    ):
+        """Returns the cached value, or loads it (missing jobs are not cached)."""
+        if not self.enabled:
+            return await load(job_id)
+
+        value = self._get_fresh(job_id, variant)
+        if value is not None:
+            JOB_READ_CACHE_REQUESTS.labels(result="hit").inc()
+            return value
+
+        key = (job_id, variant)
+        load_task = self._inflight.get(key)
+        if load_task is None:
+            JOB_READ_CACHE_REQUESTS.labels(result="miss").inc()
+            generation = self._generations.get(job_id, 0)
+            # A task, so a cancelled caller doesn't cancel the read for the others
+            load_task = asyncio.ensure_future(load(job_id))
+            self._inflight[key] = load_task
+            load_task.add_done_callback(lambda task: self._loaded(key, generation, task))
+        else:
+            JOB_READ_CACHE_REQUESTS.labels(result="coalesced").inc()
+        return await asyncio.shield(load_task)
+
+    def _loaded(self, key: tuple, generation: int, task: asyncio.Future):
+        job_id, variant = key
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        if value is not None and self._generations.get(job_id, 0) == generation:
+            self._put(job_id, variant, value)
+
+    def invalidate(self, job_id: str):
+        """Drops the entry; reads already in flight won't re-populate it."""
+        self._entries.pop(job_id, None)
+        self._generations[job_id] = self._generations.get(job_id, 0) + 1
+        # Generations only matter while a read is in flight
+        if len(self._generations) > self.max_entries * 4:
+            inflight_jobs = {job_id for job_id, _ in self._inflight}
+            self._generations = {k: v for k, v in self._generations.items() if k in inflight_jobs}
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+
+
+@lru_cache
+def get_job_read_cache() -> JobReadCache:
+    """Returns the process-wide job read cache (TTLs of 0 disable it)."""
+    settings = get_settings()
+    return JobReadCache(
+        ttl_seconds=settings.job_read_cache_ttl_seconds,
+        terminal_ttl_seconds=settings.job_read_cache_terminal_ttl_seconds,
+        max_entries=settings.job_read_cache_max_entries
+    )
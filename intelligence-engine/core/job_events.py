@@ -0,0 +1,98 @@
+"""
+In-process pub/sub for job progress events.
+
+update_job publishes every status transition; agents publish intermediate
+steps with publish_step. Subscribers (e.g. the /jobs/{job_id}/stream SSE
+endpoint) receive events on an asyncio.Queue. publish() is thread-safe, so
+CrewAI callbacks running in worker threads can publish directly.
+
+Events only reach subscribers in the same process. With the production
+setup (WORKER_EMBEDDED=false, jobs run by `python worker.py`) the API never
+sees them: /jobs/{job_id}/stream then sends no `step` events and reads the
+job store every JOB_STREAM_POLL_SECONDS for status changes. Step streaming
+needs WORKER_EMBEDDED=true.
+"""
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+# Per-subscriber buffer; the oldest events are dropped when a client lags
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+class JobEventBus:
+    """Fan-out of job events to per-job subscriber queues."""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Registers a queue receiving every event published for job_id."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[job_id].add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, job_id: str, queue: asyncio.Queue):
+        with self._lock:
+            subscribers = self._subscribers.get(job_id)
+            if not subscribers:
+                return
+            subscribers.difference_update({s for s in subscribers if s[1] is queue})
+            if not subscribers:
+                del self._subscribers[job_id]
+
+    def has_subscribers(self, job_id: str) -> bool:
+        return bool(self._subscribers.get(job_id))
+
+    def publish(self, job_id: str, event: str, data: Dict[str, Any]):
+        """Delivers an event to all subscribers of job_id (safe from any thread)."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        if not subscribers:
+            return
+        message = {"event": event, "data": {"job_id": job_id, "ts": time.time(), **data}}
+        for loop, queue in subscribers:
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if running is loop:
+                _offer(queue, message)
+            else:
+                try:
+                    loop.call_soon_threadsafe(_offer, queue, message)
+                except RuntimeError:
+                    pass  # Subscriber's loop already closed
+
+
+def _offer(queue: asyncio.Queue, message: dict):
+    if queue.full():
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+    queue.put_nowait(message)
+
+
+job_events = JobEventBus()
+
+
+def publish_status(job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+    """Publishes a status transition (called by update_job)."""
+    data: Dict[str, Any] = {"status": status}
+    if result is not None:
+        data["result"] = result
+    if error is not None:
+        data["error"] = error
+    job_events.publish(job_id, "status", data)
+
+
+def publish_step(job_id: Optional[str], step: str, **details: Any):
+    """Publishes an intermediate step (pipeline phase, agent thought, tool call)."""
+    if job_id:
+        job_events.publish(job_id, "step", {"step": step, **details})
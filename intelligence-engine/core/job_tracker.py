@@ -1,17 +1,46 @@
 """
-In-memory async job tracker for AI agent tasks.
+Async job tracker for AI agent tasks.
 
-MVP IMPLEMENTATION: Uses Python dict for job storage.
-PRODUCTION TODO: Migrate to Redis or PostgreSQL queue for:
-  - Job persistence across restarts
-  - Multi-worker support (Gunicorn)
-  - Distributed task processing
+Jobs are persisted through a pluggable JobStore backend:
+  - SupabaseJobStore (default): `jobs` table, blocking supabase-py calls are
+    run on the bounded executor from core.supabase so they never stall the
+    event loop.
+  - InMemoryJobStore: process-local dict, for local development and scripts.
+
+Execution follows a claim/lease protocol (see core.worker): workers claim
+`pending` jobs (or `running` jobs whose lease expired) and renew the lease
+while the job runs.
+
+Job types in SINGLE_FLIGHT_JOB_TYPES are single-flight per workspace: while
+a job is pending/running, create_job returns that job (flagged
+`deduplicated`) instead of queueing another. Supabase enforces this across
+processes with a partial unique index (20261017_jobs_single_flight.sql).
+
+The module-level functions (create_job, create_jobs, get_job, update_job,
+list_jobs, claim_jobs, renew_job_lease, queue_depth, save_job_trace,
+get_job_trace) are the public surface and delegate to the active store.
+list_jobs pages by keyset (see encode_job_cursor). get_job reads through a
+short-TTL cache that update_job and claim_jobs invalidate (core.job_cache).
 """
+import asyncio
+import base64
+import copy
+import hashlib
+import json
+import logging
+import re
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, Optional
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+from supabase import PostgrestAPIError
+
+logger = logging.getLogger(__name__)
+
 
 class JobStatus(str, Enum):
     """Job execution status."""
@@ -23,16 +52,21 @@ class JobStatus(str, Enum):
 
 class Job:
     """Represents an async AI agent job."""
-    
+
     def __init__(self, job_type: str):
         self.id = str(uuid.uuid4())
         self.type = job_type  # 'cfo_analysis', 'scrum_priority', etc.
+        self.workspace_id: Optional[str] = None
+        self.payload: Optional[dict] = None  # Job input, e.g. {'workspace_ids': [...]}
+        self.attempts = 0
         self.status = JobStatus.PENDING
         self.result: Optional[dict] = None
         self.error: Optional[str] = None
         self.created_at = datetime.utcnow()
         self.updated_at = datetime.utcnow()
-    
+        # Set by create_job when an in-flight job was returned instead of a new one
+        self.deduplicated = False
+
     def to_dict(self) -> dict:
         """Serialize job for API response."""
         return {
@@ -46,105 +80,707 @@ class Job:
         }
 
 
-from core.supabase import get_supabase_client
-from datetime import datetime
+from core.supabase import get_supabase_client, execute, fetch_row_json
+from core.job_events import publish_status
+from core.job_cache import get_job_read_cache
+from core.metrics import JOBS_DEDUPLICATED
+
+
+# Columns read for Job objects; the (large) `trace` column is only read by get_job_trace
+JOB_COLUMNS = "id, type, workspace_id, payload, attempts, status, result, error, created_at, updated_at"
+# Listings leave out the (large) payload/result; clients fetch single jobs for those
+JOB_LIST_COLUMNS = "id, type, workspace_id, attempts, status, error, created_at, updated_at"
 
-# Supabase Persistence Implementation
+# Fields of GET /jobs/{job_id}. Snapshots always start with the version
+# fields, in this order, so they can be read off the raw JSON bytes.
+JOB_RESPONSE_FIELDS = ("id", "type", "status", "result", "error", "created_at", "updated_at")
+JOB_VERSION_FIELDS = ("status", "updated_at")
+_VERSION_PREFIX = re.compile(rb'^\{"status":"([a-z]+)","updated_at":"([^"]+)"')
 
-def create_job(job_type: str, workspace_id: Optional[str] = None) -> Job:
+
+@dataclass
+class JobSnapshot:
+    """A job serialized for GET /jobs/{job_id}: raw JSON body plus its version."""
+    body: bytes
+    status: str
+    updated_at: str
+    etag: str
+
+
+def snapshot_columns(fields: Optional[List[str]] = None) -> List[str]:
     """
-    Creates a new job in Supabase.
-    Returns the created Job instance.
+    Column list for a snapshot: the version fields, then the requested
+    fields (all of JOB_RESPONSE_FIELDS by default). Raises ValueError on
+    unknown fields.
     """
-    client = get_supabase_client()
-    data = {
-        "type": job_type,
-        "workspace_id": workspace_id,
-        "status": JobStatus.PENDING,
-        "created_at": datetime.utcnow().isoformat(),
-        "updated_at": datetime.utcnow().isoformat()
-    }
-    
-    # Execute insert and get single row back
-    # Note: Supabase-py uses .execute() which returns response
-    response = client.table("jobs").insert(data).execute()
-    
-    if not response.data:
-        raise Exception("Failed to create job in Supabase")
-        
-    record = response.data[0]
-    return _record_to_job(record)
+    requested = list(JOB_RESPONSE_FIELDS) if fields is None else fields
+    unknown = sorted(set(requested) - set(JOB_RESPONSE_FIELDS))
+    if unknown:
+        raise ValueError(f"Unknown job field(s): {', '.join(unknown)}")
+    return list(JOB_VERSION_FIELDS) + [
+        f for f in JOB_RESPONSE_FIELDS if f in requested and f not in JOB_VERSION_FIELDS
+    ]
+
+
+def _to_snapshot(body: bytes, columns: List[str]) -> JobSnapshot:
+    match = _VERSION_PREFIX.match(body)
+    if match:
+        status, updated_at = match.group(1).decode(), match.group(2).decode()
+    else:
+        record = json.loads(body)
+        status, updated_at = record["status"], record["updated_at"]
+    version = hashlib.sha1(f"{updated_at}|{','.join(columns)}".encode()).hexdigest()[:16]
+    return JobSnapshot(body=body, status=status, updated_at=updated_at, etag=f'W/"{version}-{status}"')
+
+
+# At most one pending/running job per workspace (keep in sync with idx_jobs_single_flight)
+SINGLE_FLIGHT_JOB_TYPES = {"cfo_analysis"}
+IN_FLIGHT_STATUSES = (JobStatus.PENDING, JobStatus.RUNNING)
+# Postgres unique_violation
+UNIQUE_VIOLATION = "23505"
+
+# Keyset position in job listings: (created_at, id) of the last job of a page.
+# Listings are ordered by created_at DESC, id DESC (see 20261017_jobs_listing_indexes.sql).
+JobCursor = Tuple[datetime, str]
+
+
+def encode_job_cursor(job: Job) -> str:
+    """Opaque cursor pointing just past `job` in a listing."""
+    raw = f"{job.created_at.isoformat()}|{job.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_job_cursor(cursor: str) -> JobCursor:
+    """Inverse of encode_job_cursor. Raises ValueError on malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, job_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), str(uuid.UUID(job_id))
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+# --- Store Interface ---
+
+class JobStore(ABC):
+    """Persistence backend for jobs. All methods are non-blocking."""
+
+    @abstractmethod
+    async def create_job(
+        self,
+        job_type: str,
+        workspace_id: Optional[str] = None,
+        payload: Optional[dict] = None
+    ) -> Job:
+        ...
+
+    @abstractmethod
+    async def create_jobs(self, job_type: str, entries: list[dict]) -> list[Job]:
+        ...
+
+    @abstractmethod
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    async def get_job_json(self, job_id: str, columns: List[str]) -> Optional[bytes]:
+        """The job's `columns` as a JSON object, keys in `columns` order."""
+        ...
+
+    @abstractmethod
+    async def update_job(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[dict] = None,
+        error: Optional[str] = None
+    ):
+        ...
+
+    @abstractmethod
+    async def list_jobs(
+        self,
+        limit: int = 10,
+        workspace_id: Optional[str] = None,
+        job_type: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        after: Optional[JobCursor] = None
+    ) -> list[Job]:
+        ...
+
+    @abstractmethod
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        job_type: str,
+        limit: int,
+        lease_seconds: int,
+        max_attempts: int
+    ) -> list[Job]:
+        ...
+
+    @abstractmethod
+    async def renew_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        ...
 
+    @abstractmethod
+    async def queue_depth(self) -> list[dict]:
+        ...
 
-def get_job(job_id: str) -> Optional[Job]:
+    @abstractmethod
+    async def save_trace(self, job_id: str, trace: dict):
+        ...
+
+    @abstractmethod
+    async def get_trace(self, job_id: str) -> Optional[dict]:
+        ...
+
+
+# --- Supabase Persistence Implementation ---
+
+class SupabaseJobStore(JobStore):
+    """Stores jobs in the Supabase `jobs` table."""
+
+    def __init__(self):
+        # Local lease deadline (monotonic) per job claimed or renewed by this process
+        self._lease_deadlines: Dict[str, float] = {}
+
+    async def create_job(
+        self,
+        job_type: str,
+        workspace_id: Optional[str] = None,
+        payload: Optional[dict] = None
+    ) -> Job:
+        client = get_supabase_client()
+        data = {
+            "type": job_type,
+            "workspace_id": workspace_id,
+            "payload": payload,
+            "status": JobStatus.PENDING,
+            "created_at": datetime.utcnow().isoformat(),
+            "updated_at": datetime.utcnow().isoformat()
+        }
+
+        # The in-flight job may finish between a conflict and the lookup; retry then
+        for _ in range(3):
+            try:
+                response = await execute(client.table("jobs").insert(data))
+            except PostgrestAPIError as e:
+                if e.code != UNIQUE_VIOLATION or job_type not in SINGLE_FLIGHT_JOB_TYPES:
+                    raise
+                existing = await self._find_in_flight(job_type, workspace_id)
+                if existing is not None:
+                    existing.deduplicated = True
+                    return existing
+                continue
+
+            if not response.data:
+                raise Exception("Failed to create job in Supabase")
+
+            record = response.data[0]
+            return _record_to_job(record)
+
+        raise Exception(f"Failed to create {job_type} job for workspace {workspace_id}: in-flight job conflict")
+
+    async def _find_in_flight(self, job_type: str, workspace_id: str) -> Optional[Job]:
+        client = get_supabase_client()
+        response = await execute(
+            client.table("jobs")
+            .select(JOB_COLUMNS)
+            .eq("type", job_type)
+            .eq("workspace_id", workspace_id)
+            .in_("status", [status.value for status in IN_FLIGHT_STATUSES])
+            .limit(1)
+        )
+        return _record_to_job(response.data[0]) if response.data else None
+
+    async def create_jobs(self, job_type: str, entries: list[dict]) -> list[Job]:
+        if not entries:
+            return []
+        client = get_supabase_client()
+        now = datetime.utcnow().isoformat()
+        rows = [
+            {
+                "type": job_type,
+                "workspace_id": entry.get("workspace_id"),
+                "status": entry.get("status", JobStatus.PENDING),
+                "result": entry.get("result"),
+                "error": entry.get("error"),
+                "created_at": now,
+                "updated_at": now
+            }
+            for entry in entries
+        ]
+
+        # Single multi-row insert
+        response = await execute(client.table("jobs").insert(rows))
+
+        if not response.data:
+            raise Exception("Failed to create jobs in Supabase")
+
+        return [_record_to_job(r) for r in response.data]
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        client = get_supabase_client()
+        try:
+            response = await execute(client.table("jobs").select(JOB_COLUMNS).eq("id", job_id))
+            if response.data and len(response.data) > 0:
+                return _record_to_job(response.data[0])
+            return None
+        except Exception as e:
+            logger.error("Error getting job %s: %s", job_id, e)
+            return None
+
+    async def get_job_json(self, job_id: str, columns: List[str]) -> Optional[bytes]:
+        # PostgREST serializes the row in select order; the bytes are passed through as-is
+        try:
+            return await fetch_row_json("jobs", ",".join(columns), {"id": job_id})
+        except Exception as e:
+            logger.error("Error getting job %s: %s", job_id, e)
+            return None
+
+    async def update_job(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[dict] = None,
+        error: Optional[str] = None
+    ):
+        client = get_supabase_client()
+        update_data = {
+            "status": status,
+            "updated_at": datetime.utcnow().isoformat()
+        }
+
+        if result is not None:
+            update_data["result"] = result
+        if error is not None:
+            update_data["error"] = error
+        if status in (JobStatus.COMPLETED, JobStatus.FAILED):
+            self._lease_deadlines.pop(job_id, None)
+
+        try:
+            await execute(client.table("jobs").update(update_data).eq("id", job_id))
+        except Exception as e:
+            logger.error("Error updating job %s: %s", job_id, e)
+
+    async def list_jobs(
+        self,
+        limit: int = 10,
+        workspace_id: Optional[str] = None,
+        job_type: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        after: Optional[JobCursor] = None
+    ) -> list[Job]:
+        client = get_supabase_client()
+        query = client.table("jobs").select(JOB_LIST_COLUMNS)
+        if workspace_id is not None:
+            query = query.eq("workspace_id", workspace_id)
+        if job_type is not None:
+            query = query.eq("type", job_type)
+        if status is not None:
+            query = query.eq("status", JobStatus(status).value)
+        if after is not None:
+            # (created_at, id) < cursor, as an index range on the listing indexes
+            created_at, job_id = after
+            ts = created_at.isoformat()
+            query = query.or_(f'created_at.lt."{ts}",and(created_at.eq."{ts}",id.lt.{job_id})')
+        try:
+            response = await execute(
+                query.order("created_at", desc=True).order("id", desc=True).limit(limit)
+            )
+            return [_record_to_job(r) for r in response.data]
+        except Exception as e:
+            logger.error("Error listing jobs: %s", e)
+            return []
+
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        job_type: str,
+        limit: int,
+        lease_seconds: int,
+        max_attempts: int
+    ) -> list[Job]:
+        client = get_supabase_client()
+        # The lease starts no earlier than the request, so this deadline is conservative
+        deadline = time.monotonic() + lease_seconds
+        response = await execute(client.rpc("claim_jobs", {
+            "worker_id_param": worker_id,
+            "job_type_param": job_type,
+            "limit_param": limit,
+            "lease_seconds_param": lease_seconds,
+            "max_attempts_param": max_attempts
+        }))
+        jobs = [_record_to_job(r) for r in (response.data or [])]
+        for job in jobs:
+            self._lease_deadlines[job.id] = deadline
+        return jobs
+
+    async def renew_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        client = get_supabase_client()
+        deadline = time.monotonic() + lease_seconds
+        try:
+            response = await execute(client.rpc("renew_job_lease", {
+                "job_id_param": job_id,
+                "worker_id_param": worker_id,
+                "lease_seconds_param": lease_seconds
+            }))
+        except Exception as e:
+            # Keep running while the last lease we hold is still valid; past it,
+            # another worker may have claimed the job, so give it up
+            still_valid = time.monotonic() < self._lease_deadlines.get(job_id, 0.0)
+            logger.error(
+                "Error renewing lease for job %s: %s (%s)",
+                job_id, e, "lease still valid" if still_valid else "lease expired, giving up"
+            )
+            if not still_valid:
+                self._lease_deadlines.pop(job_id, None)
+            return still_valid
+        if not response.data:
+            self._lease_deadlines.pop(job_id, None)
+            return False
+        self._lease_deadlines[job_id] = deadline
+        return True
+
+    async def queue_depth(self) -> list[dict]:
+        client = get_supabase_client()
+        response = await execute(client.rpc("job_queue_depth", {}))
+        return response.data or []
+
+    async def save_trace(self, job_id: str, trace: dict):
+        client = get_supabase_client()
+        try:
+            await execute(client.table("jobs").update({"trace": trace}).eq("id", job_id))
+        except Exception as e:
+            logger.error("Error saving trace for job %s: %s", job_id, e)
+
+    async def get_trace(self, job_id: str) -> Optional[dict]:
+        client = get_supabase_client()
+        response = await execute(client.table("jobs").select("trace").eq("id", job_id))
+        if not response.data:
+            return None
+        return response.data[0].get("trace")
+
+
+# --- In-Memory Implementation ---
+
+class InMemoryJobStore(JobStore):
     """
-    Retrieves a job by ID from Supabase.
+    Process-local job store.
+    Jobs are lost on restart and not shared between workers.
     """
-    client = get_supabase_client()
-    try:
-        response = client.table("jobs").select("*").eq("id", job_id).execute()
-        if response.data and len(response.data) > 0:
-            return _record_to_job(response.data[0])
-        return None
-    except Exception as e:
-        print(f"[JobTracker] Error getting job {job_id}: {e}")
-        return None
 
+    def __init__(self):
+        self._jobs: Dict[str, Job] = {}
+        self._traces: Dict[str, dict] = {}
+        self._leases: Dict[str, tuple[str, datetime]] = {}  # job_id -> (worker_id, expires_at)
+        self._lock = asyncio.Lock()
 
-def update_job(
+    async def create_job(
+        self,
+        job_type: str,
+        workspace_id: Optional[str] = None,
+        payload: Optional[dict] = None
+    ) -> Job:
+        async with self._lock:
+            if job_type in SINGLE_FLIGHT_JOB_TYPES and workspace_id is not None:
+                for existing in self._jobs.values():
+                    if (
+                        existing.type == job_type
+                        and existing.workspace_id == workspace_id
+                        and existing.status in IN_FLIGHT_STATUSES
+                    ):
+                        attached = copy.copy(existing)
+                        attached.deduplicated = True
+                        return attached
+            job = Job(job_type)
+            job.workspace_id = workspace_id
+            job.payload = payload
+            self._jobs[job.id] = job
+        return job
+
+    async def create_jobs(self, job_type: str, entries: list[dict]) -> list[Job]:
+        jobs = []
+        async with self._lock:
+            for entry in entries:
+                job = Job(job_type)
+                job.workspace_id = entry.get("workspace_id")
+                job.status = JobStatus(entry.get("status", JobStatus.PENDING))
+                job.result = entry.get("result")
+                job.error = entry.get("error")
+                self._jobs[job.id] = job
+                jobs.append(job)
+        return jobs
+
+    async def get_job(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def get_job_json(self, job_id: str, columns: List[str]) -> Optional[bytes]:
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        record = job.to_dict()
+        return json.dumps({c: record.get(c) for c in columns}, separators=(",", ":")).encode()
+
+    async def update_job(
+        self,
+        job_id: str,
+        status: JobStatus,
+        result: Optional[dict] = None,
+        error: Optional[str] = None
+    ):
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                logger.error("Error updating job %s: not found", job_id)
+                return
+            job.status = JobStatus(status)
+            job.updated_at = datetime.utcnow()
+            if result is not None:
+                job.result = result
+            if error is not None:
+                job.error = error
+
+    async def list_jobs(
+        self,
+        limit: int = 10,
+        workspace_id: Optional[str] = None,
+        job_type: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        after: Optional[JobCursor] = None
+    ) -> list[Job]:
+        jobs = [
+            job for job in self._jobs.values()
+            if (workspace_id is None or job.workspace_id == workspace_id)
+            and (job_type is None or job.type == job_type)
+            and (status is None or job.status == JobStatus(status))
+            and (after is None or (job.created_at, job.id) < after)
+        ]
+        jobs.sort(key=lambda j: (j.created_at, j.id), reverse=True)
+        return jobs[:limit]
+
+    async def claim_jobs(
+        self,
+        worker_id: str,
+        job_type: str,
+        limit: int,
+        lease_seconds: int,
+        max_attempts: int
+    ) -> list[Job]:
+        now = datetime.utcnow()
+        claimed = []
+        async with self._lock:
+            for job in sorted(self._jobs.values(), key=lambda j: j.created_at):
+                if len(claimed) >= limit:
+                    break
+                if job.type != job_type:
+                    continue
+                lease = self._leases.get(job.id)
+                expired = job.status == JobStatus.RUNNING and lease is not None and lease[1] < now
+                if expired and job.attempts >= max_attempts:
+                    job.status = JobStatus.FAILED
+                    job.error = f"Lease expired after {job.attempts} attempt(s)"
+                    self._leases.pop(job.id, None)
+                    continue
+                if job.status != JobStatus.PENDING and not expired:
+                    continue
+                if job.attempts >= max_attempts:
+                    continue
+                job.status = JobStatus.RUNNING
+                job.attempts += 1
+                job.updated_at = now
+                self._leases[job.id] = (worker_id, now + timedelta(seconds=lease_seconds))
+                claimed.append(job)
+        return claimed
+
+    async def renew_lease(self, job_id: str, worker_id: str, lease_seconds: int) -> bool:
+        async with self._lock:
+            job = self._jobs.get(job_id)
+            lease = self._leases.get(job_id)
+            if job is None or lease is None or lease[0] != worker_id or job.status != JobStatus.RUNNING:
+                return False
+            self._leases[job_id] = (worker_id, datetime.utcnow() + timedelta(seconds=lease_seconds))
+            return True
+
+    async def queue_depth(self) -> list[dict]:
+        counts: Dict[tuple[str, str], int] = {}
+        for job in self._jobs.values():
+            if job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+                key = (job.type, job.status.value)
+                counts[key] = counts.get(key, 0) + 1
+        return [{"type": t, "status": s, "jobs": n} for (t, s), n in counts.items()]
+
+    async def save_trace(self, job_id: str, trace: dict):
+        self._traces[job_id] = trace
+
+    async def get_trace(self, job_id: str) -> Optional[dict]:
+        return self._traces.get(job_id)
+
+
+# --- Active Store ---
+
+_store: JobStore = SupabaseJobStore()
+
+
+def get_job_store() -> JobStore:
+    """Returns the active job store."""
+    return _store
+
+
+def set_job_store(store: JobStore):
+    """Replaces the active job store (e.g. InMemoryJobStore for local runs)."""
+    global _store
+    _store = store
+    get_job_read_cache().clear()
+
+
+# --- Public API ---
+
+async def create_job(
+    job_type: str,
+    workspace_id: Optional[str] = None,
+    payload: Optional[dict] = None
+) -> Job:
+    """
+    Creates a new pending job.
+    Returns the created Job instance, or for SINGLE_FLIGHT_JOB_TYPES the job
+    already in flight for the workspace (with `deduplicated` set).
+    """
+    job = await _store.create_job(job_type, workspace_id=workspace_id, payload=payload)
+    if job.deduplicated:
+        JOBS_DEDUPLICATED.labels(type=job_type).inc()
+        logger.info("%s for workspace %s attached to in-flight job %s", job_type, workspace_id, job.id)
+    return job
+
+
+async def create_jobs(job_type: str, entries: list[dict]) -> list[Job]:
+    """
+    Creates many jobs of one type in a single bulk insert.
+    Each entry may set 'workspace_id', 'status', 'result' and 'error'.
+    Returned jobs keep the order of `entries`.
+    """
+    return await _store.create_jobs(job_type, entries)
+
+
+async def get_job(job_id: str) -> Optional[Job]:
+    """
+    Retrieves a job by ID, through the short-TTL read cache (core.job_cache).
+    """
+    return await get_job_read_cache().get(job_id, lambda jid: _store.get_job(jid))
+
+
+async def get_job_snapshot(job_id: str, fields: Optional[List[str]] = None) -> Optional[JobSnapshot]:
+    """
+    Returns the job serialized as JSON with only the requested fields (plus
+    status and updated_at), read through the job read cache. The body comes
+    straight from the store (raw PostgREST bytes for Supabase).
+    Raises ValueError on unknown fields.
+    """
+    columns = snapshot_columns(fields)
+
+    async def load(jid: str) -> Optional[JobSnapshot]:
+        body = await _store.get_job_json(jid, columns)
+        return _to_snapshot(body, columns) if body is not None else None
+
+    return await get_job_read_cache().get(job_id, load, variant=",".join(columns))
+
+
+async def update_job(
     job_id: str,
     status: JobStatus,
     result: Optional[dict] = None,
     error: Optional[str] = None
 ):
     """
-    Updates job status in Supabase.
-    """
-    client = get_supabase_client()
-    update_data = {
-        "status": status,
-        "updated_at": datetime.utcnow().isoformat()
-    }
-    
-    if result is not None:
-        update_data["result"] = result
-    if error is not None:
-        update_data["error"] = error
-        
-    try:
-        client.table("jobs").update(update_data).eq("id", job_id).execute()
-    except Exception as e:
-        print(f"[JobTracker] Error updating job {job_id}: {e}")
+    Updates job status and publishes the transition to in-process subscribers.
+    """
+    await _store.update_job(job_id, status, result=result, error=error)
+    get_job_read_cache().invalidate(job_id)
+    publish_status(job_id, JobStatus(status).value, result=result, error=error)
 
 
-def list_jobs(limit: int = 10) -> list[Job]:
+async def list_jobs(
+    limit: int = 10,
+    workspace_id: Optional[str] = None,
+    job_type: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    after: Optional[JobCursor] = None
+) -> list[Job]:
     """
-    Returns recent jobs from Supabase.
+    Returns jobs newest first, optionally filtered by workspace, type and status.
+    Pass `after` (see decode_job_cursor) to continue from the last job of a page.
     """
-    client = get_supabase_client()
-    try:
-        response = client.table("jobs").select("*").order("created_at", desc=True).limit(limit).execute()
-        return [_record_to_job(r) for r in response.data]
-    except Exception as e:
-        print(f"[JobTracker] Error listing jobs: {e}")
-        return []
+    return await _store.list_jobs(
+        limit=limit,
+        workspace_id=workspace_id,
+        job_type=job_type,
+        status=status,
+        after=after
+    )
+
+
+async def claim_jobs(
+    worker_id: str,
+    job_type: str,
+    limit: int,
+    lease_seconds: int,
+    max_attempts: int
+) -> list[Job]:
+    """
+    Atomically moves up to `limit` claimable jobs of `job_type` to `running`
+    under a lease owned by `worker_id`.
+    """
+    jobs = await _store.claim_jobs(worker_id, job_type, limit, lease_seconds, max_attempts)
+    cache = get_job_read_cache()
+    for job in jobs:
+        cache.invalidate(job.id)
+    return jobs
+
+
+async def renew_job_lease(job_id: str, worker_id: str, lease_seconds: int) -> bool:
+    """
+    Extends the lease of a running job. Returns False if the worker lost it.
+    """
+    return await _store.renew_lease(job_id, worker_id, lease_seconds)
+
+
+async def queue_depth() -> list[dict]:
+    """
+    Counts pending and running jobs: rows with 'type', 'status' and 'jobs'.
+    """
+    return await _store.queue_depth()
+
+
+async def save_job_trace(job_id: str, trace: dict):
+    """
+    Stores the compact trace of a job run (see core.tracing).
+    """
+    await _store.save_trace(job_id, trace)
+
+
+async def get_job_trace(job_id: str) -> Optional[dict]:
+    """
+    Returns the stored compact trace of a job, or None.
+    """
+    return await _store.get_trace(job_id)
+
 
 def _record_to_job(record: dict) -> Job:
     """Map DB record to Job object."""
     job = Job(record["type"])
     job.id = record["id"]
+    job.workspace_id = record.get("workspace_id")
+    job.payload = record.get("payload")
+    job.attempts = record.get("attempts") or 0
     job.status = JobStatus(record["status"])
     job.result = record.get("result")
     job.error = record.get("error")
-    # Parse timestamps might be needed depending on usage, 
-    # but currently Job to_dict expects basic types or manages them?
-    # Job class init creates now(), we override:
-    # Supabase returns ISO strings, so we can store them directly or parse
-    # For MVP consistency with existing class which uses datetime objects:
+    # Supabase returns ISO strings; Job keeps datetime objects
     try:
         job.created_at = datetime.fromisoformat(record["created_at"].replace('Z', '+00:00'))
         job.updated_at = datetime.fromisoformat(record["updated_at"].replace('Z', '+00:00'))
     except:
         pass # Keep defaults if parse fails
-        
+
     return job
@@ -0,0 +1,168 @@
+"""
+Content-addressed cache of LLM completions.
+
+Keys are sha256 over the model, temperature, stop words and the normalized
+messages, so a re-triggered analysis with the same data and task template
+is answered from disk instead of the provider. Entries live in a SQLite
+file bounded by LLM_CACHE_MAX_MB; the least recently used entries are
+evicted first. Used by agents.llm.InstrumentedLLM.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Optional
+
+from core.config import get_settings
+from core.metrics import LLM_CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_text(text: str) -> str:
+    """Line endings and trailing whitespace don't change a prompt's meaning."""
+    lines = str(text).replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def normalize_messages(messages: Any) -> list:
+    """Canonical [{'role', 'content'}] form of a prompt (str or message list)."""
+    if isinstance(messages, str):
+        return [{"role": "user", "content": _normalize_text(messages)}]
+    normalized = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            normalized.append({
+                "role": message.get("role", "user"),
+                "content": _normalize_text(message.get("content") or "")
+            })
+        else:
+            normalized.append({"role": "user", "content": _normalize_text(message)})
+    return normalized
+
+
+def completion_key(model: str, temperature: Optional[float], messages: Any, stop: Any = None) -> str:
+    """sha256 of everything that determines a completion."""
+    canonical = json.dumps(
+        {
+            "model": model,
+            "temperature": temperature,
+            "stop": sorted(stop) if isinstance(stop, (list, tuple)) else stop,
+            "messages": normalize_messages(messages)
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class LLMCompletionCache:
+    """SQLite-backed completion store with a byte budget and LRU eviction."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max(1, max_bytes)
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # CrewAI calls the LLM from worker threads; access is serialized by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS completions (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                response TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_completions_last_used ON completions (last_used)")
+        # Running total of `size`, kept by triggers so put() never scans the table
+        # (shared by every process using the file). Seeded once from existing rows.
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                total_bytes INTEGER NOT NULL
+            );
+            INSERT OR IGNORE INTO cache_meta (id, total_bytes)
+                SELECT 1, COALESCE(SUM(size), 0) FROM completions;
+            CREATE TRIGGER IF NOT EXISTS completions_size_insert AFTER INSERT ON completions
+                BEGIN UPDATE cache_meta SET total_bytes = total_bytes + NEW.size WHERE id = 1; END;
+            CREATE TRIGGER IF NOT EXISTS completions_size_update AFTER UPDATE OF size ON completions
+                BEGIN UPDATE cache_meta SET total_bytes = total_bytes + NEW.size - OLD.size WHERE id = 1; END;
+            CREATE TRIGGER IF NOT EXISTS completions_size_delete AFTER DELETE ON completions
+                BEGIN UPDATE cache_meta SET total_bytes = total_bytes - OLD.size WHERE id = 1; END;
+            """
+        )
+
+    def get(self, key: str, model: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self._conn.execute("UPDATE completions SET last_used = ? WHERE key = ?", (time.time(), key))
+        LLM_CACHE_REQUESTS.labels(model=model, result="hit" if row is not None else "miss").inc()
+        return row[0] if row is not None else None
+
+    def put(self, key: str, model: str, response: str):
+        size = len(response.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            # An upsert (not INSERT OR REPLACE) so the size triggers see the replaced row
+            self._conn.execute(
+                "INSERT INTO completions (key, model, response, size, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET model = excluded.model, response = excluded.response, "
+                "size = excluded.size, last_used = excluded.last_used",
+                (key, model, response, size, now, now)
+            )
+            self._evict()
+
+    def _evict(self):
+        """Deletes least recently used entries until the store fits max_bytes."""
+        total = self._total_bytes()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in self._conn.execute("SELECT key, size FROM completions ORDER BY last_used"):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM completions WHERE key = ?", victims)
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT total_bytes FROM cache_meta WHERE id = 1").fetchone()[0]
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+            size = self._total_bytes()
+        return {"entries": entries, "bytes": size, "max_bytes": self.max_bytes}
+
+
+@lru_cache
+def get_llm_cache() -> Optional[LLMCompletionCache]:
+    """Returns the process-wide completion cache, or None when LLM_CACHE_ENABLED is off."""
+    settings = get_settings()
+    if not settings.llm_cache_enabled:
+        return None
+    path = settings.llm_cache_path
+    if not os.path.isabs(path):
+        path = os.path.join(os.path.dirname(os.path.dirname(__file__)), path)
+    try:
+        return LLMCompletionCache(path, int(settings.llm_cache_max_mb * 1024 * 1024))
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("Disabled, cannot open %s: %s", path, e)
+        return None
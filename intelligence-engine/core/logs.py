@@ -0,0 +1,163 @@
+"""
+Structured, non-blocking logging for the API, the worker and scripts.
+
+Modules log through the standard library (`logging.getLogger(__name__)`);
+configure_logging() routes every record through a bounded in-memory queue
+to a single background thread (QueueHandler/QueueListener), which formats
+them as JSON lines (LOG_FORMAT=json, default) or plain text and writes them
+to stdout. The calling thread only interpolates the message and enqueues
+it: request handlers and jobs never wait on stdout. When the queue is full
+(LOG_QUEUE_SIZE) records are dropped and counted in
+kos_log_records_dropped_total.
+
+Records carry the job_id/workspace_id of the job being run (log_context(),
+set by the worker for each job; asyncio tasks and asyncio.to_thread inherit
+it). LOG_LEVEL sets the root level, LOG_LEVELS overrides it per logger, e.g.
+`{"core.job_tracker": "DEBUG", "httpx": "WARNING"}`.
+"""
+import atexit
+import json
+import logging
+import queue
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Iterator, Optional
+
+from core.config import get_settings
+from core.metrics import LOG_RECORDS_DROPPED
+
+
+_job_id: ContextVar[Optional[str]] = ContextVar("log_job_id", default=None)
+_workspace_id: ContextVar[Optional[str]] = ContextVar("log_workspace_id", default=None)
+
+# uvicorn installs its own (synchronous) stdout handlers; these are re-routed to the queue
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Attributes of every LogRecord; anything else was passed via `extra=` and is emitted as a field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+@contextmanager
+def log_context(job_id: Optional[str] = None, workspace_id: Optional[str] = None) -> Iterator[None]:
+    """Tags records logged inside the block (and tasks started in it) with the job."""
+    job_token = _job_id.set(job_id)
+    workspace_token = _workspace_id.set(workspace_id)
+    try:
+        yield
+    finally:
+        _workspace_id.reset(workspace_token)
+        _job_id.reset(job_token)
+
+
+class _ContextFilter(logging.Filter):
+    """Copies the job context onto the record (runs in the calling thread)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not hasattr(record, "job_id"):
+            record.job_id = _job_id.get()
+        if not hasattr(record, "workspace_id"):
+            record.workspace_id = _workspace_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, job context, extras, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        if getattr(record, "job_id", None):
+            entry["job_id"] = record.job_id
+        if getattr(record, "workspace_id", None):
+            entry["workspace_id"] = record.workspace_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in ("job_id", "workspace_id") and key not in entry:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class _TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s [%(name)s] %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        job_id = getattr(record, "job_id", None)
+        return f"{line} (job={job_id})" if job_id else line
+
+
+class _NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Interpolate now (args may be mutated later); the traceback is formatted by the listener
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+class _QueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # The queue may be full at shutdown; the listener is draining it
+        self.queue.put(self._sentinel)
+
+
+def configure_logging():
+    """
+    Installs the queue handler on the root logger and starts the writer
+    thread. Idempotent; call once at process start (API, worker, scripts).
+    """
+    global _listener
+    if _listener is not None:
+        return
+    settings = get_settings()
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if settings.log_format == "json" else _TextFormatter())
+
+    records: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    handler = _NonBlockingQueueHandler(records)
+    handler.addFilter(_ContextFilter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(handler)
+    root.setLevel(settings.log_level.upper())
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    for name, level in settings.log_levels.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = _QueueListener(records, stream, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Writes the queued records and stops the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
@@ -0,0 +1,211 @@
+"""
+Prometheus metrics for the intelligence engine (exposed on /metrics).
+
+  - HTTP request latency per route template
+  - Job queue depth by type and status (pending/running, read at scrape time)
+  - Job requests coalesced into an in-flight job (single-flight)
+  - Job lookups served by the read cache (see core.job_cache)
+  - Job duration, overall and per phase (fetch, crew kickoff, writes...)
+  - Supabase call latency and errors per operation (see core.supabase.execute)
+  - LLM call latency, errors and token counts per model
+  - LLM completion cache hits and misses per model
+  - Audit rows written/dropped by the batched ai_actions writer
+  - Log records dropped because the log queue was full (see core.logs)
+
+Metrics live in the process that records them. Jobs run in `worker.py`
+(the default setup), so job, phase, LLM and in-job Supabase metrics are
+exported by the worker on WORKER_METRICS_PORT (default 9100); the API's
+/metrics has HTTP latency, queue depth and the read-path metrics. With
+WORKER_EMBEDDED=true the API process exports everything.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+from core.config import get_settings
+from core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+# Agent jobs and LLM calls run for seconds to minutes
+LONG_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300, 600)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "kos_http_request_duration_seconds",
+    "HTTP request latency (time to response start) by route template",
+    ["method", "route", "status"]
+)
+JOB_QUEUE_DEPTH = Gauge(
+    "kos_job_queue_depth",
+    "Queued and running jobs by type and status",
+    ["type", "status"]
+)
+JOBS_DEDUPLICATED = Counter(
+    "kos_jobs_deduplicated_total",
+    "Job requests attached to a job already in flight for the workspace",
+    ["type"]
+)
+JOB_READ_CACHE_REQUESTS = Counter(
+    "kos_job_read_cache_requests_total",
+    "Job lookups by read cache outcome (hit, miss, coalesced into an in-flight read)",
+    ["result"]
+)
+JOB_DURATION = Histogram(
+    "kos_job_duration_seconds",
+    "Job execution time in the worker pool",
+    ["type", "outcome"],
+    buckets=LONG_BUCKETS
+)
+JOB_PHASE_DURATION = Histogram(
+    "kos_job_phase_duration_seconds",
+    "Time spent per job phase",
+    ["type", "phase"],
+    buckets=LONG_BUCKETS
+)
+SUPABASE_REQUEST_DURATION = Histogram(
+    "kos_supabase_request_duration_seconds",
+    "Supabase (PostgREST) call latency, including executor queueing",
+    ["operation"]
+)
+SUPABASE_ERRORS = Counter(
+    "kos_supabase_errors_total",
+    "Failed Supabase calls",
+    ["operation"]
+)
+LLM_REQUEST_DURATION = Histogram(
+    "kos_llm_request_duration_seconds",
+    "LLM completion latency",
+    ["model"],
+    buckets=LONG_BUCKETS
+)
+LLM_ERRORS = Counter(
+    "kos_llm_errors_total",
+    "Failed LLM completions",
+    ["model"]
+)
+LLM_TOKENS = Counter(
+    "kos_llm_tokens_total",
+    "LLM tokens consumed",
+    ["model", "kind"]
+)
+LLM_CACHE_REQUESTS = Counter(
+    "kos_llm_cache_requests_total",
+    "LLM completion cache lookups (see core.llm_cache)",
+    ["model", "result"]
+)
+AUDIT_ROWS = Counter(
+    "kos_audit_rows_total",
+    "Audit rows written or dropped by the batched writer (see core.audit_log)",
+    ["table", "outcome"]
+)
+LOG_RECORDS_DROPPED = Counter(
+    "kos_log_records_dropped_total",
+    "Log records dropped because the log queue was full (see core.logs)"
+)
+CFO_LLM_SKIPPED = Counter(
+    "kos_cfo_llm_skipped_total",
+    "CFO analyses completed with a templated report instead of an LLM run",
+    ["reason"]
+)
+
+
+@contextmanager
+def time_phase(job_type: str, phase: str):
+    """
+    Observes the duration of a job phase (also when it raises) and traces it
+    as a span; yields the span's attribute dict.
+    """
+    started = time.perf_counter()
+    try:
+        with span("phase", phase) as attrs:
+            yield attrs
+    finally:
+        JOB_PHASE_DURATION.labels(type=job_type, phase=phase).observe(time.perf_counter() - started)
+
+
+def record_token_usage(model: str, usage: Any):
+    """Adds token counts from a CrewAI UsageMetrics (CrewOutput.token_usage)."""
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        count = getattr(usage, kind, 0) or 0
+        if count:
+            LLM_TOKENS.labels(model=model, kind=kind.replace("_tokens", "")).inc(count)
+
+
+# --- Queue depth (read from the job store at scrape time) ---
+
+_queue_depth_read_at: Optional[float] = None
+
+
+async def refresh_queue_depth():
+    """Updates JOB_QUEUE_DEPTH, at most once per METRICS_QUEUE_DEPTH_TTL_SECONDS."""
+    global _queue_depth_read_at
+    ttl = get_settings().metrics_queue_depth_ttl_seconds
+    if _queue_depth_read_at is not None and time.monotonic() - _queue_depth_read_at < ttl:
+        return
+    from core.job_tracker import queue_depth
+
+    try:
+        rows = await queue_depth()
+    except Exception as e:
+        logger.warning("Queue depth read failed: %s", e)
+        return
+    JOB_QUEUE_DEPTH.clear()
+    for row in rows:
+        JOB_QUEUE_DEPTH.labels(type=row["type"], status=row["status"]).set(row["jobs"])
+    _queue_depth_read_at = time.monotonic()
+
+
+async def render_metrics() -> tuple[bytes, str]:
+    """Returns the exposition payload and its content type."""
+    await refresh_queue_depth()
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+# --- HTTP middleware ---
+
+class MetricsMiddleware:
+    """
+    ASGI middleware observing request latency per route template.
+    Latency is measured to the response start, so long-lived streams
+    (/jobs/{job_id}/stream) count their time to first byte.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        observed = False
+
+        def observe(status: int):
+            nonlocal observed
+            if observed:
+                return
+            observed = True
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status)
+            ).observe(time.perf_counter() - started)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                observe(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            observe(500)
+            raise
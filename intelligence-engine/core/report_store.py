@@ -0,0 +1,86 @@
+"""
+Content-addressed store for agent reports (`ai_reports` table).
+
+A report is written once, zlib-compressed, under the sha256 of its text;
+jobs (`result.report_hash`) and ai_actions (`metadata.report_hash`) keep
+only the hash. Identical reports (e.g. templated "healthy" reports) share
+one row. Reads expand the report on demand and keep recently read reports
+in a small LRU (content-addressed rows never change).
+"""
+import hashlib
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from postgrest.types import ReturnMethod
+
+from core.supabase import get_supabase_client, execute
+
+
+REPORT_ENCODING = "zlib"
+READ_CACHE_ENTRIES = 128
+
+_read_cache: "OrderedDict[str, str]" = OrderedDict()
+
+
+def report_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_report(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), 6)
+
+
+def decompress_report(content: bytes, encoding: str = REPORT_ENCODING) -> str:
+    if encoding != REPORT_ENCODING:
+        raise ValueError(f"Unsupported report encoding: {encoding}")
+    return zlib.decompress(content).decode("utf-8")
+
+
+def _decode_bytea(value: str) -> bytes:
+    """PostgREST returns bytea as '\\x'-prefixed hex."""
+    return bytes.fromhex(value[2:] if value.startswith("\\x") else value)
+
+
+async def put_report(text: str) -> str:
+    """Stores a report (no-op if already stored) and returns its hash."""
+    digest = report_hash(text)
+    client = get_supabase_client()
+    raw = text.encode("utf-8")
+    await execute(
+        client.table("ai_reports").upsert(
+            {
+                "hash": digest,
+                "encoding": REPORT_ENCODING,
+                "content": "\\x" + compress_report(text).hex(),
+                "size": len(raw)
+            },
+            on_conflict="hash",
+            ignore_duplicates=True,
+            returning=ReturnMethod.minimal
+        )
+    )
+    return digest
+
+
+async def get_report(digest: str) -> Optional[str]:
+    """Returns the report text for a hash, or None if it isn't stored."""
+    cached = _read_cache.get(digest)
+    if cached is not None:
+        _read_cache.move_to_end(digest)
+        return cached
+
+    client = get_supabase_client()
+    response = await execute(
+        client.table("ai_reports").select("encoding, content").eq("hash", digest).limit(1)
+    )
+    if not response.data:
+        return None
+    row = response.data[0]
+    text = decompress_report(_decode_bytea(row["content"]), row.get("encoding") or REPORT_ENCODING)
+
+    _read_cache[digest] = text
+    _read_cache.move_to_end(digest)
+    while len(_read_cache) > READ_CACHE_ENTRIES:
+        _read_cache.popitem(last=False)
+    return text
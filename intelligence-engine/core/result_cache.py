@@ -0,0 +1,141 @@
+"""
+Result cache for agent jobs, keyed by a fingerprint of the job's input data.
+
+Two stores are available (RESULT_CACHE_BACKEND):
+  - "memory": process-local LRU with TTL (bounded by RESULT_CACHE_MAX_ENTRIES)
+  - "jobs":   looks up the most recent completed job of the same type whose
+              result carries the same fingerprint (`result.cache.fingerprint`),
+              within the TTL. Shared by every API/worker process.
+  - "none":   caching disabled
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Optional
+
+from core.config import get_settings
+from core.supabase import get_supabase_client, execute
+
+logger = logging.getLogger(__name__)
+
+
+def input_fingerprint(*parts: Any) -> str:
+    """sha256 over the canonical JSON encoding of the given parts."""
+    canonical = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedResult:
+    result: dict
+    source_job_id: str
+
+
+class ResultCache(ABC):
+    """Stores completed job results by input fingerprint."""
+
+    @abstractmethod
+    async def get(self, job_type: str, fingerprint: str) -> Optional[CachedResult]:
+        ...
+
+    @abstractmethod
+    async def put(self, job_type: str, fingerprint: str, result: dict, job_id: str):
+        ...
+
+
+class NullResultCache(ResultCache):
+    """Caching disabled."""
+
+    async def get(self, job_type: str, fingerprint: str) -> Optional[CachedResult]:
+        return None
+
+    async def put(self, job_type: str, fingerprint: str, result: dict, job_id: str):
+        pass
+
+
+class InMemoryResultCache(ResultCache):
+    """Process-local LRU cache with per-entry TTL."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[tuple, tuple[float, CachedResult]]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, job_type: str, fingerprint: str) -> Optional[CachedResult]:
+        key = (job_type, fingerprint)
+        async with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, cached = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return cached
+
+    async def put(self, job_type: str, fingerprint: str, result: dict, job_id: str):
+        key = (job_type, fingerprint)
+        async with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, CachedResult(result, job_id))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class JobsTableResultCache(ResultCache):
+    """
+    Uses completed rows of the `jobs` table as the cache.
+    Entries expire with the TTL; rows are never deleted by the cache.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+
+    async def get(self, job_type: str, fingerprint: str) -> Optional[CachedResult]:
+        client = get_supabase_client()
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.ttl_seconds)
+        try:
+            response = await execute(
+                client.table("jobs")
+                .select("id, result")
+                .eq("type", job_type)
+                .eq("status", "completed")
+                .eq("result->cache->>fingerprint", fingerprint)
+                .gte("updated_at", since.isoformat())
+                .order("updated_at", desc=True)
+                .limit(1)
+            )
+        except Exception as e:
+            logger.warning("Lookup failed: %s", e)
+            return None
+        if not response.data:
+            return None
+        row = response.data[0]
+        # A row that was itself a cache hit points back to the original job
+        source_job_id = (row["result"].get("cache") or {}).get("source_job_id") or row["id"]
+        return CachedResult(row["result"], source_job_id)
+
+    async def put(self, job_type: str, fingerprint: str, result: dict, job_id: str):
+        # The completed job row (result.cache.fingerprint) is the cache entry
+        pass
+
+
+@lru_cache
+def get_result_cache() -> ResultCache:
+    """Returns the result cache configured by RESULT_CACHE_BACKEND."""
+    settings = get_settings()
+    backend = settings.result_cache_backend
+    if backend == "memory":
+        return InMemoryResultCache(settings.result_cache_ttl_seconds, settings.result_cache_max_entries)
+    if backend == "jobs":
+        return JobsTableResultCache(settings.result_cache_ttl_seconds)
+    return NullResultCache()
@@ -2,10 +2,20 @@
 Supabase client configured with Service Role Key.
 Service Role bypasses RLS policies for AI agent operations.
 """
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import httpx
 from supabase import create_client, Client
 from core.config import get_settings
+from core.metrics import SUPABASE_ERRORS, SUPABASE_REQUEST_DURATION
 from functools import lru_cache
 
+logger = logging.getLogger(__name__)
+
 
 @lru_cache
 def get_supabase_client() -> Client:
@@ -22,6 +32,108 @@ def get_supabase_client() -> Client:
     )
 
 
+@lru_cache
+def get_supabase_executor() -> ThreadPoolExecutor:
+    """
+    Returns the bounded thread pool used to run blocking supabase-py calls.
+    Sized by SUPABASE_MAX_WORKERS.
+    """
+    settings = get_settings()
+    return ThreadPoolExecutor(
+        max_workers=settings.supabase_max_workers,
+        thread_name_prefix="supabase"
+    )
+
+
+_HTTP_VERBS = {"GET": "select", "HEAD": "select", "POST": "insert", "PATCH": "update", "DELETE": "delete"}
+
+
+def query_operation(query) -> str:
+    """
+    Metrics label for a query builder: '<table> <verb>' or 'rpc <function>'.
+    """
+    path = str(getattr(query, "path", "") or "").strip("/")
+    method = str(getattr(query, "http_method", "") or "").upper()
+    if path.startswith("rpc/"):
+        return f"rpc {path[4:]}"
+    return f"{path or 'unknown'} {_HTTP_VERBS.get(method, method.lower() or 'unknown')}"
+
+
+async def execute(query, operation: Optional[str] = None):
+    """
+    Executes a supabase-py query builder without blocking the event loop.
+    Latency and errors are recorded per operation (derived from the query
+    unless given).
+    
+    Usage:
+        response = await execute(client.table("jobs").select("*").eq("id", job_id))
+    """
+    operation = operation or query_operation(query)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    try:
+        return await loop.run_in_executor(get_supabase_executor(), query.execute)
+    except Exception:
+        SUPABASE_ERRORS.labels(operation=operation).inc()
+        raise
+    finally:
+        SUPABASE_REQUEST_DURATION.labels(operation=operation).observe(time.perf_counter() - started)
+
+
+# --- Raw PostgREST reads ---
+
+@lru_cache
+def get_postgrest_http() -> httpx.AsyncClient:
+    """
+    Returns the shared async HTTP client for raw PostgREST reads (fetch_row_json).
+    Closed by close_postgrest_http() on shutdown.
+    """
+    settings = get_settings()
+    key = settings.supabase_service_role_key
+    return httpx.AsyncClient(
+        base_url=f"{settings.supabase_url.rstrip('/')}/rest/v1",
+        headers={"apikey": key, "Authorization": f"Bearer {key}"},
+        timeout=10.0
+    )
+
+
+async def close_postgrest_http():
+    if get_postgrest_http.cache_info().currsize:
+        await get_postgrest_http().aclose()
+        get_postgrest_http.cache_clear()
+
+
+async def fetch_row_json(table: str, columns: str, filters: Dict[str, str]) -> Optional[bytes]:
+    """
+    Reads a single row as the raw JSON object bytes returned by PostgREST,
+    without decoding it (for responses passed through as-is).
+    Returns None when no row matches. Filters are equality filters.
+    
+    Usage:
+        body = await fetch_row_json("jobs", "id, status", {"id": job_id})
+    """
+    operation = f"{table} select"
+    params = {"select": columns.replace(" ", "")}
+    params.update({column: f"eq.{value}" for column, value in filters.items()})
+    started = time.perf_counter()
+    try:
+        response = await get_postgrest_http().get(
+            f"/{table}",
+            params=params,
+            # Single object instead of an array; 406 when no row matches
+            headers={"Accept": "application/vnd.pgrst.object+json"}
+        )
+        if response.status_code == 406:
+            return None
+        response.raise_for_status()
+        return response.content
+    except Exception:
+        SUPABASE_ERRORS.labels(operation=operation).inc()
+        raise
+    finally:
+        SUPABASE_REQUEST_DURATION.labels(operation=operation).observe(time.perf_counter() - started)
+
+
 def test_connection() -> bool:
     """
     Tests Supabase connection by querying workspaces table.
@@ -32,5 +144,5 @@ def test_connection() -> bool:
         result = client.table("workspaces").select("id").limit(1).execute()
         return True
     except Exception as e:
-        print(f"Supabase connection failed: {e}")
+        logger.warning("Supabase connection failed: %s", e)
         return False
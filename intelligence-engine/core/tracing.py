@@ -0,0 +1,142 @@
+"""
+Per-job tracing for agent runs.
+
+A Trace collects spans (pipeline phases, agent thoughts, tool calls, LLM
+completions) with their offset from the start of the job, wall time and
+attributes such as token usage. The active trace is held in a contextvar:
+asyncio.to_thread copies the context, so spans recorded inside CrewAI
+(tools, LLM calls) land in the trace of the job that started the crew.
+
+Traces are stored compactly with the job (`jobs.trace`, see
+core.job_tracker.save_job_trace) and expanded by /jobs/{job_id}/trace.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional
+
+
+TRACE_FORMAT_VERSION = 1
+# Column order of the compact span rows
+SPAN_FIELDS = ["kind", "name", "start_ms", "duration_ms", "attrs"]
+MAX_SPANS = 500
+MAX_ATTR_CHARS = 300
+
+
+def _compact_value(value: Any) -> Any:
+    if isinstance(value, (int, float, bool)) or value is None:
+        return value
+    if isinstance(value, dict):
+        return {k: _compact_value(v) for k, v in value.items()}
+    text = value if isinstance(value, str) else str(value)
+    return text[:MAX_ATTR_CHARS] + "..." if len(text) > MAX_ATTR_CHARS else text
+
+
+class Trace:
+    """Spans recorded for one job. Safe to append to from worker threads."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.started_at = datetime.now(timezone.utc)
+        self._origin = time.perf_counter()
+        self._last_mark = self._origin
+        self._spans: List[list] = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, name: str, started: float, ended: float, attrs: Optional[Dict[str, Any]] = None):
+        """Adds a finished span; started/ended are time.perf_counter() values."""
+        row = [
+            kind,
+            name,
+            round((started - self._origin) * 1000, 1),
+            round((ended - started) * 1000, 1),
+            {k: _compact_value(v) for k, v in (attrs or {}).items() if v is not None}
+        ]
+        with self._lock:
+            if len(self._spans) >= MAX_SPANS:
+                self._dropped += 1
+                return
+            self._spans.append(row)
+
+    def mark(self) -> float:
+        """Returns the previous mark and moves it to now (for step-to-step durations)."""
+        now = time.perf_counter()
+        with self._lock:
+            previous, self._last_mark = self._last_mark, now
+        return previous
+
+    def to_compact(self) -> dict:
+        """Columnar representation stored in `jobs.trace`."""
+        with self._lock:
+            spans = list(self._spans)
+            dropped = self._dropped
+        return {
+            "v": TRACE_FORMAT_VERSION,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round((time.perf_counter() - self._origin) * 1000, 1),
+            "fields": SPAN_FIELDS,
+            "spans": spans,
+            "dropped": dropped
+        }
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_job(job_id: str) -> Iterator[Trace]:
+    """Makes a new Trace the active trace for the duration of the block."""
+    trace = Trace(job_id)
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _current_trace.reset(token)
+
+
+@contextmanager
+def span(kind: str, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Records a span in the active trace (no-op without one). The yielded dict
+    can be filled with attributes known only at the end (rows, tokens...).
+    """
+    trace = _current_trace.get()
+    extra: Dict[str, Any] = {}
+    started = time.perf_counter()
+    try:
+        yield extra
+    except BaseException as e:
+        extra.setdefault("error", f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        if trace is not None:
+            trace.add(kind, name, started, time.perf_counter(), {**attrs, **extra})
+
+
+def expand_trace(compact: dict) -> dict:
+    """Turns a stored compact trace into span dicts plus a per-span-name summary."""
+    fields = compact.get("fields") or SPAN_FIELDS
+    # Spans are appended when they end; present them in start order
+    spans = sorted((dict(zip(fields, row)) for row in compact.get("spans", [])), key=lambda s: s["start_ms"])
+
+    summary: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        key = f"{s['kind']}:{s['name']}"
+        entry = summary.setdefault(key, {"kind": s["kind"], "name": s["name"], "count": 0, "total_ms": 0.0})
+        entry["count"] += 1
+        entry["total_ms"] = round(entry["total_ms"] + s["duration_ms"], 1)
+
+    return {
+        "started_at": compact.get("started_at"),
+        "total_ms": compact.get("total_ms"),
+        "dropped_spans": compact.get("dropped", 0),
+        "spans": spans,
+        "summary": sorted(summary.values(), key=lambda e: e["total_ms"], reverse=True)
+    }
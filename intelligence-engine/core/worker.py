@@ -0,0 +1,169 @@
+"""
+Bounded worker pool for background agent jobs.
+
+Jobs are queued as `pending` rows in the `jobs` table. A JobWorker claims
+them through the claim/lease protocol (core.job_tracker.claim_jobs), runs
+them with a global pool size and per-job-type concurrency limits, and renews
+each lease while the job runs. If a worker dies, its leases expire and the
+jobs are claimed again by another worker (up to job_max_attempts).
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import defaultdict
+from typing import Awaitable, Callable, Dict, Optional
+
+from core.job_tracker import Job, JobStatus, claim_jobs, renew_job_lease, update_job
+from core.logs import log_context
+from core.metrics import JOB_DURATION
+
+logger = logging.getLogger(__name__)
+
+
+JobHandler = Callable[[Job], Awaitable[None]]
+
+
+class JobWorker:
+    """Claims and executes queued jobs with bounded concurrency."""
+
+    def __init__(
+        self,
+        handlers: Dict[str, JobHandler],
+        pool_size: int,
+        type_limits: Optional[Dict[str, int]] = None,
+        lease_seconds: int = 300,
+        max_attempts: int = 3,
+        poll_interval: float = 2.0,
+        shutdown_timeout: float = 30.0,
+        worker_id: Optional[str] = None
+    ):
+        self.handlers = handlers
+        self.pool_size = max(1, pool_size)
+        self.type_limits = type_limits or {}
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.shutdown_timeout = shutdown_timeout
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._running_by_type: Dict[str, int] = defaultdict(int)
+        self._wakeup = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._type_offset = 0
+
+    @property
+    def active_jobs(self) -> int:
+        return len(self._tasks)
+
+    def notify(self):
+        """Wakes the claim loop early (e.g. right after a job was enqueued)."""
+        self._wakeup.set()
+
+    async def run(self):
+        """Claim loop. Returns after stop() once running jobs drained."""
+        logger.info("%s started (pool=%d, types=%s)", self.worker_id, self.pool_size, list(self.handlers))
+        while not self._stopping.is_set():
+            try:
+                claimed = await self._claim_available()
+            except Exception as e:
+                logger.warning("Claim failed: %s", e)
+                claimed = 0
+
+            if claimed == 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+
+        await self._drain()
+        logger.info("%s stopped", self.worker_id)
+
+    def stop(self):
+        """Stops claiming new jobs; run() returns after running jobs drained."""
+        self._stopping.set()
+        self._wakeup.set()
+
+    async def _claim_available(self) -> int:
+        """Claims as many jobs as free slots allow, rotating over job types."""
+        claimed = 0
+        job_types = list(self.handlers)
+        if not job_types:
+            return 0
+        self._type_offset = (self._type_offset + 1) % len(job_types)
+        for job_type in job_types[self._type_offset:] + job_types[:self._type_offset]:
+            free = self.pool_size - len(self._tasks)
+            if free <= 0:
+                break
+            type_free = self.type_limits.get(job_type, self.pool_size) - self._running_by_type[job_type]
+            limit = min(free, type_free)
+            if limit <= 0:
+                continue
+
+            jobs = await claim_jobs(
+                self.worker_id, job_type, limit,
+                lease_seconds=self.lease_seconds,
+                max_attempts=self.max_attempts
+            )
+            for job in jobs:
+                self._start(job)
+                claimed += 1
+        return claimed
+
+    def _start(self, job: Job):
+        self._running_by_type[job.type] += 1
+        # The task (and the handler's tasks/threads) inherit the job's log context
+        with log_context(job.id, job.workspace_id):
+            task = asyncio.create_task(self._execute(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _t, job=job: self._finished(job))
+
+    def _finished(self, job: Job):
+        self._tasks.pop(job.id, None)
+        self._running_by_type[job.type] -= 1
+        self._wakeup.set()
+
+    async def _execute(self, job: Job):
+        """Runs the job handler while a heartbeat keeps the lease alive."""
+        handler = self.handlers[job.type]
+        run = asyncio.create_task(handler(job))
+        heartbeat = asyncio.create_task(self._heartbeat(job, run))
+        started = time.perf_counter()
+        outcome = "finished"
+        try:
+            await run
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            logger.warning("Job %s cancelled (lease lost or shutdown)", job.id)
+        except Exception as e:
+            outcome = "crashed"
+            logger.exception("Job %s (%s) crashed: %s", job.id, job.type, e)
+            await update_job(job.id, JobStatus.FAILED, error=str(e))
+        finally:
+            heartbeat.cancel()
+            JOB_DURATION.labels(type=job.type, outcome=outcome).observe(time.perf_counter() - started)
+
+    async def _heartbeat(self, job: Job, run: asyncio.Task):
+        interval = max(1.0, self.lease_seconds / 3)
+        while not run.done():
+            await asyncio.sleep(interval)
+            if not await renew_job_lease(job.id, self.worker_id, self.lease_seconds):
+                logger.warning("Lost lease on job %s; cancelling local run", job.id)
+                run.cancel()
+                return
+
+    async def _drain(self):
+        """Waits for running jobs, cancelling them after the shutdown timeout."""
+        if not self._tasks:
+            return
+        logger.info("Waiting for %d running job(s)...", len(self._tasks))
+        done, pending = await asyncio.wait(list(self._tasks.values()), timeout=self.shutdown_timeout)
+        for task in pending:
+            # Leases of cancelled jobs expire and the jobs are claimed again
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
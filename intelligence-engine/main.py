@@ -1,23 +1,80 @@
 """
 kOS Intelligence Engine - FastAPI Application (Simplified)
 All routes inline to avoid import issues.
+
+Agent jobs are queued in the `jobs` table and executed by the worker pool
+(python worker.py; for local development, embedded in this process when
+WORKER_EMBEDDED=true).
 """
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
+from core.audit_log import get_audit_log
 from core.config import get_settings
-from core.supabase import get_supabase_client, test_connection
+from core.health import get_health_monitor
+from core.logs import configure_logging
+from core.metrics import MetricsMiddleware
+from core.supabase import close_postgrest_http
 from core.job_tracker import create_job, get_job, JobStatus
-from agents.cfo_agent import run_cfo_analysis
+from core.worker import JobWorker
+from schemas.cfo import CFOBatchAnalysisRequest
+from routes import health as health_routes
+from routes import jobs as jobs_routes
+from routes import metrics as metrics_routes
 
 # Load settings
 settings = get_settings()
+# JSON logs via a background writer thread (also takes over uvicorn's loggers)
+configure_logging()
+
+# Embedded worker pool (only when WORKER_EMBEDDED=true)
+embedded_worker: Optional[JobWorker] = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global embedded_worker
+    health_monitor = get_health_monitor()
+    health_task = asyncio.create_task(health_monitor.run())
+    worker_task = None
+    warm_up_task = None
+    if settings.worker_embedded:
+        from agents import registry
+        from worker import build_worker
+        embedded_worker = build_worker()
+        worker_task = asyncio.create_task(embedded_worker.run())
+        # Agents (CrewAI) are imported after startup, so /health is served immediately
+        warm_up_task = asyncio.create_task(registry.warm_up())
+    yield
+    if warm_up_task is not None:
+        warm_up_task.cancel()
+    if embedded_worker is not None:
+        embedded_worker.stop()
+        await worker_task
+        embedded_worker = None
+    # After the workers drained: write the audit rows they queued
+    await get_audit_log().close()
+    health_monitor.stop()
+    await health_task
+    await close_postgrest_http()
+
+
+def notify_worker():
+    """Skips the poll interval when the worker pool runs in this process."""
+    if embedded_worker is not None:
+        embedded_worker.notify()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="kOS Intelligence Engine",
     description="AI orchestration for KyrieOS agency management",
-    version="0.1.0"
+    version="0.1.0",
+    lifespan=lifespan
 )
 
 # CORS middleware
@@ -29,6 +86,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request latency per route (outermost, so it sees every response)
+app.add_middleware(MetricsMiddleware)
+
+# Routers
+app.include_router(health_routes.router, tags=["health"])
+app.include_router(metrics_routes.router, tags=["metrics"])
+app.include_router(jobs_routes.router, prefix="/jobs", tags=["jobs"])
+
 # Pydantic models
 class CFOAnalysisRequest(BaseModel):
     workspace_id: str
@@ -36,6 +101,7 @@ class CFOAnalysisRequest(BaseModel):
 class JobCreatedResponse(BaseModel):
     job_id: str
     message: str
+    deduplicated: bool = False  # job_id is a job already in flight for the workspace
 
 # Routes
 @app.get("/")
@@ -46,37 +112,53 @@ async def root():
         "status": "operational"
     }
 
-@app.get("/health")
-async def health_check():
-    db_connected = test_connection()
-    return {
-        "status": "healthy" if db_connected else "degraded",
-        "service": "kOS Intelligence Engine",
-        "version": "0.1.0",
-        "database": "connected" if db_connected else "disconnected"
-    }
-
 from fastapi import Depends
 from core.security import validate_internal_secret
 
 @app.post("/ai/cfo/analyze", response_model=JobCreatedResponse)
 async def trigger_cfo_analysis(
     request: CFOAnalysisRequest, 
-    background_tasks: BackgroundTasks,
     api_key: str = Depends(validate_internal_secret)
 ):
     """
     Triggers CFO analysis. Protected by X-Internal-Secret.
     """
-    # Create job in Supabase (persisted)
-    job = create_job("cfo_analysis", workspace_id=request.workspace_id)
-    background_tasks.add_task(run_cfo_analysis, job.id, request.workspace_id)
+    # Queue job in Supabase (persisted); a worker claims it.
+    # A workspace with an analysis in flight gets that job back instead.
+    job = await create_job("cfo_analysis", workspace_id=request.workspace_id)
+    if job.deduplicated:
+        return JobCreatedResponse(
+            job_id=job.id,
+            message=f"CFO analysis already in progress. Check /jobs/{job.id} for status.",
+            deduplicated=True
+        )
+    notify_worker()
     return JobCreatedResponse(
         job_id=job.id,
         message=f"CFO analysis started. Check /jobs/{job.id} for status."
     )
 
 
+@app.post("/ai/cfo/analyze/batch", response_model=JobCreatedResponse)
+async def trigger_cfo_batch_analysis(
+    request: CFOBatchAnalysisRequest,
+    api_key: str = Depends(validate_internal_secret)
+):
+    """
+    Triggers a multi-workspace CFO sweep (e.g. nightly). Protected by X-Internal-Secret.
+    Progress per workspace is reported in the parent job result.
+    """
+    # Only an omitted list means "all"; ids are stored as strings (JSON payload)
+    workspace_ids = [str(w) for w in request.workspace_ids] if request.workspace_ids is not None else None
+    job = await create_job("cfo_batch_analysis", payload={"workspace_ids": workspace_ids})
+    notify_worker()
+    count = len(workspace_ids) if workspace_ids is not None else "all"
+    return JobCreatedResponse(
+        job_id=job.id,
+        message=f"CFO batch analysis started for {count} workspace(s). Check /jobs/{job.id} for progress."
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
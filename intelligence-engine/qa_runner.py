@@ -1,5 +1,6 @@
 
 import asyncio
+import json
 import httpx
 import sys
 import os
@@ -61,25 +62,33 @@ async def run_qa():
              print(f"[FAIL] Next.js Connection Error: {e}")
 
 
-    # Check DB for 'running' then 'completed'
+    # Follow the job stream for 'running' then 'completed'
     if job_id:
-        print("   Polling DB for status...")
-        for _ in range(10):
-            res = supabase.table("jobs").select("*").eq("id", job_id).execute()
-            if res.data:
-                job = res.data[0]
-                status = job["status"]
-                print(f"   Status: {status}")
-                if status == "completed":
-                    print("[PASS] Job completed successfully")
-                    print(f"   Result: {str(job.get('result'))[:100]}...")
-                    break
-                if status == "failed":
-                    print(f"[FAIL] Job failed with error: {job.get('error')}")
-                    break
-            await asyncio.sleep(2)
-        else:
-            print("[WARN] TIMEOUT: Job did not complete in 20s")
+        print("   Streaming job status...")
+        final_status = None
+        try:
+            async with httpx.AsyncClient(timeout=httpx.Timeout(10.0, read=60.0)) as client:
+                async with client.stream("GET", f"{BASE_URL_FASTAPI}/jobs/{job_id}/stream") as resp:
+                    event = None
+                    async for line in resp.aiter_lines():
+                        if line.startswith("event: "):
+                            event = line[len("event: "):]
+                        elif line.startswith("data: ") and event == "status":
+                            data = json.loads(line[len("data: "):])
+                            print(f"   Status: {data['status']}")
+                            if data["status"] == "completed":
+                                print("[PASS] Job completed successfully")
+                                print(f"   Result: {str(data.get('result'))[:100]}...")
+                                final_status = "completed"
+                                break
+                            if data["status"] == "failed":
+                                print(f"[FAIL] Job failed with error: {data.get('error')}")
+                                final_status = "failed"
+                                break
+        except Exception as e:
+            print(f"[FAIL] Stream Error: {e}")
+        if final_status is None:
+            print("[WARN] TIMEOUT: Job did not complete while streaming")
 
     # ---------------------------------------------------------
     # TEST 3: Stress Test (Multiple Clients)
@@ -109,10 +118,11 @@ async def run_qa():
             if r.status_code == 200:
                 valid_jobs.append(r.json()["job_id"])
         
-        if len(valid_jobs) == 2:
-            print(f"[PASS] 2 Simultaneous Jobs Created: {valid_jobs}")
+        # Single-flight: the second request attaches to the first job
+        if len(valid_jobs) == 2 and len(set(valid_jobs)) == 1:
+            print(f"[PASS] 2 Simultaneous Requests Coalesced into Job {valid_jobs[0]}")
         else:
-            print(f"[FAIL] Expected 2 jobs, got {len(valid_jobs)}")
+            print(f"[FAIL] Expected 2 responses sharing one job, got {valid_jobs}")
 
     # ---------------------------------------------------------
     # TEST 4: Fail Fast (Error Scenario)
@@ -1,7 +1,7 @@
 """
 CFO Agent endpoints for budget analysis.
 """
-from fastapi import APIRouter, BackgroundTasks
+from fastapi import APIRouter
 from core.job_tracker import create_job
 from schemas.cfo import CFOAnalysisRequest
 from schemas.job import JobCreatedResponse
@@ -11,10 +11,7 @@ router = APIRouter()
 
 
 @router.post("/analyze", response_model=JobCreatedResponse, status_code=202)
-async def trigger_cfo_analysis(
-    request: CFOAnalysisRequest,
-    background_tasks: BackgroundTasks
-):
+async def trigger_cfo_analysis(request: CFOAnalysisRequest):
     """
     Trigger async CFO budget analysis for a workspace.
     
@@ -31,15 +28,16 @@ async def trigger_cfo_analysis(
     Returns:
         JobCreatedResponse with job_id to track progress
     """
-    # Create job
-    job = create_job("cfo_analysis")
-    
-    # Import here to avoid circular dependency
-    from agents.cfo_agent import run_cfo_analysis
-    
-    # Execute in background
-    background_tasks.add_task(run_cfo_analysis, job.id, request.workspace_id)
+    # Queue job; a worker (python worker.py) claims and executes it.
+    # A workspace with an analysis in flight gets that job back instead.
+    job = await create_job("cfo_analysis", workspace_id=request.workspace_id)
     
+    if job.deduplicated:
+        return JobCreatedResponse(
+            job_id=job.id,
+            message=f"CFO analysis already in progress for workspace {request.workspace_id}. Check /jobs/{job.id} for status.",
+            deduplicated=True
+        )
     return JobCreatedResponse(
         job_id=job.id,
         message=f"CFO analysis started for workspace {request.workspace_id}. Check /jobs/{job.id} for status."
@@ -1,31 +1,56 @@
 """
-Health check endpoint for service monitoring.
+Health check endpoints for service monitoring.
+
+All endpoints read the snapshot kept by core.health.HealthMonitor; none of
+them touch the database.
 """
-from fastapi import APIRouter, Depends
-from core.supabase import get_supabase_client, test_connection
-from supabase import Client
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from core.health import get_health_monitor
 
 
 router = APIRouter()
 
 
 @router.get("/health")
-async def health_check(supabase: Client = Depends(get_supabase_client)):
+async def health_check():
     """
     Health check endpoint.
-    
+
     Returns:
-        - status: Overall service health
+        - status: healthy / degraded (non-critical dependency down) / unhealthy
         - service: Service name
         - database: Supabase connection status
+        - dependencies: Per-dependency status and probe latency
     """
-    # Test database connectivity
-    db_connected = test_connection()
-    db_status = "connected" if db_connected else "disconnected"
-    
+    snapshot = get_health_monitor().snapshot()
+    supabase = snapshot["dependencies"].get("supabase")
+
     return {
-        "status": "healthy" if db_connected else "degraded",
+        "status": snapshot["status"],
         "service": "kOS Intelligence Engine",
         "version": "0.1.0",
-        "database": db_status
+        "database": "connected" if supabase and supabase["ok"] else "disconnected",
+        **snapshot
+    }
+
+
+@router.get("/livez")
+async def liveness():
+    """Liveness probe: the process and its event loop respond."""
+    return {"status": "alive"}
+
+
+@router.get("/readyz")
+async def readiness():
+    """Readiness probe: 503 until critical dependencies are reachable in a fresh snapshot."""
+    snapshot = get_health_monitor().snapshot()
+    body = {
+        "ready": snapshot["ready"],
+        "snapshot_age_seconds": snapshot["snapshot_age_seconds"],
+        "dependencies": {
+            name: {"ok": dep["ok"], "latency_ms": dep["latency_ms"]}
+            for name, dep in snapshot["dependencies"].items()
+        }
     }
+    return JSONResponse(body, status_code=200 if snapshot["ready"] else 503)
@@ -1,41 +1,289 @@
 """
-Job status endpoint for tracking async AI agent tasks.
+Job status endpoints for tracking async AI agent tasks.
 """
-from fastapi import APIRouter, HTTPException
-from core.job_tracker import get_job
-from schemas.job import JobResponse
+import asyncio
+import json
+import time
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from core.config import get_settings
+from core.job_events import job_events
+from core.job_tracker import (
+    JobStatus,
+    decode_job_cursor,
+    encode_job_cursor,
+    get_job,
+    get_job_snapshot,
+    get_job_trace,
+    list_jobs,
+)
+from core.report_store import get_report
+from core.security import validate_internal_secret
+from core.tracing import expand_trace
+from schemas.job import JobListResponse, JobResponse, JobSummary, JobTraceResponse
+
+
+TERMINAL_STATUSES = {JobStatus.COMPLETED.value, JobStatus.FAILED.value}
 
 
 router = APIRouter()
 
 
-@router.get("/{job_id}", response_model=JobResponse)
-async def get_job_status(job_id: str):
+@router.get("", response_model=JobListResponse)
+async def list_job_history(
+    workspace_id: Optional[str] = None,
+    type: Optional[str] = None,
+    status: Optional[JobStatus] = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    api_key: str = Depends(validate_internal_secret)
+):
+    """
+    List jobs newest first, optionally filtered by workspace, type and status.
+    Protected by X-Internal-Secret (spans all workspaces).
+    
+    Pagination is keyset-based: pass the returned `next_cursor` as `cursor`
+    to get the next page. Every page is an index range scan, so deep pages
+    cost the same as the first one.
+    
+    Raises:
+        400: Malformed cursor
+        403: Missing or invalid X-Internal-Secret
+    """
+    try:
+        after = decode_job_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # One extra row tells whether there is a next page
+    jobs = await list_jobs(
+        limit=limit + 1,
+        workspace_id=workspace_id,
+        job_type=type,
+        status=status,
+        after=after
+    )
+    page = jobs[:limit]
+    return JobListResponse(
+        jobs=[
+            JobSummary(
+                id=job.id,
+                type=job.type,
+                workspace_id=job.workspace_id,
+                status=job.status,
+                error=job.error,
+                created_at=job.created_at,
+                updated_at=job.updated_at
+            )
+            for job in page
+        ],
+        next_cursor=encode_job_cursor(page[-1]) if len(jobs) > limit else None
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak comparison: W/"x" and "x" match
+    return "*" in candidates or etag.removeprefix("W/") in (c.removeprefix("W/") for c in candidates)
+
+
+@router.get(
+    "/{job_id}",
+    response_class=Response,
+    responses={
+        200: {"model": JobResponse, "description": "The job (a subset of its fields when `fields` is set)"},
+        304: {"description": "Not Modified (If-None-Match matched the ETag)"}
+    }
+)
+async def get_job_status(
+    job_id: str,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get status of an async job by ID.
     
+    The JSON body is passed through from the store as-is (no model
+    re-validation). `fields` (comma-separated, e.g. `fields=status`) limits
+    the response to those fields plus `status` and `updated_at`, so status
+    polls can skip the (large) result.
+    
+    Responses carry an ETag; pollers sending it back in If-None-Match get
+    304 Not Modified (no body) while the job is unchanged.
+    
     Args:
         job_id: UUID of the job to query
+        fields: Optional projection over id, type, status, result, error,
+                created_at, updated_at
         
     Returns:
-        JobResponse with current status, result, or error
+        JobResponse JSON with current status, result, or error; with `fields`,
+        only the requested subset of it
         
     Raises:
+        400: Unknown field in `fields`
         404: Job not found
     """
-    job = get_job(job_id)
+    try:
+        snapshot = await get_job_snapshot(
+            job_id,
+            [f.strip() for f in fields.split(",") if f.strip()] if fields is not None else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not snapshot:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found. It may have expired or never existed."
+        )
+    
+    headers = {"ETag": snapshot.etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot.body, media_type="application/json", headers=headers)
+
+
+@router.get("/{job_id}/report", responses={200: {"content": {"text/markdown": {}}}})
+async def get_job_report(job_id: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Get the full report of a completed job as Markdown, expanded from the
+    content-addressed report store (`result.report_hash`). The ETag is the
+    report hash, so unchanged reports revalidate with 304.
+    
+    Raises:
+        404: Job not found, or the job has no report (yet)
+    """
+    job = await get_job(job_id)
     if not job:
         raise HTTPException(
             status_code=404,
             detail=f"Job {job_id} not found. It may have expired or never existed."
         )
+    result = job.result or {}
+    digest = result.get("report_hash")
+    if digest:
+        etag = f'"{digest}"'
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        report = await get_report(digest)
+        headers = {"ETag": etag}
+    else:
+        # Jobs completed before the report store kept the text inline
+        report = result.get("full_report")
+        headers = {}
+    if report is None:
+        raise HTTPException(status_code=404, detail=f"No report stored for job {job_id}.")
+    return Response(content=report, media_type="text/markdown; charset=utf-8", headers=headers)
+
+
+@router.get("/{job_id}/trace", response_model=JobTraceResponse)
+async def get_job_trace_spans(job_id: str):
+    """
+    Get the recorded trace of a job run: one span per pipeline phase,
+    agent thought, tool call and LLM completion, with wall time and token
+    usage, plus total time per span name.
+    
+    Raises:
+        404: Job not found, or no trace recorded (yet)
+    """
+    trace = await get_job_trace(job_id)
+    if not trace:
+        job = await get_job(job_id)
+        raise HTTPException(
+            status_code=404,
+            detail=(
+                f"No trace recorded for job {job_id} yet." if job
+                else f"Job {job_id} not found. It may have expired or never existed."
+            )
+        )
+    return JobTraceResponse(job_id=job_id, **expand_trace(trace))
+
+
+def _sse(event: str, data: dict) -> str:
+    """Formats one Server-Sent Event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: str, request: Request):
+    """
+    Stream job progress as Server-Sent Events.
+    
+    Events:
+        status: current status on connect, then every transition
+                (the terminal event carries `result` or `error`)
+        step:   intermediate agent steps (pipeline phases, thoughts, tool calls)
     
-    return JobResponse(
-        id=job.id,
-        type=job.type,
-        status=job.status,
-        result=job.result,
-        error=job.error,
-        created_at=job.created_at,
-        updated_at=job.updated_at
+    The stream closes after the job completes or fails.
+    
+    `step` events only come from jobs running in this process
+    (WORKER_EMBEDDED=true). Jobs run by a separate `python worker.py` (the
+    default) only produce `status` events, read from the job store every
+    JOB_STREAM_POLL_SECONDS.
+    
+    Raises:
+        404: Job not found
+    """
+    settings = get_settings()
+    # Subscribe before reading the snapshot so no transition is missed
+    queue = job_events.subscribe(job_id)
+    job = await get_job(job_id)
+    if not job:
+        job_events.unsubscribe(job_id, queue)
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job {job_id} not found. It may have expired or never existed."
+        )
+
+    async def events():
+        last_status = job.status.value
+        deadline = time.monotonic() + settings.job_stream_max_seconds
+        try:
+            yield _sse("status", {
+                "job_id": job.id,
+                "status": last_status,
+                "result": job.result,
+                "error": job.error
+            })
+            if last_status in TERMINAL_STATUSES:
+                return
+
+            while time.monotonic() < deadline:
+                if await request.is_disconnected():
+                    return
+                try:
+                    message = await asyncio.wait_for(queue.get(), timeout=settings.job_stream_poll_seconds)
+                except asyncio.TimeoutError:
+                    # No in-process event: the job may run in a separate worker process
+                    current = await get_job(job_id)
+                    if current and current.status.value != last_status:
+                        last_status = current.status.value
+                        yield _sse("status", {
+                            "job_id": job_id,
+                            "status": last_status,
+                            "result": current.result,
+                            "error": current.error
+                        })
+                        if last_status in TERMINAL_STATUSES:
+                            return
+                    else:
+                        yield ": keepalive\n\n"
+                    continue
+
+                yield _sse(message["event"], message["data"])
+                if message["event"] == "status":
+                    last_status = message["data"]["status"]
+                    if last_status in TERMINAL_STATUSES:
+                        return
+        finally:
+            job_events.unsubscribe(job_id, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
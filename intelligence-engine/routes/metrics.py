@@ -0,0 +1,14 @@
+"""
+Prometheus scrape endpoint.
+"""
+from fastapi import APIRouter, Response
+from core.metrics import render_metrics
+
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    payload, content_type = await render_metrics()
+    return Response(content=payload, media_type=content_type)
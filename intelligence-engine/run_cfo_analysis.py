@@ -6,41 +6,37 @@ import asyncio
 import sys
 sys.path.insert(0, 'd:\\1. LUCCAS\\aplicativos ai\\KyrieOS\\intelligence-engine')
 
-from core.supabase import get_supabase_client
+from core.audit_log import get_audit_log
+from core.cfo_data import fetch_cfo_dataset
+from core.cfo_engine import analyze_workspace
+from core.config import get_settings
+from core.logs import configure_logging
 
 async def run_cfo_analysis_simple(workspace_id: str):
     """Direct CFO analysis without CrewAI."""
     print(f"🤖 CFO Agent iniciando análise para workspace {workspace_id}...")
     
-    supabase = get_supabase_client()
+    audit_log = get_audit_log()
     
-    # Fetch contracts
-    print("📊 Buscando contratos ativos...")
-    contracts_result = supabase.table("contracts") \
-        .select("id, client_name, monthly_value, hourly_cost") \
-        .eq("workspace_id", workspace_id) \
-        .eq("is_active", True) \
-        .execute()
+    # Fetch contracts and worklogs (concurrently)
+    print("📊 Buscando contratos ativos e worklogs...")
+    dataset = await fetch_cfo_dataset(workspace_id)
     
-    contracts = contracts_result.data
+    contracts = dataset.contracts
     if not contracts:
         print("❌ Nenhum contrato ativo encontrado.")
         return
     
     print(f"✅ {len(contracts)} contratos encontrados")
+    print(f"✅ Worklogs processados: {dataset.hours_by_client}")
     
-    # Fetch worklogs
-    print("⏱️  Buscando worklogs...")
-    worklog_result = supabase.rpc("get_worklog_summary", {
-        "workspace_id_param": workspace_id
-    }).execute()
-    
-    worklogs = {w["client_name"]: float(w["total_hours"]) for w in worklog_result.data}
-    print(f"✅ Worklogs processados: {worklogs}")
-    
-    # Calculate analysis
-    total_revenue = sum(c["monthly_value"] for c in contracts)
-    total_hours = sum(worklogs.values())
+    # Calculate analysis (vectorized, same engine as the API)
+    breakdown = analyze_workspace(
+        workspace_id, contracts, dataset.worklogs,
+        variance_threshold=get_settings().cfo_variance_threshold
+    )
+    total_revenue = breakdown.total_monthly_revenue
+    total_hours = breakdown.total_hours_logged
     
     print(f"\n💰 RECEITA TOTAL: R${total_revenue:.2f}")
     print(f"⏰ HORAS TOTAIS: {total_hours:.1f}h")
@@ -49,18 +45,15 @@ async def run_cfo_analysis_simple(workspace_id: str):
     print(f"{'='*60}\n")
     
     alerts = []
-    for contract in contracts:
-        client_name = contract["client_name"]
-        monthly_revenue = float(contract["monthly_value"])
-        hourly_cost = float(contract["hourly_cost"])
-        hours_logged = worklogs.get(client_name, 0.0)
-        
-        revenue_pct = (monthly_revenue / total_revenue) * 100 if total_revenue > 0 else 0
-        hours_pct = (hours_logged / total_hours) * 100 if total_hours > 0 else 0
-        
-        expected_cost = hours_logged * hourly_cost
-        budget_variance = expected_cost - monthly_revenue
-        variance_pct = (budget_variance / monthly_revenue) * 100 if monthly_revenue > 0 else 0
+    for i, client_name in enumerate(breakdown.client_names):
+        monthly_revenue = float(breakdown.monthly_revenue[i])
+        hourly_cost = float(breakdown.hourly_rate[i])
+        hours_logged = float(breakdown.total_hours[i])
+        revenue_pct = float(breakdown.revenue_percentage[i])
+        hours_pct = float(breakdown.hours_percentage[i])
+        expected_cost = float(breakdown.expected_cost[i])
+        budget_variance = float(breakdown.budget_variance[i])
+        variance_pct = float(breakdown.variance_percentage[i])
         
         print(f"👤 CLIENTE: {client_name}")
         print(f"   📈 Receita: R${monthly_revenue:.2f} ({revenue_pct:.1f}% do total)")
@@ -68,7 +61,7 @@ async def run_cfo_analysis_simple(workspace_id: str):
         print(f"   💸 Custo Real: {hours_logged:.1f}h × R${hourly_cost:.2f} = R${expected_cost:.2f}")
         print(f"   📊 Variância: R${budget_variance:.2f} ({variance_pct:+.1f}%)")
         
-        if variance_pct > 10:
+        if breakdown.over_budget[i]:
             alert_msg = (
                 f"🚨 ALERTA ORÇAMENTÁRIO: {client_name} - "
                 f"Receita mensal é R${monthly_revenue:.2f}, mas o custo real da equipe é R${expected_cost:.2f}. "
@@ -78,8 +71,8 @@ async def run_cfo_analysis_simple(workspace_id: str):
             print(f"   ⚠️  STATUS: OVER BUDGET!")
             alerts.append({"client": client_name, "alert": alert_msg, "variance": budget_variance})
             
-            # Log to ai_actions
-            supabase.table("ai_actions").insert({
+            # Log to ai_actions (buffered, bulk-inserted by the audit log writer)
+            audit_log.log({
                 "task_id": None,
                 "agent_name": "CFOAgent",
                 "action": "budget_alert",
@@ -93,12 +86,13 @@ async def run_cfo_analysis_simple(workspace_id: str):
                     "variance_percentage": variance_pct
                 },
                 "status": "pending"
-            }).execute()
+            })
         else:
             print(f"   ✅ STATUS: Dentro do orçamento")
         print()
     
     print(f"{'='*60}")
+    await audit_log.close()  # Writes the queued alerts
     if alerts:
         print(f"\n🚨 RESUMO: {len(alerts)} alerta(s) orçamentário(s) gerado(s)!")
         print("\nAlertas registrados na tabela ai_actions para revisão.\n")
@@ -108,5 +102,6 @@ async def run_cfo_analysis_simple(workspace_id: str):
     return alerts
 
 if __name__ == "__main__":
+    configure_logging()
     workspace_id = "45bb72d6-97f3-4410-8db2-02ae6d4e9fcb"
     asyncio.run(run_cfo_analysis_simple(workspace_id))
@@ -2,7 +2,8 @@
 Pydantic schemas for CFO agent requests and responses.
 """
 from pydantic import BaseModel, Field
-from typing import List
+from typing import List, Optional
+from uuid import UUID
 
 
 class CFOAnalysisRequest(BaseModel):
@@ -17,6 +18,25 @@ class CFOAnalysisRequest(BaseModel):
         }
 
 
+class CFOBatchAnalysisRequest(BaseModel):
+    """Request model for a multi-workspace CFO sweep."""
+    workspace_ids: Optional[List[UUID]] = Field(
+        None,
+        min_length=1,
+        description="UUIDs of the workspaces to analyze (at least one). Omit to sweep every workspace."
+    )
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "workspace_ids": [
+                    "550e8400-e29b-41d4-a716-446655440000",
+                    "45bb72d6-97f3-4410-8db2-02ae6d4e9fcb"
+                ]
+            }
+        }
+
+
 class BudgetAlert(BaseModel):
     """Individual budget alert from CFO analysis."""
     client_name: str
@@ -3,7 +3,7 @@ Pydantic schemas for job tracking and status responses.
 """
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from core.job_tracker import JobStatus
 
 
@@ -40,15 +40,99 @@ class JobResponse(BaseModel):
         }
 
 
+class JobSummary(BaseModel):
+    """One job in a listing (without payload/result; see GET /jobs/{job_id})."""
+    id: str
+    type: str
+    workspace_id: Optional[str] = None
+    status: JobStatus
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobListResponse(BaseModel):
+    """Response model for job listings, newest first."""
+    jobs: List[JobSummary]
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page; null on the last page
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "jobs": [
+                    {
+                        "id": "550e8400-e29b-41d4-a716-446655440000",
+                        "type": "cfo_analysis",
+                        "workspace_id": "7c9e6679-7425-40de-944b-e07fc1f90ae7",
+                        "status": "completed",
+                        "error": None,
+                        "created_at": "2026-01-25T21:00:00Z",
+                        "updated_at": "2026-01-25T21:00:15Z"
+                    }
+                ],
+                "next_cursor": "MjAyNi0wMS0yNVQyMTowMDowMCswMDowMHw1NTBlODQwMC1lMjliLTQxZDQtYTcxNi00NDY2NTU0NDAwMDA"
+            }
+        }
+
+
+class TraceSpan(BaseModel):
+    """One recorded step of a job run."""
+    kind: str  # phase | thought | tool | llm
+    name: str
+    start_ms: float  # Offset from the start of the job
+    duration_ms: float
+    attrs: Dict[str, Any] = {}
+
+
+class TraceSummaryEntry(BaseModel):
+    """Total time per span name."""
+    kind: str
+    name: str
+    count: int
+    total_ms: float
+
+
+class JobTraceResponse(BaseModel):
+    """Response model for job traces."""
+    job_id: str
+    started_at: Optional[datetime] = None
+    total_ms: Optional[float] = None
+    dropped_spans: int = 0
+    spans: List[TraceSpan]
+    summary: List[TraceSummaryEntry]
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "job_id": "550e8400-e29b-41d4-a716-446655440000",
+                "started_at": "2026-01-25T21:00:00Z",
+                "total_ms": 8421.7,
+                "dropped_spans": 0,
+                "spans": [
+                    {"kind": "phase", "name": "fetch_contracts", "start_ms": 12.3, "duration_ms": 48.1, "attrs": {}},
+                    {"kind": "llm", "name": "completion", "start_ms": 140.2, "duration_ms": 2210.5,
+                     "attrs": {"model": "groq/llama-3.3-70b-versatile", "prompt_tokens": 1830, "completion_tokens": 412}},
+                    {"kind": "tool", "name": "Fetch Contract Data", "start_ms": 2352.0, "duration_ms": 95.4,
+                     "attrs": {"rows": 4}}
+                ],
+                "summary": [
+                    {"kind": "phase", "name": "crew_kickoff", "count": 1, "total_ms": 7950.2}
+                ]
+            }
+        }
+
+
 class JobCreatedResponse(BaseModel):
-    """Response when a new job is created."""
+    """Response when a new job is created (or an in-flight one is reused)."""
     job_id: str
     message: str
+    deduplicated: bool = False  # True when job_id is a job already in flight
     
     class Config:
         json_schema_extra = {
             "example": {
                 "job_id": "550e8400-e29b-41d4-a716-446655440000",
-                "message": "CFO analysis started. Check /jobs/{job_id} for status."
+                "message": "CFO analysis started. Check /jobs/{job_id} for status.",
+                "deduplicated": False
             }
         }
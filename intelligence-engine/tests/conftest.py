@@ -0,0 +1,36 @@
+"""
+Shared test setup: importable `core`/`agents` packages, dummy settings, and
+an in-memory job store per test (no Supabase or LLM access).
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+ENGINE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ENGINE_DIR)
+
+# Required settings; nothing in the tests talks to these services
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "eyJhbGciOiJIUzI1NiJ9.eyJyb2xlIjoic2VydmljZV9yb2xlIn0.test")
+os.environ.setdefault("OPENROUTER_API_KEY", "test")
+os.environ.setdefault("GEMINI_API_KEY", "test")
+os.environ.setdefault("INTERNAL_API_SECRET", "test")
+
+
+def run(coro):
+    """Runs a coroutine to completion (the suite has no async plugin)."""
+    return asyncio.run(coro)
+
+
+@pytest.fixture
+def job_store():
+    """Installs a fresh InMemoryJobStore (and an empty read cache) for the test."""
+    from core import job_tracker
+
+    previous = job_tracker.get_job_store()
+    store = job_tracker.InMemoryJobStore()
+    job_tracker.set_job_store(store)
+    yield store
+    job_tracker.set_job_store(previous)
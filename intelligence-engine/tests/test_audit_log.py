@@ -0,0 +1,94 @@
+"""
+core.audit_log.AuditLogWriter against a fake `ai_actions` table: batching,
+retries of transient errors, and batch splitting around rejected rows.
+"""
+import pytest
+from supabase import PostgrestAPIError
+
+from conftest import run
+from core import audit_log
+from core.audit_log import AuditLogWriter, is_retryable
+
+
+def api_error(code):
+    return PostgrestAPIError({"code": code, "message": "error", "details": None, "hint": None})
+
+
+class FakeTable:
+    """Rows with `"bad": True` violate a constraint; `outages` failures come first."""
+
+    def __init__(self, outages=0):
+        self.rows = []
+        self.requests = 0
+        self.outages = outages
+
+    def table(self, name):
+        return self
+
+    def insert(self, batch):
+        return list(batch)
+
+    async def execute(self, batch, operation=None):
+        self.requests += 1
+        if self.outages:
+            self.outages -= 1
+            raise ConnectionError("database unreachable")
+        if any(row.get("bad") for row in batch):
+            raise api_error("23502")
+        self.rows.extend(batch)
+
+
+@pytest.fixture
+def table(monkeypatch):
+    fake = FakeTable()
+    monkeypatch.setattr(audit_log, "get_supabase_client", lambda: fake)
+    monkeypatch.setattr(audit_log, "execute", fake.execute)
+    return fake
+
+
+def test_is_retryable():
+    assert is_retryable(ConnectionError("reset"))
+    assert is_retryable(api_error("40P01"))  # Deadlock
+    assert is_retryable(api_error("PGRST001"))  # Database unreachable
+    assert not is_retryable(api_error("23505"))  # Unique violation
+    assert not is_retryable(api_error("22P02"))  # Malformed value
+    assert not is_retryable(api_error("PGRST204"))  # Unknown column
+
+
+def test_flush_writes_in_batches(table):
+    writer = AuditLogWriter(batch_size=10, flush_interval=60)
+
+    async def scenario():
+        writer.log_many({"i": i} for i in range(25))
+        writer.log({"i": 25})
+        await writer.close()
+
+    run(scenario())
+    assert [row["i"] for row in table.rows] == list(range(26))
+    assert table.requests == 3
+
+
+def test_transient_errors_are_retried(table):
+    table.outages = 2
+    writer = AuditLogWriter(batch_size=10, flush_interval=60, max_retries=3, retry_backoff=0)
+
+    async def scenario():
+        writer.log_many({"i": i} for i in range(5))
+        await writer.close()
+
+    run(scenario())
+    assert len(table.rows) == 5
+    assert table.requests == 3
+
+
+def test_rejected_rows_are_isolated(table):
+    writer = AuditLogWriter(batch_size=16, flush_interval=60, retry_backoff=0)
+    rows = [{"i": i, "bad": i in (3, 11)} for i in range(16)]
+
+    async def scenario():
+        writer.log_many(rows)
+        await writer.close()
+
+    run(scenario())
+    # Only the two bad rows are dropped; the rest keep their order
+    assert [row["i"] for row in table.rows] == [i for i in range(16) if i not in (3, 11)]
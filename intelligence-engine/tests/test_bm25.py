@@ -0,0 +1,179 @@
+"""
+UI/UX Pro Max BM25 search (.agent/.shared/ui-ux-pro-max/scripts/core.py):
+the inverted-index scorer must rank exactly like the original full-scan scorer.
+"""
+import csv
+import importlib.util
+import re
+from collections import defaultdict
+from math import log
+from pathlib import Path
+
+import pytest
+
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / ".agent" / ".shared" / "ui-ux-pro-max" / "scripts"
+
+QUERIES = [
+    ("glassmorphism dark mode dashboard", "style"),
+    ("fintech banking trust", "color"),
+    ("time series trend comparison", "chart"),
+    ("saas pricing conversion hero", "landing"),
+    ("healthcare accessibility", "product"),
+    ("touch target mobile scroll", "ux"),
+    ("elegant serif luxury", "typography"),
+    ("navigation arrow menu", "icons"),
+    ("rerender memo waterfall", "react"),
+    ("focus outline aria form", "web"),
+    ("nothing matches qwxyz", "style"),
+]
+
+
+@pytest.fixture(scope="module")
+def search_core():
+    # Loaded by path: the script's module name (`core`) clashes with the engine's package
+    spec = importlib.util.spec_from_file_location("uiux_search_core", SCRIPTS_DIR / "core.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def isolated_index(search_core, tmp_path, monkeypatch):
+    """Persisted indexes go to a temp dir; every test starts with a cold cache."""
+    monkeypatch.setattr(search_core, "INDEX_DIR", tmp_path)
+    search_core._INDEX_CACHE.clear()
+
+
+class ReferenceBM25:
+    """The original scorer: full scan over every document, full sort."""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.corpus = []
+        self.doc_lengths = []
+        self.avgdl = 0
+        self.idf = {}
+        self.doc_freqs = defaultdict(int)
+        self.N = 0
+
+    def tokenize(self, text):
+        text = re.sub(r'[^\w\s]', ' ', str(text).lower())
+        return [w for w in text.split() if len(w) > 2]
+
+    def fit(self, documents):
+        self.corpus = [self.tokenize(doc) for doc in documents]
+        self.N = len(self.corpus)
+        if self.N == 0:
+            return
+        self.doc_lengths = [len(doc) for doc in self.corpus]
+        self.avgdl = sum(self.doc_lengths) / self.N
+        for doc in self.corpus:
+            seen = set()
+            for word in doc:
+                if word not in seen:
+                    self.doc_freqs[word] += 1
+                    seen.add(word)
+        for word, freq in self.doc_freqs.items():
+            self.idf[word] = log((self.N - freq + 0.5) / (freq + 0.5) + 1)
+
+    def score(self, query):
+        query_tokens = self.tokenize(query)
+        scores = []
+        for idx, doc in enumerate(self.corpus):
+            score = 0
+            doc_len = self.doc_lengths[idx]
+            term_freqs = defaultdict(int)
+            for word in doc:
+                term_freqs[word] += 1
+            for token in query_tokens:
+                if token in self.idf:
+                    tf = term_freqs[token]
+                    idf = self.idf[token]
+                    numerator = tf * (self.k1 + 1)
+                    denominator = tf + self.k1 * (1 - self.b + self.b * doc_len / self.avgdl)
+                    score += idf * numerator / denominator
+            scores.append((idx, score))
+        return sorted(scores, key=lambda x: x[1], reverse=True)
+
+
+def reference_search(search_core, query, domain, max_results):
+    """The original _search_csv: re-read, re-fit, full sort, top results with score > 0."""
+    config = search_core.CSV_CONFIG[domain]
+    with open(search_core.DATA_DIR / config["file"], 'r', encoding='utf-8') as f:
+        data = list(csv.DictReader(f))
+    documents = [" ".join(str(row.get(col, "")) for col in config["search_cols"]) for row in data]
+    bm25 = ReferenceBM25()
+    bm25.fit(documents)
+    results = []
+    for idx, score in bm25.score(query)[:max_results]:
+        if score > 0:
+            row = data[idx]
+            results.append({col: row.get(col, "") for col in config["output_cols"] if col in row})
+    return results
+
+
+def test_scores_match_reference(search_core):
+    documents = [
+        "dark mode dashboard with glass cards",
+        "light minimal landing page",
+        "dark dark dark theme",
+        "pricing table for saas",
+        "",
+        "dashboard dashboard analytics charts",
+    ]
+    new, old = search_core.BM25(), ReferenceBM25()
+    new.fit(documents)
+    old.fit(documents)
+    for query in ("dark dashboard", "saas pricing", "charts", "unknown words", "dark dark"):
+        expected = old.score(query)
+        actual = new.score(query)
+        assert [idx for idx, _ in actual] == [idx for idx, _ in expected], query
+        assert [s for _, s in actual] == pytest.approx([s for _, s in expected]), query
+        # top_k is the positive-score prefix of the full ranking
+        positive = [(idx, s) for idx, s in expected if s > 0]
+        assert [idx for idx, _ in new.top_k(query, 3)] == [idx for idx, _ in positive[:3]], query
+
+
+@pytest.mark.parametrize("query,domain", QUERIES)
+def test_search_matches_reference(search_core, query, domain):
+    for max_results in (1, 3, 10):
+        result = search_core.search(query, domain, max_results)
+        assert result["domain"] == domain
+        assert result["results"] == reference_search(search_core, query, domain, max_results)
+        assert result["count"] == len(result["results"])
+
+
+def test_search_uses_persisted_index(search_core, tmp_path):
+    query, domain = QUERIES[0]
+    first = search_core.search(query, domain)
+    assert list(tmp_path.glob("*.bm25.pickle"))
+    # A cold process-level cache must load the same index from disk
+    search_core._INDEX_CACHE.clear()
+    assert search_core.search(query, domain) == first
+
+
+def test_search_many_matches_single_searches(search_core):
+    batch = QUERIES + [("dark mode", None), ("color palette for fintech", None)]
+    queries = [(query, domain, 3) for query, domain in batch]
+    responses = search_core.search_many(queries)
+    assert len(responses) == len(queries)
+    for (query, domain, max_results), response in zip(queries, responses):
+        single = search_core.search(query, domain, max_results)
+        assert response == single
+        if domain is None:
+            assert response["domain"] == search_core.detect_domain(query)
+        else:
+            assert response["results"] == reference_search(search_core, query, domain, max_results)
+
+
+def test_build_all_indexes_prebuilds_every_csv(search_core, tmp_path):
+    built = search_core.build_all_indexes()
+    assert "styles.csv" in built
+    assert len(list(tmp_path.glob("*.bm25.pickle"))) == len(built)
+    # Searches then load the prebuilt index instead of building one
+    search_core._INDEX_CACHE.clear()
+    before = {p: p.stat().st_mtime_ns for p in tmp_path.glob("*.bm25.pickle")}
+    search_core.search(*QUERIES[0])
+    assert {p: p.stat().st_mtime_ns for p in tmp_path.glob("*.bm25.pickle")} == before
@@ -0,0 +1,75 @@
+"""
+agents.cfo_agent result caching: runs of identical input data are answered
+from the result cache, but never across workspaces.
+"""
+import pytest
+
+pytest.importorskip("crewai")
+
+from conftest import run
+from agents import cfo_agent
+from core import job_tracker
+from core.cfo_data import CFODataset
+from core.job_tracker import JobStatus
+from core.result_cache import InMemoryResultCache
+
+
+class AuditLog:
+    def __init__(self):
+        self.rows = []
+
+    def log(self, row):
+        self.rows.append(row)
+
+
+@pytest.fixture
+def agent_env(job_store, monkeypatch):
+    """No Supabase: datasets come from `datasets`, reports and audit rows stay in memory."""
+    datasets = {}
+    cache = InMemoryResultCache(ttl_seconds=3600, max_entries=100)
+    audit = AuditLog()
+
+    async def fetch_cfo_dataset(workspace_id, job_type="cfo_analysis"):
+        contracts, worklogs = datasets.get(workspace_id, ([], []))
+        return CFODataset(workspace_id, contracts, worklogs)
+
+    async def put_report(text):
+        return "report-hash"
+
+    monkeypatch.setattr(cfo_agent, "fetch_cfo_dataset", fetch_cfo_dataset)
+    monkeypatch.setattr(cfo_agent, "get_result_cache", lambda: cache)
+    monkeypatch.setattr(cfo_agent, "put_report", put_report)
+    monkeypatch.setattr(cfo_agent, "get_audit_log", lambda: audit)
+    return datasets
+
+
+def analyze(workspace_id):
+    async def scenario():
+        job = await job_tracker.create_job("cfo_analysis", workspace_id=workspace_id)
+        await cfo_agent.run_cfo_analysis(job.id, workspace_id)
+        return job.id, await job_tracker.get_job(job.id)
+    return run(scenario())
+
+
+def test_fingerprint_includes_workspace():
+    a = cfo_agent.cfo_input_fingerprint(CFODataset("ws-a", [], []))
+    b = cfo_agent.cfo_input_fingerprint(CFODataset("ws-b", [], []))
+    assert a != b
+    assert cfo_agent.cfo_input_fingerprint(CFODataset("ws-a", [], [])) == a
+
+
+def test_empty_workspaces_do_not_share_results(agent_env):
+    first_id, first = analyze("ws-a")
+    assert first.status == JobStatus.COMPLETED
+    assert first.result["workspace_id"] == "ws-a"
+    assert first.result["cache"]["hit"] is False
+
+    _, second = analyze("ws-b")
+    assert second.status == JobStatus.COMPLETED
+    assert second.result["workspace_id"] == "ws-b"
+    assert second.result["cache"]["hit"] is False
+
+    # The same workspace with unchanged data is still a hit
+    _, again = analyze("ws-a")
+    assert again.result["workspace_id"] == "ws-a"
+    assert again.result["cache"] == {**first.result["cache"], "hit": True, "source_job_id": first_id}
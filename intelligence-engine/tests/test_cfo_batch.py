@@ -0,0 +1,101 @@
+"""
+CFO batch sweep: request validation and resuming a reclaimed parent job.
+"""
+import pytest
+from pydantic import ValidationError
+
+from conftest import run
+from core import job_tracker
+from core.job_tracker import JobStatus
+from schemas.cfo import CFOBatchAnalysisRequest
+
+
+WS = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(1, 6)]
+
+
+def test_batch_request_validation():
+    assert CFOBatchAnalysisRequest().workspace_ids is None  # Omitted: sweep every workspace
+    assert [str(w) for w in CFOBatchAnalysisRequest(workspace_ids=WS[:2]).workspace_ids] == WS[:2]
+    with pytest.raises(ValidationError):
+        CFOBatchAnalysisRequest(workspace_ids=[])
+    with pytest.raises(ValidationError):
+        CFOBatchAnalysisRequest(workspace_ids=[WS[0], "not-a-uuid"])
+
+
+class AuditLog:
+    def __init__(self):
+        self.rows = []
+
+    def log_many(self, rows):
+        self.rows.extend(rows)
+
+
+@pytest.fixture
+def batch_env(job_store, monkeypatch):
+    """Every workspace has one contract over budget; reads are recorded, nothing leaves the process."""
+    cfo_agent = pytest.importorskip("agents.cfo_agent")
+    env = {"fetched": [], "audit": AuditLog()}
+
+    async def fetch_workspace_ids():
+        return list(WS)
+
+    async def fetch_bulk_cfo_data(workspace_ids, job_type="cfo_batch_analysis"):
+        env["fetched"].extend(workspace_ids)
+        contracts = [
+            {"workspace_id": ws, "client_name": "Acme", "monthly_value": 1000, "hourly_cost": 100}
+            for ws in workspace_ids
+        ]
+        worklogs = [{"workspace_id": ws, "client_name": "Acme", "total_hours": 20} for ws in workspace_ids]
+        return contracts, worklogs
+
+    monkeypatch.setattr(cfo_agent, "fetch_workspace_ids", fetch_workspace_ids)
+    monkeypatch.setattr(cfo_agent, "fetch_bulk_cfo_data", fetch_bulk_cfo_data)
+    monkeypatch.setattr(cfo_agent, "get_audit_log", lambda: env["audit"])
+    monkeypatch.setattr(cfo_agent.settings, "cfo_batch_chunk_size", 2)
+    env["agent"] = cfo_agent
+    return env
+
+
+def sweep(env, workspace_ids, previous_result=None):
+    async def scenario():
+        job = await job_tracker.create_job("cfo_batch_analysis", payload={"workspace_ids": workspace_ids})
+        await env["agent"].run_cfo_batch_analysis(job.id, workspace_ids, previous_result)
+        return await job_tracker.get_job(job.id)
+    return run(scenario())
+
+
+def child_jobs(store):
+    return [j for j in store._jobs.values() if j.type == "cfo_analysis"]
+
+
+def test_none_sweeps_every_workspace(batch_env, job_store):
+    parent = sweep(batch_env, None)
+    assert parent.status == JobStatus.COMPLETED
+    assert parent.result["total_workspaces"] == len(WS)
+    assert sorted(j.workspace_id for j in child_jobs(job_store)) == WS
+
+
+def test_empty_list_sweeps_nothing(batch_env, job_store):
+    parent = sweep(batch_env, [])
+    assert parent.status == JobStatus.COMPLETED
+    assert parent.result["total_workspaces"] == 0
+    assert batch_env["fetched"] == [] and child_jobs(job_store) == []
+
+
+def test_reclaimed_sweep_skips_processed_workspaces(batch_env, job_store):
+    # An earlier attempt wrote the first chunk, then its lease expired
+    previous = {
+        "total_workspaces": len(WS),
+        "processed_workspaces": 2,
+        "total_alerts": 2,
+        "workspaces": {ws: {"status": "completed", "job_id": f"child-{ws}", "alerts": 1} for ws in WS[:2]}
+    }
+    parent = sweep(batch_env, None, previous)
+
+    assert batch_env["fetched"] == WS[2:]
+    assert sorted(j.workspace_id for j in child_jobs(job_store)) == WS[2:]
+    assert len(batch_env["audit"].rows) == 3
+    assert parent.result["processed_workspaces"] == len(WS)
+    assert parent.result["total_alerts"] == len(WS)
+    assert parent.result["workspaces"][WS[0]]["job_id"] == f"child-{WS[0]}"
+    assert set(parent.result["workspaces"]) == set(WS)
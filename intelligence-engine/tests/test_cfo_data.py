@@ -0,0 +1,50 @@
+"""
+core.cfo_data worklog summary source: trigger-maintained totals, with the
+full get_worklog_summary RPC as fallback.
+"""
+import pytest
+
+from conftest import run
+from core import cfo_data
+
+
+ROWS = [{"client_name": "Acme", "total_hours": 12.5}]
+
+
+class FakeRpc:
+    def rpc(self, name, params):
+        return (name, params)
+
+
+@pytest.fixture
+def rpc_calls(monkeypatch):
+    calls = {"failing": set(), "names": []}
+
+    async def fake_execute(query, operation=None):
+        name, params = query
+        calls["names"].append(name)
+        assert params == {"workspace_id_param": "ws-1"}
+        if name in calls["failing"]:
+            raise ConnectionError("function not found")
+        return type("Response", (), {"data": ROWS})()
+
+    monkeypatch.setattr(cfo_data, "get_supabase_client", lambda: FakeRpc())
+    monkeypatch.setattr(cfo_data, "execute", fake_execute)
+    return calls
+
+
+def test_reads_trigger_maintained_totals(rpc_calls):
+    assert run(cfo_data.fetch_worklog_summary("ws-1")) == ROWS
+    assert rpc_calls["names"] == ["get_worklog_summary_totals"]
+
+
+def test_falls_back_to_full_summary(rpc_calls):
+    rpc_calls["failing"].add("get_worklog_summary_totals")
+    assert run(cfo_data.fetch_worklog_summary("ws-1")) == ROWS
+    assert rpc_calls["names"] == ["get_worklog_summary_totals", "get_worklog_summary"]
+
+
+def test_disabled_uses_full_summary(rpc_calls, monkeypatch):
+    monkeypatch.setattr(cfo_data.get_settings(), "worklog_incremental_enabled", False)
+    assert run(cfo_data.fetch_worklog_summary("ws-1")) == ROWS
+    assert rpc_calls["names"] == ["get_worklog_summary"]
@@ -0,0 +1,118 @@
+"""
+core.cfo_engine against the original per-client loop (baseline run_cfo_analysis math).
+"""
+import pytest
+
+from core.cfo_engine import analyze_workspace, analyze_workspaces
+
+
+THRESHOLD = 10.0
+
+CONTRACTS = [
+    {"client_name": "Acme", "monthly_value": 5000, "hourly_cost": 100},     # 60h -> +20% over
+    {"client_name": "Globex", "monthly_value": 8000, "hourly_cost": 80},    # 50h -> -50%
+    {"client_name": "Initech", "monthly_value": 3000, "hourly_cost": 150},  # 22h -> +10% (not over)
+    {"client_name": "Hooli", "monthly_value": 0, "hourly_cost": 90},        # no revenue
+    {"client_name": "Umbrella", "monthly_value": 4000, "hourly_cost": 50},  # no worklogs
+]
+WORKLOGS = [
+    {"client_name": "Acme", "total_hours": 60},
+    {"client_name": "Globex", "total_hours": 50},
+    {"client_name": "Initech", "total_hours": 22},
+    {"client_name": "Hooli", "total_hours": 10},
+    {"client_name": "Orphan", "total_hours": 8},  # No active contract; still counts in total hours
+]
+
+
+def baseline(contracts, worklogs, threshold):
+    """The pre-engine loop from run_cfo_analysis.py / the CFO crew prompt."""
+    hours_by_client = {w["client_name"]: float(w["total_hours"]) for w in worklogs}
+    total_revenue = sum(c["monthly_value"] for c in contracts)
+    total_hours = sum(hours_by_client.values())
+    rows = []
+    for contract in contracts:
+        monthly_revenue = float(contract["monthly_value"])
+        hourly_cost = float(contract["hourly_cost"])
+        hours_logged = hours_by_client.get(contract["client_name"], 0.0)
+        revenue_pct = (monthly_revenue / total_revenue) * 100 if total_revenue > 0 else 0
+        hours_pct = (hours_logged / total_hours) * 100 if total_hours > 0 else 0
+        expected_cost = hours_logged * hourly_cost
+        budget_variance = expected_cost - monthly_revenue
+        variance_pct = (budget_variance / monthly_revenue) * 100 if monthly_revenue > 0 else 0
+        rows.append({
+            "client_name": contract["client_name"],
+            "revenue_percentage": revenue_pct,
+            "hours_percentage": hours_pct,
+            "total_hours": hours_logged,
+            "expected_cost": expected_cost,
+            "budget_variance": budget_variance,
+            "variance_percentage": variance_pct,
+            "over_budget": variance_pct > threshold,
+        })
+    return total_revenue, total_hours, rows
+
+
+def assert_matches_baseline(breakdown, contracts, worklogs):
+    total_revenue, total_hours, rows = baseline(contracts, worklogs, THRESHOLD)
+    assert breakdown.total_monthly_revenue == pytest.approx(total_revenue)
+    assert breakdown.total_hours_logged == pytest.approx(total_hours)
+    assert breakdown.client_names == [r["client_name"] for r in rows]
+    for i, row in enumerate(rows):
+        for field in (
+            "revenue_percentage", "hours_percentage", "total_hours",
+            "expected_cost", "budget_variance", "variance_percentage"
+        ):
+            assert float(getattr(breakdown, field)[i]) == pytest.approx(row[field]), (row["client_name"], field)
+        assert bool(breakdown.over_budget[i]) == row["over_budget"], row["client_name"]
+
+
+def test_analyze_workspace_matches_baseline():
+    breakdown = analyze_workspace("ws-1", CONTRACTS, WORKLOGS, variance_threshold=THRESHOLD)
+    assert_matches_baseline(breakdown, CONTRACTS, WORKLOGS)
+
+    response = breakdown.to_response()
+    assert [a.client_name for a in response.alerts] == ["Acme"]
+    assert response.alerts[0].budget_variance == pytest.approx(1000.0)
+    assert response.summary.startswith("[ALERT] 1 budget alert(s) found.")
+
+
+def test_analyze_workspace_without_data():
+    breakdown = analyze_workspace("ws-empty", [], [], variance_threshold=THRESHOLD)
+    assert breakdown.client_names == []
+    assert breakdown.total_monthly_revenue == 0
+    response = breakdown.to_response()
+    assert response.alerts == []
+    assert response.summary.startswith("[OK]")
+
+
+def test_analyze_workspaces_matches_per_workspace_baseline():
+    other_contracts = [
+        {"client_name": "Acme", "monthly_value": 1000, "hourly_cost": 50},  # Same name, other workspace
+        {"client_name": "Stark", "monthly_value": 2000, "hourly_cost": 200},
+    ]
+    other_worklogs = [
+        {"client_name": "Acme", "total_hours": 10},
+        {"client_name": "Stark", "total_hours": 15},
+    ]
+    # Interleave the rows: the engine must regroup them by workspace
+    contracts = [{**c, "workspace_id": "ws-1"} for c in CONTRACTS]
+    contracts.insert(1, {**other_contracts[0], "workspace_id": "ws-2"})
+    contracts.append({**other_contracts[1], "workspace_id": "ws-2"})
+    contracts.append({"client_name": "Ghost", "monthly_value": 1, "hourly_cost": 1, "workspace_id": "ws-unknown"})
+    worklogs = [{**w, "workspace_id": "ws-1"} for w in WORKLOGS] + [{**w, "workspace_id": "ws-2"} for w in other_worklogs]
+
+    breakdowns = analyze_workspaces(["ws-1", "ws-2", "ws-3"], contracts, worklogs, variance_threshold=THRESHOLD)
+
+    assert set(breakdowns) == {"ws-1", "ws-2", "ws-3"}
+    assert_matches_baseline(breakdowns["ws-1"], CONTRACTS, WORKLOGS)
+    assert_matches_baseline(breakdowns["ws-2"], other_contracts, other_worklogs)
+    assert breakdowns["ws-3"].client_names == []
+    assert breakdowns["ws-3"].total_hours_logged == 0
+
+
+def test_batch_and_single_agree():
+    contracts = [{**c, "workspace_id": "ws-1"} for c in CONTRACTS]
+    worklogs = [{**w, "workspace_id": "ws-1"} for w in WORKLOGS]
+    batch = analyze_workspaces(["ws-1"], contracts, worklogs, variance_threshold=THRESHOLD)["ws-1"]
+    single = analyze_workspace("ws-1", CONTRACTS, WORKLOGS, variance_threshold=THRESHOLD)
+    assert batch.to_response() == single.to_response()
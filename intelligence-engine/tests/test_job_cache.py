@@ -0,0 +1,207 @@
+"""
+core.job_cache.JobReadCache (hits, invalidation, coalescing, TTLs) and the
+ETag revalidation of GET /jobs/{job_id} built on it.
+"""
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import run
+from core import job_cache, job_tracker
+from core.job_cache import JobReadCache
+from core.job_tracker import JobStatus
+from routes import jobs as jobs_routes
+
+
+class Loader:
+    """Counts store reads; `gate` (when set) holds them until released."""
+
+    def __init__(self, status="running"):
+        self.status = status
+        self.calls = 0
+        self.gate = None
+
+    async def __call__(self, job_id):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.status is None:
+            return None
+        return SimpleNamespace(id=job_id, status=self.status, version=self.calls)
+
+
+def make_cache(ttl=60, terminal_ttl=600, max_entries=100):
+    return JobReadCache(ttl_seconds=ttl, terminal_ttl_seconds=terminal_ttl, max_entries=max_entries)
+
+
+def test_hit_after_first_load():
+    cache, load = make_cache(), Loader()
+
+    async def scenario():
+        first = await cache.get("job-1", load)
+        assert await cache.get("job-1", load) is first
+        assert load.calls == 1
+        # Variants are cached independently
+        await cache.get("job-1", load, variant="snapshot")
+        assert load.calls == 2
+
+    run(scenario())
+
+
+def test_invalidate_forces_reload():
+    cache, load = make_cache(), Loader()
+
+    async def scenario():
+        await cache.get("job-1", load)
+        await cache.get("job-1", load, variant="snapshot")
+        cache.invalidate("job-1")
+        assert (await cache.get("job-1", load)).version == 3
+        assert (await cache.get("job-1", load, variant="snapshot")).version == 4
+
+    run(scenario())
+
+
+def test_invalidation_during_load_is_not_cached():
+    cache, load = make_cache(), Loader()
+
+    async def scenario():
+        load.gate = asyncio.Event()
+        pending = asyncio.ensure_future(cache.get("job-1", load))
+        await asyncio.sleep(0)
+        cache.invalidate("job-1")  # A write lands while the read is in flight
+        load.gate.set()
+        stale = await pending
+        load.gate = None
+        # The stale read was returned to its caller but not cached
+        assert (await cache.get("job-1", load)).version != stale.version
+        assert load.calls == 2
+
+    run(scenario())
+
+
+def test_concurrent_misses_share_one_load():
+    cache, load = make_cache(), Loader()
+
+    async def scenario():
+        load.gate = asyncio.Event()
+        readers = [asyncio.ensure_future(cache.get("job-1", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        load.gate.set()
+        results = await asyncio.gather(*readers)
+        assert load.calls == 1
+        assert all(r is results[0] for r in results)
+
+    run(scenario())
+
+
+def test_cancelled_reader_does_not_cancel_the_load():
+    cache, load = make_cache(), Loader()
+
+    async def scenario():
+        load.gate = asyncio.Event()
+        first = asyncio.ensure_future(cache.get("job-1", load))
+        second = asyncio.ensure_future(cache.get("job-1", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        load.gate.set()
+        assert (await second).version == 1
+        assert load.calls == 1
+
+    run(scenario())
+
+
+def test_missing_job_is_not_cached():
+    cache, load = make_cache(), Loader(status=None)
+
+    async def scenario():
+        assert await cache.get("job-1", load) is None
+        assert await cache.get("job-1", load) is None
+        assert load.calls == 2
+
+    run(scenario())
+
+
+def test_ttl_depends_on_status(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(job_cache, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    cache = make_cache(ttl=5, terminal_ttl=60)
+    running, completed = Loader("running"), Loader(JobStatus.COMPLETED)
+
+    async def scenario():
+        await cache.get("running", running)
+        await cache.get("completed", completed)
+        clock[0] += 10
+        await cache.get("running", running)
+        await cache.get("completed", completed)
+        assert (running.calls, completed.calls) == (2, 1)
+        clock[0] += 60
+        await cache.get("completed", completed)
+        assert completed.calls == 2
+
+    run(scenario())
+
+
+def test_zero_ttl_disables_caching():
+    load = Loader()
+
+    async def scenario():
+        disabled = make_cache(ttl=0, terminal_ttl=0)
+        assert not disabled.enabled
+        await disabled.get("job-1", load)
+        await disabled.get("job-1", load)
+        assert load.calls == 2
+        # Non-terminal jobs bypass a terminal-only cache
+        terminal_only = make_cache(ttl=0, terminal_ttl=60)
+        await terminal_only.get("job-2", load)
+        await terminal_only.get("job-2", load)
+        assert load.calls == 4
+
+    run(scenario())
+
+
+def test_lru_eviction_and_clear():
+    cache, load = make_cache(max_entries=2), Loader()
+
+    async def scenario():
+        for job_id in ("a", "b", "a", "c"):  # "a" is used again, so "b" is evicted
+            await cache.get(job_id, load)
+        assert load.calls == 3
+        await cache.get("a", load)
+        assert load.calls == 3
+        await cache.get("b", load)
+        assert load.calls == 4
+        cache.clear()
+        await cache.get("a", load)
+        assert load.calls == 5
+
+    run(scenario())
+
+
+# --- GET /jobs/{job_id} ---
+
+def test_job_route_etag_revalidation(job_store):
+    app = FastAPI()
+    app.include_router(jobs_routes.router, prefix="/jobs")
+    client = TestClient(app)
+    job = run(job_tracker.create_job("cfo_analysis", workspace_id="ws-1"))
+
+    response = client.get(f"/jobs/{job.id}")
+    assert response.status_code == 200
+    assert response.json()["status"] == "pending"
+    etag = response.headers["ETag"]
+
+    assert client.get(f"/jobs/{job.id}", headers={"If-None-Match": etag}).status_code == 304
+
+    # update_job invalidates the cached snapshot: the poller sees the change at once
+    run(job_tracker.update_job(job.id, JobStatus.COMPLETED, result={"ok": True}))
+    response = client.get(f"/jobs/{job.id}", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["result"] == {"ok": True}
+
+    partial = client.get(f"/jobs/{job.id}", params={"fields": "status"})
+    assert partial.json() == {"status": "completed", "updated_at": response.json()["updated_at"]}
+    assert client.get(f"/jobs/{job.id}", params={"fields": "payload"}).status_code == 400
+    assert client.get("/jobs/00000000-0000-0000-0000-000000000000").status_code == 404
@@ -0,0 +1,123 @@
+"""
+Keyset-paginated job listing: cursors, store pagination and GET /jobs.
+"""
+import base64
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from conftest import run
+from core import job_tracker
+from core.job_tracker import Job, JobStatus, decode_job_cursor, encode_job_cursor
+from routes import jobs as jobs_routes
+
+
+SECRET = {"X-Internal-Secret": os.environ["INTERNAL_API_SECRET"]}
+BASE = datetime(2026, 10, 17, 12, 0, 0)
+
+
+def add_jobs(store, specs):
+    """Inserts jobs with controlled created_at: specs are (type, workspace_id, status, minutes)."""
+    jobs = []
+    for job_type, workspace_id, status, minutes in specs:
+        job = Job(job_type)
+        job.workspace_id = workspace_id
+        job.status = status
+        job.created_at = job.updated_at = BASE + timedelta(minutes=minutes)
+        store._jobs[job.id] = job
+        jobs.append(job)
+    return jobs
+
+
+def test_cursor_round_trip():
+    job = Job("cfo_analysis")
+    job.created_at = datetime(2026, 10, 17, 8, 30, 15, 123456)
+    cursor = encode_job_cursor(job)
+    assert "=" not in cursor and "/" not in cursor and "+" not in cursor
+    assert decode_job_cursor(cursor) == (job.created_at, job.id)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b"no separator").decode(),
+    base64.urlsafe_b64encode(b"2026-10-17T00:00:00|not-a-uuid").decode(),
+    base64.urlsafe_b64encode(b"yesterday|00000000-0000-0000-0000-000000000001").decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe|x").decode(),
+])
+def test_bad_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_job_cursor(cursor)
+
+
+def test_pages_cover_every_job_once(job_store):
+    # Several jobs share created_at: the id breaks the tie
+    jobs = add_jobs(job_store, [("cfo_analysis", "ws-1", JobStatus.COMPLETED, m // 2) for m in range(11)])
+
+    async def scenario():
+        seen, after = [], None
+        while True:
+            page = await job_tracker.list_jobs(limit=3, after=after)
+            if not page:
+                return seen
+            seen.extend(page)
+            after = decode_job_cursor(encode_job_cursor(page[-1]))
+
+    seen = run(scenario())
+    expected = sorted(jobs, key=lambda j: (j.created_at, j.id), reverse=True)
+    assert [j.id for j in seen] == [j.id for j in expected]
+
+
+def test_list_filters(job_store):
+    add_jobs(job_store, [
+        ("cfo_analysis", "ws-1", JobStatus.COMPLETED, 1),
+        ("cfo_analysis", "ws-1", JobStatus.FAILED, 2),
+        ("cfo_analysis", "ws-2", JobStatus.COMPLETED, 3),
+        ("cfo_batch_analysis", None, JobStatus.COMPLETED, 4),
+    ])
+
+    async def scenario():
+        by_workspace = await job_tracker.list_jobs(limit=10, workspace_id="ws-1")
+        assert {j.workspace_id for j in by_workspace} == {"ws-1"} and len(by_workspace) == 2
+        by_type = await job_tracker.list_jobs(limit=10, job_type="cfo_batch_analysis")
+        assert [j.type for j in by_type] == ["cfo_batch_analysis"]
+        combined = await job_tracker.list_jobs(limit=10, workspace_id="ws-1", status=JobStatus.COMPLETED)
+        assert len(combined) == 1 and combined[0].status == JobStatus.COMPLETED
+
+    run(scenario())
+
+
+@pytest.fixture
+def client(job_store):
+    app = FastAPI()
+    app.include_router(jobs_routes.router, prefix="/jobs")
+    return TestClient(app)
+
+
+def test_list_route_paginates(job_store, client):
+    jobs = add_jobs(job_store, [("cfo_analysis", "ws-1", JobStatus.COMPLETED, m) for m in range(5)])
+
+    ids, cursor = [], None
+    while True:
+        params = {"limit": 2, "workspace_id": "ws-1"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/jobs", params=params, headers=SECRET)
+        assert response.status_code == 200
+        body = response.json()
+        ids.extend(j["id"] for j in body["jobs"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == [j.id for j in sorted(jobs, key=lambda j: j.created_at, reverse=True)]
+
+
+def test_list_route_errors(client):
+    assert client.get("/jobs").status_code == 403
+    response = client.get("/jobs", params={"cursor": "garbage"}, headers=SECRET)
+    assert response.status_code == 400
+    assert "Invalid cursor" in response.json()["detail"]
+    assert client.get("/jobs", params={"limit": 0}, headers=SECRET).status_code == 422
+    assert client.get("/jobs", params={"status": "bogus"}, headers=SECRET).status_code == 422
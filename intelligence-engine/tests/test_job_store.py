@@ -0,0 +1,160 @@
+"""
+Job store behaviour through the public core.job_tracker API (InMemoryJobStore).
+"""
+from types import SimpleNamespace
+
+from conftest import run
+from core import job_tracker
+from core.job_tracker import JobStatus
+
+
+def test_create_get_update(job_store):
+    async def scenario():
+        job = await job_tracker.create_job("cfo_analysis", workspace_id="ws-1", payload={"a": 1})
+        assert job.status == JobStatus.PENDING
+        assert not job.deduplicated
+
+        fetched = await job_tracker.get_job(job.id)
+        assert fetched.id == job.id
+        assert fetched.workspace_id == "ws-1"
+        assert fetched.payload == {"a": 1}
+
+        await job_tracker.update_job(job.id, JobStatus.COMPLETED, result={"ok": True})
+        # update_job invalidates the read cache: the next read sees the new status
+        fetched = await job_tracker.get_job(job.id)
+        assert fetched.status == JobStatus.COMPLETED
+        assert fetched.result == {"ok": True}
+        assert fetched.to_dict()["status"] == "completed"
+
+    run(scenario())
+
+
+def test_get_missing_job(job_store):
+    assert run(job_tracker.get_job("00000000-0000-0000-0000-000000000000")) is None
+
+
+def test_create_jobs_keeps_order(job_store):
+    async def scenario():
+        jobs = await job_tracker.create_jobs("cfo_analysis", [
+            {"workspace_id": f"ws-{i}", "status": JobStatus.COMPLETED, "result": {"i": i}}
+            for i in range(3)
+        ])
+        assert [j.workspace_id for j in jobs] == ["ws-0", "ws-1", "ws-2"]
+        assert all(j.status == JobStatus.COMPLETED for j in jobs)
+        assert (await job_tracker.get_job(jobs[1].id)).result == {"i": 1}
+
+    run(scenario())
+
+
+# --- Claim / lease ---
+
+def test_claim_respects_type_limit_and_order(job_store):
+    async def scenario():
+        first = await job_tracker.create_job("cfo_batch_analysis")
+        second = await job_tracker.create_job("cfo_batch_analysis")
+        await job_tracker.create_job("other_type")
+
+        claimed = await job_tracker.claim_jobs("worker-a", "cfo_batch_analysis", 1, lease_seconds=60, max_attempts=3)
+        assert [j.id for j in claimed] == [first.id]
+        assert claimed[0].status == JobStatus.RUNNING
+        assert claimed[0].attempts == 1
+
+        claimed = await job_tracker.claim_jobs("worker-b", "cfo_batch_analysis", 5, lease_seconds=60, max_attempts=3)
+        assert [j.id for j in claimed] == [second.id]
+        # Running jobs with a live lease are not claimable
+        assert await job_tracker.claim_jobs("worker-c", "cfo_batch_analysis", 5, lease_seconds=60, max_attempts=3) == []
+
+    run(scenario())
+
+
+def test_renew_lease_only_by_owner(job_store):
+    async def scenario():
+        job = await job_tracker.create_job("cfo_batch_analysis")
+        await job_tracker.claim_jobs("worker-a", "cfo_batch_analysis", 1, lease_seconds=60, max_attempts=3)
+        assert await job_tracker.renew_job_lease(job.id, "worker-a", 60)
+        assert not await job_tracker.renew_job_lease(job.id, "worker-b", 60)
+        await job_tracker.update_job(job.id, JobStatus.COMPLETED)
+        assert not await job_tracker.renew_job_lease(job.id, "worker-a", 60)
+
+    run(scenario())
+
+
+def test_expired_lease_is_reclaimed_then_failed(job_store):
+    async def scenario():
+        job = await job_tracker.create_job("cfo_batch_analysis")
+        await job_tracker.claim_jobs("worker-a", "cfo_batch_analysis", 1, lease_seconds=-1, max_attempts=2)
+        # worker-a died: the expired lease lets another worker take the job over
+        reclaimed = await job_tracker.claim_jobs("worker-b", "cfo_batch_analysis", 1, lease_seconds=-1, max_attempts=2)
+        assert [j.id for j in reclaimed] == [job.id]
+        assert reclaimed[0].attempts == 2
+        assert not await job_tracker.renew_job_lease(job.id, "worker-a", 60)
+        # Out of attempts: the job fails instead of being claimed again
+        assert await job_tracker.claim_jobs("worker-c", "cfo_batch_analysis", 1, lease_seconds=60, max_attempts=2) == []
+        failed = await job_tracker.get_job(job.id)
+        assert failed.status == JobStatus.FAILED
+        assert "Lease expired" in failed.error
+
+    run(scenario())
+
+
+class _FakeRpc:
+    def rpc(self, name, params):
+        return (name, params)
+
+
+def test_supabase_renew_error_keeps_job_only_within_lease(monkeypatch):
+    """A failing renew RPC must not keep a job whose lease may have been taken over."""
+    clock = [1000.0]
+    mode = {"fail": False}
+    row = {
+        "id": "00000000-0000-0000-0000-000000000001", "type": "cfo_analysis", "workspace_id": None,
+        "status": "running", "attempts": 1, "created_at": "2026-10-17T00:00:00", "updated_at": "2026-10-17T00:00:00"
+    }
+
+    async def fake_execute(query, operation=None):
+        if mode["fail"]:
+            raise ConnectionError("database unreachable")
+        return type("Response", (), {"data": [row]})()
+
+    monkeypatch.setattr(job_tracker, "execute", fake_execute)
+    monkeypatch.setattr(job_tracker, "get_supabase_client", lambda: _FakeRpc())
+    # Only the module's clock: the event loop keeps the real one
+    monkeypatch.setattr(job_tracker, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    async def scenario():
+        store = job_tracker.SupabaseJobStore()
+        [job] = await store.claim_jobs("worker-a", "cfo_analysis", 1, lease_seconds=30, max_attempts=3)
+        mode["fail"] = True
+        clock[0] += 20
+        assert await store.renew_lease(job.id, "worker-a", 30)  # Lease still valid
+        clock[0] += 11
+        assert not await store.renew_lease(job.id, "worker-a", 30)  # Past the deadline: give up
+
+    run(scenario())
+
+
+# --- Single-flight ---
+
+def test_single_flight_dedups_in_flight_jobs(job_store):
+    async def scenario():
+        first = await job_tracker.create_job("cfo_analysis", workspace_id="ws-1")
+        again = await job_tracker.create_job("cfo_analysis", workspace_id="ws-1")
+        assert again.id == first.id
+        assert again.deduplicated
+        assert not first.deduplicated  # The stored job is not flagged
+
+        # Other workspaces and non single-flight types get their own jobs
+        other = await job_tracker.create_job("cfo_analysis", workspace_id="ws-2")
+        batch_a = await job_tracker.create_job("cfo_batch_analysis", workspace_id="ws-1")
+        batch_b = await job_tracker.create_job("cfo_batch_analysis", workspace_id="ws-1")
+        assert len({first.id, other.id, batch_a.id, batch_b.id}) == 4
+
+        # Still in flight while running; a new job once it finished
+        await job_tracker.claim_jobs("worker-a", "cfo_analysis", 5, lease_seconds=60, max_attempts=3)
+        assert (await job_tracker.create_job("cfo_analysis", workspace_id="ws-1")).id == first.id
+        await job_tracker.update_job(first.id, JobStatus.COMPLETED)
+        fresh = await job_tracker.create_job("cfo_analysis", workspace_id="ws-1")
+        assert fresh.id != first.id
+        assert not fresh.deduplicated
+
+    run(scenario())
@@ -0,0 +1,66 @@
+"""
+core.llm_cache: completion keys and the SQLite store's byte budget.
+"""
+import sqlite3
+
+from core.llm_cache import LLMCompletionCache, completion_key
+
+
+def actual_bytes(cache):
+    return cache._conn.execute("SELECT COALESCE(SUM(size), 0) FROM completions").fetchone()[0]
+
+
+def test_completion_key_normalizes_prompts():
+    a = completion_key("model", 0.1, [{"role": "user", "content": "Hello  \r\nworld\n"}])
+    b = completion_key("model", 0.1, [{"role": "user", "content": "Hello\nworld"}])
+    assert a == b
+    assert completion_key("model", 0.1, "Hello\nworld") == b
+    assert completion_key("model", 0.2, "Hello\nworld") != b
+    assert completion_key("other", 0.1, "Hello\nworld") != b
+
+
+def test_get_put_and_replace(tmp_path):
+    cache = LLMCompletionCache(str(tmp_path / "llm.sqlite3"), max_bytes=1000)
+    assert cache.get("k1", "model") is None
+    cache.put("k1", "model", "a" * 100)
+    assert cache.get("k1", "model") == "a" * 100
+    cache.put("k1", "model", "b" * 40)  # Replacing an entry must not count it twice
+    assert cache.get("k1", "model") == "b" * 40
+    assert cache.stats() == {"entries": 1, "bytes": 40, "max_bytes": 1000}
+
+
+def test_eviction_keeps_total_in_sync(tmp_path):
+    cache = LLMCompletionCache(str(tmp_path / "llm.sqlite3"), max_bytes=300)
+    for i in range(3):
+        cache.put(f"k{i}", "model", "x" * 100)
+    cache.get("k0", "model")  # k1 becomes the least recently used entry
+    cache.put("k3", "model", "y" * 100)
+    assert cache.get("k1", "model") is None
+    assert cache.get("k0", "model") is not None
+    stats = cache.stats()
+    assert stats["bytes"] == actual_bytes(cache) == 300
+    # Entries larger than the whole budget are not stored
+    cache.put("huge", "model", "z" * 301)
+    assert cache.get("huge", "model") is None
+
+
+def test_total_is_seeded_from_existing_rows(tmp_path):
+    path = str(tmp_path / "llm.sqlite3")
+    cache = LLMCompletionCache(path, max_bytes=1000)
+    cache.put("k1", "model", "a" * 100)
+    cache._conn.close()
+
+    # A file written before the running total existed
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        "DROP TRIGGER completions_size_insert; DROP TRIGGER completions_size_update; "
+        "DROP TRIGGER completions_size_delete; DROP TABLE cache_meta;"
+    )
+    conn.execute("INSERT INTO completions VALUES ('k2', 'model', 'bb', 2, 0, 0)")
+    conn.commit()
+    conn.close()
+
+    reopened = LLMCompletionCache(path, max_bytes=1000)
+    assert reopened.stats()["bytes"] == 102
+    reopened.put("k3", "model", "c" * 10)
+    assert reopened.stats()["bytes"] == actual_bytes(reopened) == 112
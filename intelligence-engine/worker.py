@@ -0,0 +1,67 @@
+"""
+kOS Intelligence Engine - Job Worker
+Claims queued jobs from the `jobs` table and runs them in a bounded pool.
+
+Run:
+    python worker.py
+"""
+import asyncio
+import logging
+import signal
+
+from prometheus_client import start_http_server
+
+from agents import registry
+from core.audit_log import get_audit_log
+from core.config import get_settings
+from core.logs import configure_logging
+from core.worker import JobWorker
+
+logger = logging.getLogger(__name__)
+
+
+def build_worker() -> JobWorker:
+    """
+    Creates a JobWorker configured from settings, handling every job type in
+    agents.registry (agent modules are imported on first use or by warm_up).
+    """
+    settings = get_settings()
+    return JobWorker(
+        handlers=registry.job_handlers(),
+        pool_size=settings.worker_pool_size,
+        type_limits=settings.worker_type_limits,
+        lease_seconds=settings.job_lease_seconds,
+        max_attempts=settings.job_max_attempts,
+        poll_interval=settings.worker_poll_interval_seconds,
+        shutdown_timeout=settings.worker_shutdown_timeout_seconds
+    )
+
+
+async def main():
+    settings = get_settings()
+    if settings.worker_metrics_port:
+        try:
+            start_http_server(settings.worker_metrics_port)
+            logger.info("Metrics on :%d/metrics", settings.worker_metrics_port)
+        except OSError as e:
+            # e.g. a second worker on the same host: run jobs anyway, without metrics
+            logger.error("Metrics port %d unavailable: %s", settings.worker_metrics_port, e)
+    worker = build_worker()
+    warm_up = asyncio.create_task(registry.warm_up())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, worker.stop)
+        except NotImplementedError:
+            pass  # Windows: fall back to KeyboardInterrupt
+    await worker.run()
+    warm_up.cancel()
+    await get_audit_log().close()
+
+
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,40 @@
+export const dynamic = "force-dynamic";
+
+// Proxies the Intelligence Engine job progress stream (Server-Sent Events)
+export async function GET(
+  request: Request,
+  { params }: { params: Promise<{ jobId: string }> }
+) {
+  const INTELLIGENCE_ENGINE_URL = process.env.INTELLIGENCE_ENGINE_URL;
+  const INTERNAL_API_SECRET = process.env.INTERNAL_API_SECRET;
+
+  if (!INTELLIGENCE_ENGINE_URL || !INTERNAL_API_SECRET) {
+    console.error("[Job Stream Route] Missing environment variables");
+    return new Response("Configuration Error", { status: 500 });
+  }
+
+  const { jobId } = await params;
+  // Using 127.0.0.1 explicit to avoid Nodejs IPv6 issues
+  const safeUrl = INTELLIGENCE_ENGINE_URL.replace("localhost", "127.0.0.1");
+
+  const upstream = await fetch(`${safeUrl}/jobs/${encodeURIComponent(jobId)}/stream`, {
+    headers: {
+      Accept: "text/event-stream",
+      "X-Internal-Secret": INTERNAL_API_SECRET,
+    },
+    cache: "no-store",
+    signal: request.signal,
+  });
+
+  if (!upstream.ok || !upstream.body) {
+    return new Response(await upstream.text(), { status: upstream.status });
+  }
+
+  return new Response(upstream.body, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      Connection: "keep-alive",
+    },
+  });
+}
@@ -49,28 +49,48 @@ export function CFOSection({ workspaceId }: CFOSectionProps) {
     checkActiveJob();
   }, [workspaceId]);
 
-  // Poll for job status
+  // Follow job progress via the engine's SSE stream (polling as fallback)
   useEffect(() => {
     if (!jobId) return;
 
-    const supabase = createClient();
-    const interval = setInterval(async () => {
-      const { data } = await supabase
-        .from("jobs")
-        .select("status")
-        .eq("id", jobId)
-        .single();
+    const finish = () => {
+      setIsRunning(false);
+      setJobId(null);
+      // Optional: Trigger alert refresh via router.refresh() or letting realtime handle it
+    };
 
-      if (data) {
-        if (data.status === "completed" || data.status === "failed") {
-          setIsRunning(false);
-          setJobId(null);
-          // Optional: Trigger alert refresh via router.refresh() or letting realtime handle it
-        }
+    let interval: ReturnType<typeof setInterval> | null = null;
+    const source = new EventSource(`/api/jobs/${jobId}/stream`);
+
+    source.addEventListener("status", (event) => {
+      const data = JSON.parse((event as MessageEvent).data);
+      if (data.status === "completed" || data.status === "failed") {
+        source.close();
+        finish();
       }
-    }, 2000);
+    });
+
+    source.onerror = () => {
+      source.close();
+      if (interval) return;
+      const supabase = createClient();
+      interval = setInterval(async () => {
+        const { data } = await supabase
+          .from("jobs")
+          .select("status")
+          .eq("id", jobId)
+          .single();
 
-    return () => clearInterval(interval);
+        if (data && (data.status === "completed" || data.status === "failed")) {
+          finish();
+        }
+      }, 2000);
+    };
+
+    return () => {
+      source.close();
+      if (interval) clearInterval(interval);
+    };
   }, [jobId]);
 
   return (
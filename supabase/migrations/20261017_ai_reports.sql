@@ -0,0 +1,32 @@
+-- Content-addressed store for AI agent reports (intelligence-engine core/report_store.py)
+-- Run this in Supabase SQL Editor
+
+-- Each report is stored once, zlib-compressed, keyed by the sha256 of its
+-- text. jobs.result.report_hash and ai_actions.metadata.report_hash point
+-- here; GET /jobs/{job_id}/report expands it.
+CREATE TABLE IF NOT EXISTS public.ai_reports (
+    hash TEXT PRIMARY KEY,  -- sha256 hex of the UTF-8 report text
+    encoding TEXT NOT NULL DEFAULT 'zlib',
+    content BYTEA NOT NULL,
+    size INTEGER NOT NULL,  -- Uncompressed size in bytes
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+-- Content is already compressed; skip TOAST's own compression attempt
+ALTER TABLE public.ai_reports ALTER COLUMN content SET STORAGE EXTERNAL;
+
+ALTER TABLE public.ai_reports ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_policies
+        WHERE schemaname = 'public' AND tablename = 'ai_reports' AND policyname = 'Service Role Full Access'
+    ) THEN
+        CREATE POLICY "Service Role Full Access" ON public.ai_reports
+            FOR ALL
+            TO service_role
+            USING (true)
+            WITH CHECK (true);
+    END IF;
+END $$;
@@ -0,0 +1,26 @@
+-- Bulk variant of get_worklog_summary for the multi-workspace CFO sweep
+-- Run this in Supabase SQL Editor
+
+-- Same aggregation as get_worklog_summary(workspace_id_param), but for many
+-- workspaces in a single round-trip. Rows are tagged with their workspace_id.
+CREATE OR REPLACE FUNCTION public.get_worklog_summaries(workspace_ids_param UUID[])
+RETURNS TABLE (
+  workspace_id UUID,
+  client_name TEXT,
+  total_hours DECIMAL
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    c.workspace_id,
+    c.client_name,
+    COALESCE(SUM(w.hours), 0)::DECIMAL AS total_hours
+  FROM contracts c
+  LEFT JOIN issues i ON i.workspace_id = c.workspace_id
+  LEFT JOIN worklogs w ON w.issue_id = i.id
+  WHERE c.workspace_id = ANY(workspace_ids_param)
+    AND c.is_active = true
+  GROUP BY c.workspace_id, c.client_name
+  ORDER BY c.workspace_id, total_hours DESC;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -0,0 +1,77 @@
+-- Job queue: claim/lease protocol for intelligence-engine workers
+-- Run this in Supabase SQL Editor
+
+-- payload: job input (e.g. workspace_ids for cfo_batch_analysis)
+-- worker_id / lease_expires_at: who runs the job and until when the claim is valid
+-- attempts: number of claims, bounded by the worker's max attempts
+ALTER TABLE public.jobs
+    ADD COLUMN IF NOT EXISTS payload JSONB,
+    ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS worker_id TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+
+-- Claim scans only look at queued/running jobs of one type, oldest first
+CREATE INDEX IF NOT EXISTS idx_jobs_claimable
+    ON public.jobs (type, created_at)
+    WHERE status IN ('pending', 'running');
+
+-- Atomically claims up to limit_param jobs of one type for a worker.
+-- Claimable: pending jobs, or running jobs whose lease expired (crashed worker).
+-- Jobs whose lease expired after max_attempts_param claims are marked failed.
+CREATE OR REPLACE FUNCTION public.claim_jobs(
+    worker_id_param TEXT,
+    job_type_param TEXT,
+    limit_param INTEGER,
+    lease_seconds_param INTEGER,
+    max_attempts_param INTEGER
+)
+RETURNS SETOF public.jobs AS $$
+BEGIN
+    UPDATE public.jobs
+    SET status = 'failed',
+        error = format('Lease expired after %s attempt(s)', attempts),
+        worker_id = NULL,
+        lease_expires_at = NULL,
+        updated_at = now()
+    WHERE type = job_type_param
+      AND status = 'running'
+      AND lease_expires_at < now()
+      AND attempts >= max_attempts_param;
+
+    RETURN QUERY
+    UPDATE public.jobs j
+    SET status = 'running',
+        worker_id = worker_id_param,
+        lease_expires_at = now() + make_interval(secs => lease_seconds_param),
+        attempts = j.attempts + 1,
+        updated_at = now()
+    WHERE j.id IN (
+        SELECT c.id
+        FROM public.jobs c
+        WHERE c.type = job_type_param
+          AND c.attempts < max_attempts_param
+          AND (c.status = 'pending' OR (c.status = 'running' AND c.lease_expires_at < now()))
+        ORDER BY c.created_at
+        LIMIT limit_param
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Extends the lease of a running job. Returns false if the worker lost it.
+CREATE OR REPLACE FUNCTION public.renew_job_lease(
+    job_id_param UUID,
+    worker_id_param TEXT,
+    lease_seconds_param INTEGER
+)
+RETURNS BOOLEAN AS $$
+BEGIN
+    UPDATE public.jobs
+    SET lease_expires_at = now() + make_interval(secs => lease_seconds_param)
+    WHERE id = job_id_param
+      AND worker_id = worker_id_param
+      AND status = 'running';
+    RETURN FOUND;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
@@ -0,0 +1,22 @@
+-- Job queue depth for the intelligence-engine /metrics endpoint
+-- Run this in Supabase SQL Editor
+
+-- Counts queued and running jobs per type. Only pending/running rows are
+-- read (idx_jobs_claimable, 20261017_job_leases.sql), never finished jobs.
+CREATE OR REPLACE FUNCTION public.job_queue_depth()
+RETURNS TABLE (
+  type TEXT,
+  status TEXT,
+  jobs BIGINT
+) AS $$
+BEGIN
+  RETURN QUERY
+  SELECT
+    j.type::TEXT,
+    j.status::TEXT,
+    COUNT(*) AS jobs
+  FROM public.jobs j
+  WHERE j.status IN ('pending', 'running')
+  GROUP BY j.type, j.status;
+END;
+$$ LANGUAGE plpgsql STABLE SECURITY DEFINER;
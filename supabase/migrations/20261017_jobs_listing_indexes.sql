@@ -0,0 +1,28 @@
+-- Indexes for GET /jobs (keyset pagination over created_at DESC, id DESC)
+-- Run this in Supabase SQL Editor
+
+-- Every listing orders by (created_at DESC, id DESC) and pages with
+-- "(created_at, id) < cursor", so each index ends with those columns and a
+-- page is a bounded index range scan regardless of table size.
+-- On a large live table, run each statement on its own with
+-- CREATE INDEX CONCURRENTLY instead (not allowed inside a transaction).
+
+-- Unfiltered history
+CREATE INDEX IF NOT EXISTS idx_jobs_created
+    ON public.jobs (created_at DESC, id DESC);
+
+-- Workspace history (optionally filtered by status)
+CREATE INDEX IF NOT EXISTS idx_jobs_workspace_created
+    ON public.jobs (workspace_id, created_at DESC, id DESC);
+
+-- Workspace history of one job type (optionally filtered by status)
+CREATE INDEX IF NOT EXISTS idx_jobs_workspace_type_created
+    ON public.jobs (workspace_id, type, created_at DESC, id DESC);
+
+-- Cross-workspace listings by type (optionally filtered by status)
+CREATE INDEX IF NOT EXISTS idx_jobs_type_created
+    ON public.jobs (type, created_at DESC, id DESC);
+
+-- Cross-workspace listings by status (e.g. recent failed jobs)
+CREATE INDEX IF NOT EXISTS idx_jobs_status_created
+    ON public.jobs (status, created_at DESC, id DESC);
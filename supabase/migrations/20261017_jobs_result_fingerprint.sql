@@ -0,0 +1,8 @@
+-- Result cache lookups for the intelligence engine (RESULT_CACHE_BACKEND=jobs)
+-- Run this in Supabase SQL Editor
+
+-- Completed jobs store the fingerprint of their input data in
+-- result->'cache'->>'fingerprint'; cache lookups filter on it within a TTL.
+CREATE INDEX IF NOT EXISTS idx_jobs_result_fingerprint
+    ON public.jobs (type, ((result->'cache'->>'fingerprint')), updated_at DESC)
+    WHERE status = 'completed';
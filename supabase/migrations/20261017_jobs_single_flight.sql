@@ -0,0 +1,13 @@
+-- Single-flight CFO jobs: at most one queued/running cfo_analysis job per workspace
+-- Run this in Supabase SQL Editor
+
+-- A second insert for a workspace with a job in flight fails with a unique
+-- violation (23505); the intelligence engine then returns the in-flight job
+-- instead of queueing duplicate work (see core/job_tracker.py).
+-- Creating the index fails while duplicates are in flight: let them finish
+-- (or mark them failed) and re-run.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_jobs_single_flight
+    ON public.jobs (type, workspace_id)
+    WHERE type IN ('cfo_analysis')
+      AND status IN ('pending', 'running')
+      AND workspace_id IS NOT NULL;
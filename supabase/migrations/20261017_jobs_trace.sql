@@ -0,0 +1,8 @@
+-- Per-job execution traces for intelligence-engine agent runs
+-- Run this in Supabase SQL Editor
+
+-- Compact columnar trace written when a job finishes (core/tracing.py):
+-- {"v": 1, "started_at": ..., "total_ms": ..., "fields": [...], "spans": [[...], ...]}
+-- Only read by GET /jobs/{job_id}/trace; job status reads select explicit columns.
+ALTER TABLE public.jobs
+    ADD COLUMN IF NOT EXISTS trace JSONB;
@@ -0,0 +1,137 @@
+-- Trigger-maintained worklog totals for the CFO agent
+-- Run this in Supabase SQL Editor
+
+-- Running SUM(worklogs.hours) per workspace (worklogs reach a workspace
+-- through their issue). Triggers on worklogs and issues keep it exact on
+-- every insert, edit, delete and issue move, so reading a workspace's hours
+-- is one row lookup instead of a scan of its whole worklog history.
+CREATE TABLE IF NOT EXISTS public.worklog_workspace_totals (
+    workspace_id UUID PRIMARY KEY,
+    total_hours DECIMAL NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT timezone('utc'::text, now()) NOT NULL
+);
+
+ALTER TABLE public.worklog_workspace_totals ENABLE ROW LEVEL SECURITY;
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_policies
+        WHERE schemaname = 'public' AND tablename = 'worklog_workspace_totals' AND policyname = 'Service Role Full Access'
+    ) THEN
+        CREATE POLICY "Service Role Full Access" ON public.worklog_workspace_totals
+            FOR ALL
+            TO service_role
+            USING (true)
+            WITH CHECK (true);
+    END IF;
+END $$;
+
+-- Adds delta_param hours to a workspace's total (no-op for a NULL workspace)
+CREATE OR REPLACE FUNCTION public.add_worklog_hours(workspace_id_param UUID, delta_param DECIMAL)
+RETURNS VOID AS $$
+BEGIN
+    IF workspace_id_param IS NULL OR delta_param IS NULL OR delta_param = 0 THEN
+        RETURN;
+    END IF;
+    INSERT INTO public.worklog_workspace_totals AS t (workspace_id, total_hours)
+    VALUES (workspace_id_param, delta_param)
+    ON CONFLICT (workspace_id) DO UPDATE
+        SET total_hours = t.total_hours + EXCLUDED.total_hours,
+            updated_at = timezone('utc'::text, now());
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- worklogs: subtract the old row, add the new one. A worklog deleted by the
+-- cascade of its issue no longer finds the issue; issues_worklog_totals
+-- already subtracted it.
+CREATE OR REPLACE FUNCTION public.worklogs_maintain_totals()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.issue_id IS NOT NULL THEN
+        PERFORM public.add_worklog_hours(
+            (SELECT workspace_id FROM public.issues WHERE id = OLD.issue_id), -OLD.hours
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.issue_id IS NOT NULL THEN
+        PERFORM public.add_worklog_hours(
+            (SELECT workspace_id FROM public.issues WHERE id = NEW.issue_id), NEW.hours
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- issues: a deleted issue takes its worklogs' hours with it; a moved issue
+-- carries them to its new workspace
+CREATE OR REPLACE FUNCTION public.issues_maintain_worklog_totals()
+RETURNS TRIGGER AS $$
+DECLARE
+    issue_hours DECIMAL;
+BEGIN
+    IF TG_OP = 'UPDATE' AND OLD.workspace_id IS NOT DISTINCT FROM NEW.workspace_id THEN
+        RETURN NEW;
+    END IF;
+    SELECT SUM(hours) INTO issue_hours FROM public.worklogs WHERE issue_id = OLD.id;
+    PERFORM public.add_worklog_hours(OLD.workspace_id, -issue_hours);
+    IF TG_OP = 'UPDATE' THEN
+        PERFORM public.add_worklog_hours(NEW.workspace_id, issue_hours);
+        RETURN NEW;
+    END IF;
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+BEGIN;
+
+-- Writes wait while the triggers are installed and the totals backfilled
+LOCK TABLE public.worklogs, public.issues IN SHARE ROW EXCLUSIVE MODE;
+
+DROP TRIGGER IF EXISTS worklogs_maintain_totals ON public.worklogs;
+CREATE TRIGGER worklogs_maintain_totals
+    AFTER INSERT OR UPDATE OF hours, issue_id OR DELETE ON public.worklogs
+    FOR EACH ROW EXECUTE FUNCTION public.worklogs_maintain_totals();
+
+-- BEFORE: the worklogs are still there (ON DELETE CASCADE removes them afterwards)
+DROP TRIGGER IF EXISTS issues_worklog_totals ON public.issues;
+CREATE TRIGGER issues_worklog_totals
+    BEFORE DELETE OR UPDATE OF workspace_id ON public.issues
+    FOR EACH ROW EXECUTE FUNCTION public.issues_maintain_worklog_totals();
+
+-- Rebuilt from scratch, so re-running the migration also repairs the totals
+DELETE FROM public.worklog_workspace_totals;
+INSERT INTO public.worklog_workspace_totals (workspace_id, total_hours)
+SELECT i.workspace_id, SUM(w.hours)
+FROM public.worklogs w
+JOIN public.issues i ON i.id = w.issue_id
+WHERE i.workspace_id IS NOT NULL
+GROUP BY i.workspace_id;
+
+COMMIT;
+
+-- Same rows as get_worklog_summary(workspace_id_param), read from the totals:
+-- get_worklog_summary joins every active contract with every worklog of the
+-- workspace, so a client's hours are the workspace total times its number of
+-- active contracts.
+CREATE OR REPLACE FUNCTION public.get_worklog_summary_totals(workspace_id_param UUID)
+RETURNS TABLE (
+    client_name TEXT,
+    total_hours DECIMAL
+) AS $$
+BEGIN
+    RETURN QUERY
+    SELECT
+        c.client_name,
+        (COUNT(*) * COALESCE(MAX(t.total_hours), 0))::DECIMAL AS total_hours
+    FROM public.contracts c
+    LEFT JOIN public.worklog_workspace_totals t ON t.workspace_id = c.workspace_id
+    WHERE c.workspace_id = workspace_id_param
+      AND c.is_active = true
+    GROUP BY c.client_name
+    ORDER BY 2 DESC;  -- By position: `total_hours` is also a column of the totals table
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- Superseded created_at-cursor delta (it missed edits, deletes and late commits)
+DROP FUNCTION IF EXISTS public.get_worklog_summary_delta(UUID, TIMESTAMPTZ, INTEGER);
+DROP INDEX IF EXISTS public.idx_worklogs_created_at;